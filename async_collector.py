@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio 기반 환율 / KRX 금 시세 수집 엔진
+
+collect_gold_data_final.fetch_daily_quotes와 같은 결과를 돌려주지만, 요청을 스레드 대신
+코루틴으로 띄운다. 속도 조절(EXIM_LIMITER/KRX_LIMITER), 응답 분류, 재시도 스케줄
+(rate_limit.schedule_fetches_async), 캐시/파싱/휴장일 규칙은 동기 경로와 공유한다.
+
+오프라인 검증: ReplayStubServer가 fixtures 디렉터리의 JSON을 그대로 돌려준다.
+    python async_collector.py --record --fixtures fixtures   # 실제 응답 기록 (API 키 필요)
+    python async_collector.py --fixtures fixtures            # 기록된 응답으로 동기/비동기 비교
+    python async_collector.py                                # 샘플 응답으로 비교
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+
+import collect_gold_data_final as collector
+import rate_limit
+from instrumentation import METRICS
+
+# ==================== 설정 영역 ====================
+REQUEST_TIMEOUT = 10     # 요청당 제한 시간 (초)
+FIXTURE_DIR = "fixtures"
+# ===================================================
+
+
+async def _request(name, limiter, send, classify):
+    """
+    요청 하나 (limiter 대기 → 응답 분류 → limiter.record)
+
+    Returns:
+        tuple: (rate_limit 상태, 응답 본문 또는 None)
+    """
+    data = None
+    retry_after = None
+    try:
+        async with limiter:
+            with METRICS.timer(name):
+                async with send() as response:
+                    status = rate_limit.classify_http_status(response.status)
+                    if status is None:
+                        body = await response.read()
+                        METRICS.count(name, "bytes", len(body))
+                        data = json.loads(body)
+                        status = classify(data)
+                    else:
+                        retry_after = rate_limit.retry_after_seconds(response.headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        # 연결 실패/시간 초과, JSON이 아닌 응답
+        status = rate_limit.ERROR
+    METRICS.count(name, f"responses_{status}")
+    limiter.record(status, retry_after)
+    return status, data if status == rate_limit.OK else None
+
+
+async def fetch_exim_response_async(session, auth_key, date_str):
+    """fetch_exim_response의 비동기 버전 (캐시 우선, EXIM_LIMITER 속도 조절)"""
+    cached = collector.cached_response("exim", collector.EXIM_ENDPOINT, date_str,
+                                       collector.classify_exim_payload)
+    if cached is not None:
+        return rate_limit.OK, cached
+
+    params = {'authkey': auth_key, 'searchdate': date_str, 'data': 'AP01'}
+    status, data = await _request(
+        "exim", collector.EXIM_LIMITER,
+        lambda: session.get(collector.EXIM_URL, params=params, ssl=False),
+        collector.classify_exim_payload,
+    )
+    if status == rate_limit.OK:
+        collector.store_response("exim", collector.EXIM_ENDPOINT, date_str, data)
+    return status, data
+
+
+async def fetch_krx_response_async(session, auth_key, date_str):
+    """fetch_krx_response의 비동기 버전 (캐시 우선, KRX_LIMITER 속도 조절)"""
+    cached = collector.cached_response("krx", collector.KRX_ENDPOINT, date_str,
+                                       collector.classify_krx_payload)
+    if cached is not None:
+        return rate_limit.OK, cached
+
+    headers = {"Content-Type": "application/json", "AUTH_KEY": auth_key}
+    status, result = await _request(
+        "krx", collector.KRX_LIMITER,
+        lambda: session.post(collector.KRX_URL, headers=headers,
+                             json={"basDd": date_str}, ssl=False),
+        collector.classify_krx_payload,
+    )
+    if status == rate_limit.OK:
+        collector.store_response("krx", collector.KRX_ENDPOINT, date_str, result)
+    return status, result
+
+
+async def get_exchange_rates_async(session, auth_key, dates_api,
+                                   concurrency=None, max_attempts=None, failed_out=None):
+    """
+    get_exchange_rates의 비동기 버전
+
+    Returns:
+        dict: {YYYYMMDD: 환율}
+    """
+    failures = {}
+    payloads = await rate_limit.schedule_fetches_async(
+        lambda d: fetch_exim_response_async(session, auth_key, d),
+        list(dict.fromkeys(dates_api)), collector.EXIM_LIMITER,
+        workers=concurrency or collector.EXIM_MAX_CONCURRENCY,
+        max_attempts=max_attempts or collector.FETCH_MAX_ATTEMPTS,
+        base_delay=collector.RETRY_BASE_DELAY, max_delay=collector.RETRY_MAX_DELAY,
+        label="환율", failed_out=failures,
+    )
+    return collector.exchange_rates_from(payloads, failures, failed_out)
+
+
+async def get_krx_gold_prices_async(session, auth_key, dates_api,
+                                    concurrency=None, max_attempts=None, failed_out=None):
+    """
+    get_krx_gold_prices의 비동기 버전
+
+    Returns:
+        dict: {YYYYMMDD: 1g 환산 가격}
+    """
+    failures = {}
+    payloads = await rate_limit.schedule_fetches_async(
+        lambda d: fetch_krx_response_async(session, auth_key, d),
+        collector.krx_pending_dates(dates_api), collector.KRX_LIMITER,
+        workers=concurrency or collector.KRX_MAX_CONCURRENCY,
+        max_attempts=max_attempts or collector.FETCH_MAX_ATTEMPTS,
+        base_delay=collector.RETRY_BASE_DELAY, max_delay=collector.RETRY_MAX_DELAY,
+        label="KRX", failed_out=failures,
+    )
+    return collector.krx_prices_from(payloads, failures, failed_out)
+
+
+async def fetch_daily_quotes_async(dates_api, exim_key, krx_key,
+                                   exim_concurrency=None, krx_concurrency=None):
+    """
+    fetch_daily_quotes의 비동기 버전
+
+    Returns:
+        list: dates_api와 같은 순서의 (환율, 국내 금 가격) 튜플 리스트
+    """
+    if exim_concurrency is None:
+        exim_concurrency = collector.EXIM_MAX_CONCURRENCY
+    if krx_concurrency is None:
+        krx_concurrency = collector.KRX_MAX_CONCURRENCY
+
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=exim_concurrency + krx_concurrency)
+
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        with METRICS.timer("exim_batch"):
+            rates = await get_exchange_rates_async(session, exim_key, dates_api, exim_concurrency)
+
+        prices = {}
+        if collector.USE_KRX_API and krx_key:
+            krx_dates = [d for d in dates_api if d in rates]
+            with METRICS.timer("krx_batch"):
+                prices = await get_krx_gold_prices_async(session, krx_key, krx_dates,
+                                                         krx_concurrency)
+
+    return [(rates.get(d), prices.get(d) if d in rates else None) for d in dates_api]
+
+
+# ==================== 오프라인 스텁 서버 ====================
+
+def record_fixtures(dates_api, exim_key, krx_key, fixture_dir=FIXTURE_DIR):
+    """실제 API 응답을 fixtures/{exim,krx}/YYYYMMDD.json으로 저장 (동기 경로 사용)"""
+    for provider in ("exim", "krx"):
+        os.makedirs(os.path.join(fixture_dir, provider), exist_ok=True)
+
+    for date_api in dates_api:
+        exim = collector.fetch_exim_payload(exim_key, date_api)
+        if exim is not None:
+            write_fixture(fixture_dir, "exim", date_api, exim)
+        krx = collector.fetch_krx_payload(krx_key, date_api)
+        if krx is not None:
+            write_fixture(fixture_dir, "krx", date_api, krx)
+
+
+def write_fixture(fixture_dir, provider, date_api, payload):
+    path = os.path.join(fixture_dir, provider, date_api + ".json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def read_fixture(fixture_dir, provider, date_api):
+    """기록된 응답 (없으면 None)"""
+    path = os.path.join(fixture_dir, provider, date_api + ".json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+class ReplayStubServer:
+    """
+    기록된 EXIM/KRX 응답을 재생하는 aiohttp 스텁 서버 (별도 스레드의 이벤트 루프)
+
+    기록이 없는 날짜는 휴장일처럼 빈 응답을 돌려준다.
+    """
+
+    def __init__(self, fixture_dir=FIXTURE_DIR, host="127.0.0.1", port=0):
+        self.fixture_dir = fixture_dir
+        self.host = host
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.runner = None
+
+    async def _exim(self, request):
+        payload = read_fixture(self.fixture_dir, "exim", request.query.get("searchdate", ""))
+        return web.json_response(payload if payload is not None else [])
+
+    async def _krx(self, request):
+        body = await request.json()
+        payload = read_fixture(self.fixture_dir, "krx", body.get("basDd", ""))
+        return web.json_response(payload if payload is not None else {"OutBlock_1": []})
+
+    async def _start(self):
+        from mock_server import EXIM_PATH, KRX_PATH
+
+        app = web.Application()
+        app.router.add_get(EXIM_PATH, self._exim)
+        app.router.add_post(KRX_PATH, self._krx)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def write_sample_fixtures(dates_api, fixture_dir):
+    """mock_server와 같은 형식의 샘플 응답으로 fixtures 생성"""
+    from mock_server import exim_payload, krx_payload
+
+    for date_api in dates_api:
+        write_fixture(fixture_dir, "exim", date_api, exim_payload(date_api))
+        if collector.is_krx_trading_day(date_api):
+            write_fixture(fixture_dir, "krx", date_api, krx_payload(date_api))
+
+
+def verify_against_sync(dates_api, fixture_dir):
+    """
+    스텁 서버를 상대로 동기 경로와 비동기 경로를 모두 실행해 결과 비교
+
+    Returns:
+        bool: 결과가 같으면 True
+    """
+    from mock_server import EXIM_PATH, KRX_PATH
+
+    saved = (collector.EXIM_URL, collector.KRX_URL, collector.USE_RESPONSE_CACHE)
+    try:
+        with ReplayStubServer(fixture_dir) as stub:
+            collector.EXIM_URL = stub.base_url + EXIM_PATH
+            collector.KRX_URL = stub.base_url + KRX_PATH
+            collector.USE_RESPONSE_CACHE = False
+
+            started = time.perf_counter()
+            sync_quotes = collector.fetch_daily_quotes(dates_api, "STUB", "STUB", progress_every=0)
+            sync_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            async_quotes = asyncio.run(fetch_daily_quotes_async(dates_api, "STUB", "STUB"))
+            async_elapsed = time.perf_counter() - started
+    finally:
+        collector.EXIM_URL, collector.KRX_URL, collector.USE_RESPONSE_CACHE = saved
+
+    same = sync_quotes == async_quotes
+    print(f"  동기:   {sync_elapsed:.2f}초")
+    print(f"  비동기: {async_elapsed:.2f}초")
+    print(f"  결과 일치: {'✅' if same else '❌'} ({len(dates_api)}일)")
+    return same
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="asyncio 수집 엔진 오프라인 검증")
+    parser.add_argument("--fixtures", help="기록된 응답 디렉터리 (없으면 샘플 생성)")
+    parser.add_argument("--record", action="store_true", help="실제 API 응답을 --fixtures에 기록")
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--end", default="2024-03-01")
+    args = parser.parse_args()
+
+    dates = collector.krx_trading_days(args.start, args.end)
+
+    print("=" * 60)
+    print("asyncio 수집 엔진 검증 (스텁 서버)")
+    print("=" * 60)
+
+    if args.record:
+        fixture_dir = args.fixtures or FIXTURE_DIR
+        record_fixtures(dates, collector.EXIM_API_KEY, collector.KRX_API_KEY, fixture_dir)
+        print(f"✓ 기록 완료: {fixture_dir} ({len(dates)}일)")
+        raise SystemExit(0)
+
+    if args.fixtures:
+        ok = verify_against_sync(dates, args.fixtures)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_fixtures(dates, tmp)
+            ok = verify_against_sync(dates, tmp)
+
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동시 수집 벤치마크
+
+로컬 모의 서버(mock_server.py)를 상대로 fetch_daily_quotes를 실행하고
+워커 수에 따른 소요 시간을 비교한다. 실제 API는 호출하지 않는다.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import collect_gold_data_final as collector
+from mock_server import MockApiServer
+
+
+def business_days(start, count):
+    """start부터 주말을 뺀 count개의 YYYYMMDD 날짜"""
+    days = []
+    current = datetime.strptime(start, "%Y-%m-%d")
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current.strftime("%Y%m%d"))
+        current += timedelta(days=1)
+    return days
+
+
+def run_benchmark(days=200, latency=0.02, worker_counts=(1, 2, 4, 8, 16)):
+    """워커 수별 수집 시간 측정"""
+    dates_api = business_days("2024-01-01", days)
+    rows = []
+
+    saved = (collector.EXIM_URL, collector.KRX_URL, collector.USE_RESPONSE_CACHE)
+    try:
+        # 워커 수에 따른 차이만 보도록 속도 조절기는 끈다 (끝나면 원래 설정으로)
+        with MockApiServer(latency=latency) as server, \
+                collector.EXIM_LIMITER.unlimited(), collector.KRX_LIMITER.unlimited():
+            collector.EXIM_URL = server.exim_url
+            collector.KRX_URL = server.krx_url
+            collector.USE_RESPONSE_CACHE = False  # 매번 실제 HTTP 왕복을 측정
+
+            baseline = None
+            for workers in worker_counts:
+                # 제공자별 상한이 워커 수를 막지 않도록 함께 올린다
+                started = time.perf_counter()
+                quotes = collector.fetch_daily_quotes(
+                    dates_api, "MOCK", "MOCK",
+                    workers=workers,
+                    exim_concurrency=workers,
+                    krx_concurrency=workers,
+                    progress_every=0,
+                )
+                elapsed = time.perf_counter() - started
+
+                if baseline is None:
+                    baseline = quotes
+                elif quotes != baseline:
+                    raise RuntimeError(f"워커 {workers}개 결과가 순차 결과와 다릅니다")
+
+                rows.append((workers, elapsed, days / elapsed))
+    finally:
+        collector.EXIM_URL, collector.KRX_URL, collector.USE_RESPONSE_CACHE = saved
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동시 수집 벤치마크 (모의 서버)")
+    parser.add_argument("--days", type=int, default=200, help="거래일 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="요청당 지연(초)")
+    parser.add_argument("--workers", default="1,2,4,8,16", help="워커 수 목록")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    print("=" * 60)
+    print(f"동시 수집 벤치마크: {args.days}일, 요청당 {args.latency * 1000:.0f}ms")
+    print("=" * 60)
+
+    rows = run_benchmark(args.days, args.latency, worker_counts)
+    base_elapsed = rows[0][1]
+    print(f"{'워커':>6} {'소요(초)':>10} {'일/초':>10} {'배속':>8}")
+    for workers, elapsed, rate in rows:
+        print(f"{workers:>6} {elapsed:>10.2f} {rate:>10.1f} {base_elapsed / elapsed:>7.1f}x")
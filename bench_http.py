@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 연결 재사용 벤치마크
+
+모의 서버를 상대로 요청마다 새 연결을 맺는 방식(requests.get)과
+공용 세션(http_client)을 비교한다. 연결 수립 시간은 소켓 connect만 따로 잰다.
+"""
+
+import argparse
+import socket
+import statistics
+import time
+
+import requests
+
+import http_client
+from mock_server import MockApiServer
+
+
+def measure_connect(host, port, count):
+    """TCP 연결 수립(핸드셰이크) 시간 목록 (ms)"""
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        sock = socket.create_connection((host, port))
+        samples.append((time.perf_counter() - started) * 1000)
+        sock.close()
+    return samples
+
+
+def measure_requests(send, url, count):
+    """요청 전체 왕복 시간 목록 (ms)"""
+    samples = []
+    for i in range(count):
+        params = {"authkey": "MOCK", "searchdate": f"2024{i % 12 + 1:02d}15", "data": "AP01"}
+        started = time.perf_counter()
+        response = send(url, params=params, timeout=10)
+        response.json()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.mean(samples), p95
+
+
+def run_benchmark(count=300, latency=0.0):
+    """(항목, 평균 ms, p95 ms, 새 연결 수) 목록"""
+    rows = []
+    with MockApiServer(latency=latency) as server:
+        host, port = server.httpd.server_address[:2]
+        mean, p95 = summarize(measure_connect(host, port, count))
+        rows.append(("TCP 연결 수립", mean, p95, count))
+
+        before = server.connections
+        mean, p95 = summarize(measure_requests(requests.get, server.exim_url, count))
+        rows.append(("요청마다 새 연결 (requests.get)", mean, p95, server.connections - before))
+
+        http_client.close_all()
+        before = server.connections
+        mean, p95 = summarize(measure_requests(http_client.get, server.exim_url, count))
+        rows.append(("공용 세션 (http_client.get)", mean, p95, server.connections - before))
+        http_client.close_all()
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP 연결 재사용 벤치마크 (모의 서버)")
+    parser.add_argument("--count", type=int, default=300, help="요청 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="서버 처리 지연(초)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"HTTP 연결 재사용 벤치마크: {args.count}회")
+    print("=" * 60)
+    print(f"{'항목':<34} {'평균(ms)':>9} {'p95(ms)':>9} {'새 연결':>7}")
+    for name, mean, p95, connections in run_benchmark(args.count, args.latency):
+        print(f"{name:<34} {mean:>9.2f} {p95:>9.2f} {connections:>7}")
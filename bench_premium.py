@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 계산 마이크로벤치마크
+
+행마다 calculate_kimchi_premium을 호출하는 방식과
+calculate_kimchi_premium_batch 한 번 호출을 비교하고, 결과가 같은지 확인한다.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from collect_gold_data_final import calculate_kimchi_premium, calculate_kimchi_premium_batch
+
+
+def make_inputs(n, seed=0):
+    """현실적인 범위의 무작위 입력 (원/g, USD/oz, USD/KRW)"""
+    rng = np.random.default_rng(seed)
+    domestic = rng.uniform(60000, 160000, n).round(2)
+    international = rng.uniform(1200, 5000, n).round(2)
+    rate = rng.uniform(1050, 1500, n).round(1)
+    return domestic, international, rate
+
+
+def run_benchmark(sizes=(1_000, 100_000, 10_000_000), scalar_limit=10_000_000):
+    """(행 수, 스칼라 초, 배치 초, 일치 여부) 목록"""
+    rows = []
+    for n in sizes:
+        domestic, international, rate = make_inputs(n)
+
+        started = time.perf_counter()
+        batch = calculate_kimchi_premium_batch(domestic, international, rate)
+        batch_elapsed = time.perf_counter() - started
+
+        scalar_elapsed = None
+        same = None
+        if n <= scalar_limit:
+            d, i, r = domestic.tolist(), international.tolist(), rate.tolist()
+            started = time.perf_counter()
+            scalar = [calculate_kimchi_premium(d[k], i[k], r[k]) for k in range(n)]
+            scalar_elapsed = time.perf_counter() - started
+            same = bool(np.array_equal(np.asarray(scalar), batch))
+
+        rows.append((n, scalar_elapsed, batch_elapsed, same))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="김치프리미엄 계산 벤치마크")
+    parser.add_argument("--sizes", default="1000,100000,10000000", help="행 수 목록")
+    parser.add_argument("--scalar-limit", type=int, default=10_000_000,
+                        help="이 행 수까지만 스칼라 루프도 측정")
+    args = parser.parse_args()
+
+    sizes = [int(float(n)) for n in args.sizes.split(",")]
+
+    print("=" * 60)
+    print("김치프리미엄 계산 벤치마크")
+    print("=" * 60)
+    print(f"{'행 수':>12} {'스칼라(초)':>12} {'배치(초)':>10} {'배속':>8} {'일치':>4}")
+    for n, scalar, batch, same in run_benchmark(sizes, args.scalar_limit):
+        if scalar is None:
+            print(f"{n:>12,} {'-':>12} {batch:>10.4f} {'-':>8} {'-':>4}")
+        else:
+            print(f"{n:>12,} {scalar:>12.4f} {batch:>10.4f} {scalar / batch:>7.0f}x {'✅' if same else '❌'}")
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 벤치마크 모음 (수집 / 프리미엄 계산 / 데이터 로드 / 백테스트 / 파라미터 스윕)
+
+    python bench_suite.py fixtures --sample --start 2024-01-01 --end 2024-12-31
+    python bench_suite.py fixtures --from-archive raw_archive --start 20240101 --end 20241231
+    python bench_suite.py run                    # → bench_results/{시각}_{커밋}.json
+    python bench_suite.py run --quick --only collect,load
+    python bench_suite.py compare bench_results/이전.json bench_results/지금.json
+
+수집 벤치마크는 fixtures/{exim,krx,yfinance}/YYYYMMDD.json 기록을 mock_server로 재생하므로
+실제 API를 호출하지 않는다 (요청당 지연/오류 비율 지정 가능). 기록은 원본 보관소
+(raw_archive.py)에서 옮기거나 고정 값 샘플로 만든다. 나머지 벤치마크는 고정 시드 가짜 데이터를 쓴다.
+
+지표 이름이 _per_sec로 끝나면 클수록, _ms로 끝나면 작을수록 좋다 (compare 판정 기준).
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = "fixtures"
+RESULTS_DIR = "bench_results"
+PROVIDERS = ("exim", "krx", "yfinance")
+BENCHMARKS = ("collect", "parse", "premium", "load", "backtest", "sweep")
+
+# 벤치마크 크기 (quick은 CI/커밋 전 확인용)
+SIZES = {
+    "full": {
+        "concurrency": (1, 4, 8, 16),
+        "premium_rows": (1_000, 100_000, 1_000_000),
+        "scalar_limit": 100_000,
+        "parse_years": 10,
+        "load_years": 10,
+        "backtest_years": 10,
+        "vector_pairs": 2_000,
+        "sweep_step": 0.25,
+    },
+    "quick": {
+        "concurrency": (1, 8),
+        "premium_rows": (1_000, 100_000),
+        "scalar_limit": 10_000,
+        "parse_years": 10,
+        "load_years": 3,
+        "backtest_years": 3,
+        "vector_pairs": 500,
+        "sweep_step": 0.5,
+    },
+}
+
+
+# ==================== 기록(fixtures) ====================
+
+def _write_json(fixture_dir, provider, date_api, payload):
+    path = os.path.join(fixture_dir, provider, date_api + ".json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def _read_json(fixture_dir, provider, date_api):
+    with open(os.path.join(fixture_dir, provider, date_api + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_dates(fixture_dir=FIXTURE_DIR):
+    """yfinance 종가가 기록된 날짜 (YYYYMMDD, 날짜순)"""
+    directory = os.path.join(fixture_dir, "yfinance")
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
+
+
+def write_sample_fixtures(start_date, end_date, fixture_dir=FIXTURE_DIR):
+    """
+    mock_server 형식의 고정 값 샘플 기록 생성 (평일 전부, KRX는 거래일만)
+
+    Returns:
+        int: 기록한 날짜 수
+    """
+    import collect_gold_data_final as collector
+    from mock_server import exim_payload, krx_payload
+
+    dates = pd.bdate_range(start_date, end_date)
+    closes = 2000 + np.cumsum(np.random.default_rng(0).normal(0, 15, len(dates)))
+    for date, close in zip(dates, closes):
+        date_api = date.strftime("%Y%m%d")
+        _write_json(fixture_dir, "exim", date_api, exim_payload(date_api))
+        if collector.is_krx_trading_day(date_api):
+            _write_json(fixture_dir, "krx", date_api, krx_payload(date_api))
+        _write_json(fixture_dir, "yfinance", date_api, {"Close": round(float(close), 2)})
+    return len(dates)
+
+
+def fixtures_from_archive(archive_root, start=None, end=None, fixture_dir=FIXTURE_DIR):
+    """
+    원본 보관소의 실제 응답을 기록으로 옮기기 (start/end는 'YYYYMMDD')
+
+    Returns:
+        dict: 제공자별 기록 수
+    """
+    from raw_archive import RawArchive
+
+    archive = RawArchive(archive_root)
+    counts = {}
+    for provider in PROVIDERS:
+        latest = archive.latest(provider, start, end)
+        for date_api, payload in latest.items():
+            _write_json(fixture_dir, provider, date_api, payload)
+        counts[provider] = len(latest)
+    return counts
+
+
+# ==================== 공통 ====================
+
+def synthetic_data(years, seed=0):
+    """
+    load_gold_data 형식의 가짜 데이터 (연 252 거래일, 프리미엄은 평균 2% 근처 AR(1))
+    """
+    from collect_gold_data_final import OZ_TO_GRAM, calculate_kimchi_premium_batch
+
+    rng = np.random.default_rng(seed)
+    n = 252 * years
+    dates = pd.bdate_range("2014-03-24", periods=n).to_numpy().astype("datetime64[D]")
+    international = np.round(1300 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), 2)
+    exchange_rate = np.round(1100 + np.cumsum(rng.normal(0, 3, n)).clip(-300, 400), 2)
+
+    premium = np.empty(n)
+    premium[0] = 2.0
+    shocks = rng.normal(0, 0.4, n)
+    for i in range(1, n):
+        premium[i] = 2.0 + 0.95 * (premium[i - 1] - 2.0) + shocks[i]
+
+    domestic = np.round(international * exchange_rate / OZ_TO_GRAM * (1 + premium / 100), 0)
+    return {
+        "date": dates,
+        "domestic_price": domestic,
+        "international_price": international,
+        "exchange_rate": exchange_rate,
+        "premium": calculate_kimchi_premium_batch(domestic, international, exchange_rate),
+    }
+
+
+def to_frame(data):
+    """load_gold_data 형식 → gold_data CSV 형식 DataFrame"""
+    df = pd.DataFrame({name: data[name] for name in data if name != "date"})
+    df.insert(0, "date", pd.to_datetime(data["date"]).strftime("%Y-%m-%d"))
+    return df
+
+
+def best_time(func, repeat=5, warmup=1):
+    """func 실행 시간 최솟값 (초, 다른 프로세스 간섭이 가장 적었던 회차)"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def git_commit():
+    """현재 커밋 (작업 중 변경이 있으면 +dirty), git이 없으면 'unknown'"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("+dirty" if dirty else "")
+
+
+# ==================== 벤치마크 ====================
+
+def bench_collect(sizes, fixture_dir=FIXTURE_DIR, latency=0.02, error_rate=0.0, seed=0):
+    """기록 재생 모의 서버 상대로 fetch_daily_quotes 동시성별 처리량 + 프리미엄 표 생성"""
+    import collect_gold_data_final as collector
+    from mock_server import MockApiServer
+
+    dates_api = fixture_dates(fixture_dir)
+    if not dates_api:
+        raise FileNotFoundError(f"{fixture_dir}/yfinance 기록이 없습니다 (bench_suite.py fixtures)")
+
+    saved = {name: getattr(collector, name) for name in
+             ("EXIM_URL", "KRX_URL", "USE_RESPONSE_CACHE", "USE_STORE", "USE_RAW_ARCHIVE")}
+    collector.USE_RESPONSE_CACHE = False   # 매번 실제 HTTP 왕복을 측정
+    collector.USE_STORE = False
+    collector.USE_RAW_ARCHIVE = False
+    limiters = (collector.EXIM_LIMITER.settings(), collector.KRX_LIMITER.settings())
+    collector.EXIM_LIMITER.configure(unlimited=True)
+    collector.KRX_LIMITER.configure(unlimited=True)
+
+    metrics = {"days": len(dates_api)}
+    baseline = None
+    consistent = True
+    try:
+        for workers in sizes["concurrency"]:
+            with MockApiServer(latency=latency, error_rate=error_rate, seed=seed,
+                               fixture_dir=fixture_dir) as server:
+                collector.EXIM_URL = server.exim_url
+                collector.KRX_URL = server.krx_url
+                started = time.perf_counter()
+                quotes = collector.fetch_daily_quotes(
+                    dates_api, "MOCK", "MOCK", workers=workers,
+                    exim_concurrency=workers, krx_concurrency=workers, progress_every=0,
+                )
+                elapsed = time.perf_counter() - started
+                metrics[f"c{workers}_days_per_sec"] = len(dates_api) / elapsed
+                metrics[f"c{workers}_errors_injected"] = server.errors
+            if baseline is None:
+                baseline = quotes
+            elif quotes != baseline:
+                consistent = False
+    finally:
+        for name, value in saved.items():
+            setattr(collector, name, value)
+        collector.EXIM_LIMITER.restore(limiters[0])
+        collector.KRX_LIMITER.restore(limiters[1])
+        collector.take_raw_payloads()
+
+    # 기록된 종가 + 조회 결과 → gold_data 표
+    closes = [_read_json(fixture_dir, "yfinance", d)["Close"] for d in dates_api]
+    gold_data = pd.DataFrame({"Close": closes}, index=pd.to_datetime(dates_api, format="%Y%m%d"))
+    elapsed = best_time(lambda: collector.build_frame(gold_data, baseline))
+    metrics["build_rows_per_sec"] = len(dates_api) / elapsed
+    metrics["consistent"] = consistent
+    return metrics
+
+
+def krx_prices_from_table(table, unit_priority):
+    """
+    parse_krx_table 결과 → {YYYYMMDD: 1g 환산 가격} (parse_krx_gold_price와 같은 선택 규칙)
+
+    수집에는 쓰지 않는 비교용 구현이다. 표로 모아 벡터화해도 날짜별 파싱보다
+    빠르지 않다는 것을 bench_parse로 확인한다.
+    """
+    close = table["close"].to_numpy()
+    grams = table["unit_grams"].to_numpy()
+    days = table["date"].to_numpy().astype("datetime64[D]")
+
+    rank = np.full(len(close), len(unit_priority))
+    for i, unit in enumerate(unit_priority):
+        rank[grams == unit] = i
+
+    # 날짜 → 우선순위 → 응답 안의 순서로 정렬한 뒤 날짜별 첫 행
+    valid = np.flatnonzero(~np.isnan(close))
+    order = valid[np.lexsort((valid, rank[valid], days[valid]))]
+    sorted_days = days[order]
+    first = order[np.r_[True, sorted_days[1:] != sorted_days[:-1]]] if len(order) else order
+
+    per_gram = close[first] / np.where(np.isnan(grams[first]), 1.0, grams[first])
+    keys = [day.replace("-", "") for day in np.datetime_as_string(days[first])]
+    return dict(zip(keys, per_gram.tolist()))
+
+
+def bench_parse(sizes):
+    """KRX 응답 파싱: 날짜별 parse_krx_gold_price vs parse_krx_table 표 일괄 변환"""
+    import collect_gold_data_final as collector
+    from mock_server import krx_payload
+
+    dates = pd.bdate_range("2014-03-24", periods=252 * sizes["parse_years"]).strftime("%Y%m%d")
+    payloads = {d: krx_payload(d) for d in dates}
+    for d in dates[::20]:
+        payloads[d]["OutBlock_1"][0]["TDD_CLSPRC"] = "-"   # 1kg 거래 없는 날 → 100g 사용
+
+    def scalar():
+        prices = {}
+        for d, payload in payloads.items():
+            price = collector.parse_krx_gold_price(payload)
+            if price is not None:
+                prices[d] = price
+        return prices
+
+    def table():
+        return krx_prices_from_table(collector.parse_krx_table(payloads),
+                                     collector.KRX_UNIT_PRIORITY)
+
+    metrics = {"days": len(payloads)}
+    metrics["scalar_days_per_sec"] = len(payloads) / best_time(scalar)
+    metrics["table_days_per_sec"] = len(payloads) / best_time(table)
+    metrics["match"] = scalar() == table()
+    return metrics
+
+
+def bench_premium(sizes):
+    """행별 calculate_kimchi_premium vs 배치 계산 처리량"""
+    from bench_premium import run_benchmark
+
+    metrics = {}
+    for n, scalar, batch, same in run_benchmark(sizes["premium_rows"], sizes["scalar_limit"]):
+        metrics[f"batch_{n}_rows_per_sec"] = n / batch
+        if scalar is not None:
+            metrics[f"scalar_{n}_rows_per_sec"] = n / scalar
+            metrics[f"match_{n}"] = same
+    return metrics
+
+
+def bench_load(sizes):
+    """같은 데이터의 형식별 load_gold_data 시간 (CSV / Arrow 데이터셋 / SQLite / 컬럼 파일)"""
+    from gold_backtest import load_gold_data
+    from gold_columns import export_columns
+    from gold_store import GoldStore
+
+    data = synthetic_data(sizes["load_years"])
+    df = to_frame(data)
+    metrics = {"rows": len(df)}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"csv": os.path.join(tmp, "gold.csv"),
+                 "sqlite": os.path.join(tmp, "gold.db"),
+                 "columns": os.path.join(tmp, "columns")}
+        df.to_csv(paths["csv"], index=False, encoding="utf-8-sig")
+        with GoldStore(paths["sqlite"]) as store:
+            store.upsert_daily(df)
+        export_columns(data, paths["columns"])
+        try:
+            from gold_dataset import upsert_rows
+        except ImportError:
+            print("  (pyarrow가 없어 Arrow 데이터셋은 건너뜀)")
+        else:
+            paths["arrow"] = os.path.join(tmp, "dataset")
+            upsert_rows(df, paths["arrow"])
+
+        for name, path in paths.items():
+            metrics[f"{name}_ms"] = best_time(lambda: load_gold_data(path), repeat=10) * 1000
+    return metrics
+
+
+def bench_backtest(sizes):
+    """단일 백테스트(거래 내역 포함/요약만)와 기준쌍 일괄 백테스트 처리량"""
+    from gold_backtest import backtest_summary, perform_backtest
+    from gold_vector import vector_backtest
+
+    data = synthetic_data(sizes["backtest_years"])
+    premiums, prices = data["premium"], data["domestic_price"]
+    metrics = {"rows": len(premiums)}
+
+    elapsed = best_time(lambda: perform_backtest(data, 1.0, 3.0, 10_000_000, "1g"))
+    metrics["perform_backtest_per_sec"] = 1 / elapsed
+    elapsed = best_time(lambda: backtest_summary(premiums, prices, 1.0, 3.0, 10_000_000, "1g"))
+    metrics["backtest_summary_per_sec"] = 1 / elapsed
+
+    rng = np.random.default_rng(1)
+    pairs = sizes["vector_pairs"]
+    buy = np.round(rng.uniform(-1, 2, pairs), 1)
+    sell = np.round(buy + rng.uniform(0.1, 3, pairs), 1)
+    elapsed = best_time(lambda: vector_backtest(premiums, prices, buy, sell, 10_000_000, "1g",
+                                                  curves=False), repeat=3)
+    metrics["vector_pairs_per_sec"] = pairs / elapsed
+    return metrics
+
+
+def bench_sweep(sizes, processes=2):
+    """run_sweep 커널별 처리량 (조합/초)"""
+    from gold_sweep import frange, run_sweep
+
+    data = synthetic_data(sizes["backtest_years"])
+    step = sizes["sweep_step"]
+    buy_values = frange(-2.0, 4.0, step)
+    sell_values = frange(0.0, 6.0, step)
+    combos = len(buy_values) * len(sell_values)
+    metrics = {"combos": combos, "processes": processes}
+    for kernel in ("loop", "vector"):
+        elapsed = best_time(lambda: run_sweep(data, buy_values, sell_values, ("1g",),
+                                                processes=processes, kernel=kernel), repeat=3)
+        metrics[f"{kernel}_combos_per_sec"] = combos / elapsed
+    return metrics
+
+
+def run_suite(names=BENCHMARKS, quick=False, fixture_dir=FIXTURE_DIR, latency=0.02,
+              error_rate=0.0, processes=2):
+    """
+    벤치마크 실행
+
+    Returns:
+        dict: commit, created_at, python, platform, config, results {벤치마크: {지표: 값}}
+    """
+    sizes = SIZES["quick" if quick else "full"]
+    runners = {
+        "collect": lambda: bench_collect(sizes, fixture_dir, latency, error_rate),
+        "parse": lambda: bench_parse(sizes),
+        "premium": lambda: bench_premium(sizes),
+        "load": lambda: bench_load(sizes),
+        "backtest": lambda: bench_backtest(sizes),
+        "sweep": lambda: bench_sweep(sizes, processes),
+    }
+
+    results = {}
+    for name in names:
+        print(f"▶ {name}")
+        started = time.perf_counter()
+        results[name] = runners[name]()
+        print(f"  ({time.perf_counter() - started:.1f}초)")
+        for metric, value in results[name].items():
+            shown = f"{value:,.2f}" if isinstance(value, float) else str(value)
+            print(f"  {metric:32s} {shown:>16s}")
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "quick": quick,
+            "sizes": {k: list(v) if isinstance(v, tuple) else v for k, v in sizes.items()},
+            "latency": latency,
+            "error_rate": error_rate,
+            "processes": processes,
+            "fixtures": fixture_dir,
+        },
+        "results": results,
+    }
+
+
+def save_results(report, directory=RESULTS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{stamp}_{report['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare(old, new, threshold=10.0):
+    """
+    두 결과의 지표 비교 (둘 다 있는 _per_sec/_ms 지표만)
+
+    Returns:
+        list: threshold(%)보다 나빠진 (벤치마크, 지표, 변화율%) 목록
+    """
+    regressions = []
+    print(f"{old['commit']} → {new['commit']} (기준 {threshold:.0f}%)")
+    print(f"{'지표':44s} {'이전':>14s} {'지금':>14s} {'변화':>9s}")
+    for bench, metrics in new["results"].items():
+        before = old["results"].get(bench, {})
+        for metric, value in metrics.items():
+            if metric not in before:
+                continue
+            if metric.endswith("_per_sec"):
+                higher_is_better = True
+            elif metric.endswith("_ms"):
+                higher_is_better = False
+            else:
+                continue
+            change = (value / before[metric] - 1) * 100 if before[metric] else 0.0
+            worse = -change if higher_is_better else change
+            mark = ""
+            if worse > threshold:
+                mark = "❌"
+                regressions.append((bench, metric, change))
+            elif worse < -threshold:
+                mark = "✅"
+            print(f"{bench + '.' + metric:44s} {before[metric]:>14,.2f} {value:>14,.2f} "
+                  f"{change:>+8.1f}% {mark}")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 모음")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fixture_parser = commands.add_parser("fixtures", help="수집 벤치마크용 응답 기록 만들기")
+    fixture_parser.add_argument("--dir", default=FIXTURE_DIR)
+    source = fixture_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--sample", action="store_true", help="고정 값 샘플 생성")
+    source.add_argument("--from-archive", metavar="ROOT", help="원본 보관소에서 옮기기")
+    fixture_parser.add_argument("--start", required=True, help="시작일")
+    fixture_parser.add_argument("--end", required=True, help="종료일")
+
+    run_parser = commands.add_parser("run", help="벤치마크 실행 후 결과 JSON 저장")
+    run_parser.add_argument("--quick", action="store_true", help="작은 크기로 빠르게")
+    run_parser.add_argument("--only", help=f"실행할 벤치마크 ({','.join(BENCHMARKS)})")
+    run_parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    run_parser.add_argument("--latency", type=float, default=0.02, help="모의 서버 요청당 지연(초)")
+    run_parser.add_argument("--error-rate", type=float, default=0.0, help="모의 서버 500 응답 비율")
+    run_parser.add_argument("--processes", type=int, default=2, help="스윕 워커 프로세스 수")
+    run_parser.add_argument("--output-dir", default=RESULTS_DIR)
+
+    compare_parser = commands.add_parser("compare", help="두 결과 비교 (나빠지면 종료 코드 1)")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="허용 변화율 (%%)")
+
+    args = parser.parse_args()
+
+    if args.command == "fixtures":
+        if args.sample:
+            count = write_sample_fixtures(args.start, args.end, args.dir)
+            print(f"✓ 샘플 기록 {count}일 → {args.dir}/")
+        else:
+            start, end = args.start.replace("-", ""), args.end.replace("-", "")
+            counts = fixtures_from_archive(args.from_archive, start, end, args.dir)
+            print(f"✓ 기록 → {args.dir}/ " + ", ".join(f"{p} {c}건" for p, c in counts.items()))
+    elif args.command == "run":
+        names = args.only.split(",") if args.only else BENCHMARKS
+        unknown = set(names) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"알 수 없는 벤치마크: {', '.join(sorted(unknown))}")
+        if "collect" in names and not fixture_dates(args.fixtures):
+            parser.error(f"{args.fixtures}/ 에 기록이 없습니다. 먼저 'bench_suite.py fixtures'를 실행하세요")
+        report = run_suite(names, args.quick, args.fixtures, args.latency, args.error_rate,
+                           args.processes)
+        print(f"\n✓ 결과 저장: {save_results(report, args.output_dir)}")
+    else:
+        with open(args.old, encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)}개 지표가 {args.threshold:.0f}% 넘게 나빠졌습니다")
+            sys.exit(1)
+        print("\n✓ 기준을 넘게 나빠진 지표 없음")
@@ -5,7 +5,7 @@
 """
 
 import yfinance as yf
-import requests
+import http_client
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -43,7 +43,7 @@ def get_exchange_rate(auth_key, date_str):
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         if response.status_code != 200:
             print(f"환율 API 오류 ({date_str}): HTTP {response.status_code}")
             return None
@@ -90,7 +90,7 @@ def get_krx_gold_price(auth_key, date_str):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10)
         
         if response.status_code != 200:
             return None
@@ -5,7 +5,7 @@
 """
 
 import yfinance as yf
-import requests
+import http_client
 import pandas as pd
 from datetime import datetime, timedelta
 import traceback
@@ -42,7 +42,7 @@ def get_exchange_rate(auth_key, date_str):
     
     try:
         debug_print(f"환율 API 호출: {date_str}")
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         debug_print(f"환율 API 응답 코드: {response.status_code}")
         
         if response.status_code != 200:
@@ -104,7 +104,7 @@ def get_krx_gold_price(auth_key, date_str):
         debug_print(f"Headers: AUTH_KEY={auth_key[:20]}...")
         debug_print(f"Params: {params}")
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10)
         debug_print(f"KRX API 응답 코드: {response.status_code}")
         debug_print(f"KRX API 응답 헤더: {dict(response.headers)}")
         debug_print(f"KRX API 응답 내용 (처음 500자): {response.text[:500]}")
@@ -3,21 +3,32 @@
 """
 금 김치프리미엄 데이터 수집 스크립트 (최종 버전)
 KRX 금시장 일별매매정보 API 사용
+
+API 키는 환경 변수 EXIM_API_KEY / KRX_API_KEY에서 읽는다.
+yfinance/pandas/numpy는 쓰는 함수 안에서 불러온다 (API 테스트/증분 판단만 할 때는
+불러오지 않아 시작이 빠르다). 명령줄 사용은 gold_cli.py 참고.
 """
 
-import yfinance as yf
 import requests
-import pandas as pd
+import http_client
 from datetime import datetime, timedelta
 import urllib3
 import json
+import os
+import re
+import glob
+
+import rate_limit
+from instrumentation import METRICS
+from rate_limit import AdaptiveLimiter
+from response_cache import ResponseCache
 
 # SSL 경고 무시
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ==================== 설정 영역 ====================
-EXIM_API_KEY = "LadS1IpKN2DQynQ4jIn9KcqSXBSpg21X"
-KRX_API_KEY = "A565FC8AB3A94EFA8D55C3AFD888B58DA452D41E"
+EXIM_API_KEY = os.environ.get("EXIM_API_KEY", "")  # 한국수출입은행 환율 API 키
+KRX_API_KEY = os.environ.get("KRX_API_KEY", "")    # KRX OpenAPI 인증키
 
 # 데이터 수집 기간 설정
 START_DATE = "2024-01-01"  # KRX 금시장은 2014년 3월 24일부터
@@ -26,52 +37,238 @@ END_DATE = datetime.now().strftime("%Y-%m-%d")
 # 설정
 USE_KRX_API = True
 SAMPLE_DOMESTIC_PRICE = 85000  # KRX API 실패시
+OZ_TO_GRAM = 31.1034768  # 1트로이온스 = 31.1034768g
+
+# API 엔드포인트
+EXIM_URL = "https://www.koreaexim.go.kr/site/program/financial/exchangeJSON"
+KRX_URL = "https://data-dbg.krx.co.kr/svc/apis/gen/gold_bydd_trd"
+
+# 동시 수집 설정 (1이면 기존처럼 순차 호출)
+MAX_WORKERS = 8
+EXIM_MAX_CONCURRENCY = 4  # 수출입은행 동시 요청 상한
+KRX_MAX_CONCURRENCY = 4   # KRX 동시 요청 상한
+
+# KRX 휴장일 (주말 외). 매년 같은 날짜(MMDD) + 파일로 관리하는 개별 휴장일
+KRX_FIXED_HOLIDAYS = {"0101", "0301", "0501", "0505", "0606", "0815", "1003", "1009", "1225", "1231"}
+KRX_HOLIDAY_FILE = "krx_holidays.txt"
+
+# 요청 속도 조절 (rate_limit.py): 시작 속도에서 제한 응답이 없으면 최대 속도까지 올린다
+EXIM_RATE = 5.0           # 수출입은행 시작 속도 (요청/초)
+EXIM_MAX_RATE = 20.0
+KRX_RATE = 5.0            # KRX 시작 속도 (요청/초)
+KRX_MAX_RATE = 20.0
+FETCH_MAX_ATTEMPTS = 4    # 날짜당 최대 요청 횟수 (첫 요청 포함)
+RETRY_BASE_DELAY = 1.0    # n번째 재시도 대기 = 0 ~ min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2^n)초
+RETRY_MAX_DELAY = 30.0
+EXIM_LIMITER = AdaptiveLimiter("EXIM", EXIM_RATE, EXIM_MAX_RATE)
+KRX_LIMITER = AdaptiveLimiter("KRX", KRX_RATE, KRX_MAX_RATE)
+
+# 응답 캐시 (지난 날짜는 영구 보관, 오늘 날짜는 짧게만 유지)
+USE_RESPONSE_CACHE = True
+EXIM_ENDPOINT = "exchangeJSON/AP01"
+KRX_ENDPOINT = "gold_bydd_trd"
+RESPONSE_CACHE = ResponseCache()
+
+# 연도별 Arrow 데이터셋 (gold_dataset.py, pyarrow 필요). CSV와 함께 갱신한다
+SAVE_TO_DATASET = True
+DATASET_DIR = "gold_dataset"
+
+# 증분 수집 (update_dataset): CSV에 행을 붙이는 동안 원래 크기를 기록해 두는 저널
+APPEND_JOURNAL_SUFFIX = ".append.json"
+
+# SQLite 저장소 (gold_store.py). 일별 데이터와 API 원본 관측값을 함께 저장
+USE_STORE = True
+STORE_PATH = "gold_data.db"
+STORE_READ_THROUGH = True   # 저장소에 원본 관측값이 있는 날짜는 API를 다시 부르지 않음
+
+# 원본 응답 보관소 (raw_archive.py). 새로 받은 응답을 압축 보관해 오프라인 재계산에 사용
+USE_RAW_ARCHIVE = True
+RAW_ARCHIVE_DIR = "raw_archive"
+
+# 계측 (instrumentation.py): 단계별 소요 시간/요청 수/바이트/재시도/캐시 적중
+METRICS_REPORT = True     # CSV 옆에 {파일명}.metrics.json 실행 보고서 저장
+METRICS_PORT = None       # 포트 번호를 주면 127.0.0.1:포트/metrics 로 Prometheus 텍스트 노출
 # ===================================================
 
+# 이번 수집에서 받은 원본 응답 (provider, 날짜, 응답, 새로 받았는지).
+# 수집이 끝나면 저장소/보관소에 한 번에 기록
+_raw_payloads = []
 
-def get_exchange_rate(auth_key, date_str):
+
+def remember_payload(provider, date_str, payload, fresh=True):
+    """원본 응답을 기록 대기열에 추가 (워커 스레드에서 호출, fresh=False는 캐시 적중)"""
+    if (USE_STORE or USE_RAW_ARCHIVE) and payload is not None:
+        _raw_payloads.append((provider, date_str, payload, fresh))
+
+
+def take_raw_payloads():
+    """기록 대기열을 비우고 그 내용을 반환"""
+    payloads = list(_raw_payloads)
+    _raw_payloads.clear()
+    return payloads
+
+
+def classify_exim_payload(data):
     """
-    한국수출입은행 환율 API 호출
+    exchangeJSON 응답 본문 → rate_limit 상태
+
+    항목의 result 코드: 1 성공, 2 DATA 코드 오류, 3 인증코드 오류, 4 일일 제한 횟수 마감.
+    빈 목록은 그날 고시 환율이 없다는 뜻(주말/휴일, 11시 이전)이라 정상 응답이다.
+    목록 대신 오는 {'RESULT': ...}/{'error': ...} 객체는 요청 제한으로 보고 속도를 낮춘다.
     """
-    url = "https://www.koreaexim.go.kr/site/program/financial/exchangeJSON"
+    if isinstance(data, dict):
+        code = data.get("RESULT", data.get("result"))
+    elif isinstance(data, list):
+        if not data:
+            return rate_limit.OK
+        code = data[0].get("result") if isinstance(data[0], dict) else None
+    else:
+        return rate_limit.ERROR
+
+    try:
+        code = int(code)
+    except (TypeError, ValueError):
+        code = None
+    if code == 1 and isinstance(data, list):
+        return rate_limit.OK
+    if code == 3:
+        return rate_limit.AUTH
+    if code == 4:
+        return rate_limit.QUOTA
+    if code == 2:
+        return rate_limit.ERROR
+    if isinstance(data, dict):
+        return rate_limit.THROTTLED
+    return rate_limit.OK  # result 코드가 없는 목록 (모의 서버 등)
+
+
+def classify_krx_payload(result):
+    """gold_bydd_trd 응답 본문 → rate_limit 상태 (OutBlock_1이 없으면 오류)"""
+    if isinstance(result, dict) and "OutBlock_1" in result:
+        return rate_limit.OK
+    return rate_limit.ERROR
+
+
+def cached_response(provider, endpoint, date_str, classify):
+    """
+    캐시된 원본 응답 (classify로 다시 분류해 정상 응답일 때만)
+
+    예전에 저장된 한도 초과/오류 응답은 캐시 미스로 세고 다시 요청하게 한다.
+    """
+    if not USE_RESPONSE_CACHE:
+        return None
+    cached = RESPONSE_CACHE.get(provider, endpoint, date_str,
+                                accept=lambda payload: classify(payload) == rate_limit.OK)
+    if cached is None:
+        return None
+    remember_payload(provider, date_str, cached, fresh=False)
+    METRICS.count(provider, "cache_hits")
+    return cached
+
+
+def store_response(provider, endpoint, date_str, payload):
+    """정상 응답을 캐시와 기록 대기열에 넣는다"""
+    if USE_RESPONSE_CACHE:
+        RESPONSE_CACHE.put(provider, endpoint, date_str, payload)
+    remember_payload(provider, date_str, payload)
+
+
+def record_response(name, response, status):
+    """HTTP 응답 하나의 카운터 기록 (바이트, 어댑터 재시도, 상태별 응답 수)"""
+    METRICS.count(name, "bytes", len(response.content))
+    retries = getattr(response.raw, "retries", None)
+    if retries is not None and retries.history:
+        METRICS.count(name, "transport_retries", len(retries.history))
+    METRICS.count(name, f"responses_{status}")
+
+
+def fetch_exim_response(auth_key, date_str):
+    """
+    한국수출입은행 환율 API 원본 응답 조회 (캐시 우선, EXIM_LIMITER 속도 조절)
+
+    Returns:
+        tuple: (rate_limit 상태, exchangeJSON 응답 또는 None)
+    """
+    cached = cached_response("exim", EXIM_ENDPOINT, date_str, classify_exim_payload)
+    if cached is not None:
+        return rate_limit.OK, cached
+
+    url = EXIM_URL
     params = {
         'authkey': auth_key,
         'searchdate': date_str,
         'data': 'AP01'
     }
-    
+
+    data = None
+    retry_after = None
     try:
-        response = requests.get(url, params=params, timeout=10, verify=False)
-        
-        if response.status_code != 200:
-            return None
-        
-        data = response.json()
-        
-        if isinstance(data, dict) and ('error' in data or 'RESULT' in data):
-            return None
-        
-        for item in data:
-            if item.get('cur_unit') == 'USD':
-                rate = item.get('deal_bas_r', '').replace(',', '')
-                if rate:
-                    return float(rate)
-        
-        return None
-        
-    except:
-        return None
+        with EXIM_LIMITER, METRICS.timer("exim"):
+            response = http_client.get(url, params=params, timeout=10, verify=False)
 
+        status = rate_limit.classify_http_status(response.status_code)
+        if status is None:
+            data = response.json()
+            status = classify_exim_payload(data)
+        else:
+            retry_after = rate_limit.retry_after_seconds(response.headers)
+        record_response("exim", response, status)
+    except (requests.RequestException, ValueError):
+        # 연결 실패/시간 초과, JSON이 아닌 응답
+        status = rate_limit.ERROR
+        METRICS.count("exim", f"responses_{status}")
+    EXIM_LIMITER.record(status, retry_after)
 
+    if status != rate_limit.OK:
+        return status, None
 
-def get_krx_gold_price(auth_key, date_str):
+    store_response("exim", EXIM_ENDPOINT, date_str, data)
+    return status, data
+
+
+def fetch_exim_payload(auth_key, date_str):
     """
-    KRX 금시장 일별매매정보 API 호출
-    실패 시 None 반환
+    한국수출입은행 환율 API 원본 응답 조회 (캐시 우선)
+
+    Returns:
+        list: exchangeJSON 응답, 실패 시 None
+    """
+    return fetch_exim_response(auth_key, date_str)[1]
+
+
+def parse_exchange_rate(data):
+    """exchangeJSON 응답에서 USD 매매기준율 추출"""
+    for item in data:
+        if item.get('cur_unit') == 'USD':
+            rate = item.get('deal_bas_r', '').replace(',', '')
+            if rate:
+                return float(rate)
+
+    return None
+
+
+def get_exchange_rate(auth_key, date_str):
     """
-    import re
+    한국수출입은행 환율 API 호출
+    """
+    data = fetch_exim_payload(auth_key, date_str)
+    if data is None:
+        return None
+    return parse_exchange_rate(data)
 
-    url = "https://data-dbg.krx.co.kr/svc/apis/gen/gold_bydd_trd"
+
+def fetch_krx_response(auth_key, date_str):
+    """
+    KRX 금시장 일별매매정보 API 원본 응답 조회 (캐시 우선, KRX_LIMITER 속도 조절)
+
+    Returns:
+        tuple: (rate_limit 상태, gold_bydd_trd 응답 또는 None)
+    """
+    cached = cached_response("krx", KRX_ENDPOINT, date_str, classify_krx_payload)
+    if cached is not None:
+        return rate_limit.OK, cached
+
+    url = KRX_URL
 
     headers = {
         "Content-Type": "application/json",
@@ -80,64 +277,214 @@ def get_krx_gold_price(auth_key, date_str):
 
     data = {"basDd": date_str}
 
+    result = None
+    retry_after = None
     try:
-        response = requests.post(
-            url,
-            headers=headers,
-            json=data,
-            timeout=10,
-            verify=False
-        )
+        with KRX_LIMITER, METRICS.timer("krx"):
+            response = http_client.post(
+                url,
+                headers=headers,
+                json=data,
+                timeout=10,
+                verify=False
+            )
 
-        if response.status_code != 200:
+        status = rate_limit.classify_http_status(response.status_code)
+        if status is None:
+            result = response.json()
+            status = classify_krx_payload(result)
+        else:
             print("KRX HTTP ERROR:", response.status_code, response.text[:200])
-            return None
+            retry_after = rate_limit.retry_after_seconds(response.headers)
+        record_response("krx", response, status)
+    except (requests.RequestException, ValueError) as e:
+        print("KRX EXCEPTION:", e)
+        status = rate_limit.ERROR
+        METRICS.count("krx", f"responses_{status}")
+    KRX_LIMITER.record(status, retry_after)
 
-        result = response.json()
-        items = result.get("OutBlock_1", [])
+    if status != rate_limit.OK:
+        return status, None
 
-        for item in items:
-            isu_nm = (item.get("ISU_NM") or "").replace(" ", "").lower()
-            raw = item.get("TDD_CLSPRC", "")
-
-            # 문서에 나온 것처럼 "-"면 스킵 :contentReference[oaicite:0]{index=0}
-            if raw == "-" or not raw:
-                continue
-
-            # 숫자만 안전하게 파싱
-            num = re.sub(r"[^0-9,]", "", raw).replace(",", "")
-            if not num:
-                continue
-
-            price = float(num)
-
-            # 단위 환산
-            if "1kg" in isu_nm:
-                return price / 1000
-            elif "100g" in isu_nm:
-                return price / 100
-            elif "1g" in isu_nm:
-                return price
-            else:
-                return price  # fallback
+    store_response("krx", KRX_ENDPOINT, date_str, result)
+    return status, result
+
+
+def fetch_krx_payload(auth_key, date_str):
+    """
+    KRX 금시장 일별매매정보 API 원본 응답 조회 (캐시 우선)
+
+    Returns:
+        dict: gold_bydd_trd 응답, 실패 시 None
+    """
+    return fetch_krx_response(auth_key, date_str)[1]
+
+
+# KRX 응답 파싱: 상품명에서 거래 단위(g)를 읽고, 여러 상품이 있으면 이 순서로 고른다
+KRX_UNIT_PRIORITY = (1000, 100, 1)   # 금 99.99_1kg → 미니금 99.99_100g → 1g
+_KRX_UNIT = re.compile(r"(\d+)(kg|g)(?![a-z])")
+_KRX_NON_DIGIT = re.compile(r"[^0-9]")
+_krx_unit_cache = {}
 
-        # 여기까지 왔다는 건 전부 "-"였다는 뜻
+
+def krx_unit_grams(isu_nm):
+    """
+    상품명 → 거래 단위 (g), 단위가 없으면 None
+
+    '금 99.99_1kg' → 1000, '미니금 99.99_100g' → 100. 상품명 종류가 몇 개뿐이라 결과를 기억해 둔다.
+    """
+    grams = _krx_unit_cache.get(isu_nm, 0)
+    if grams == 0:
+        match = _KRX_UNIT.search(isu_nm.replace(" ", "").lower())
+        grams = None
+        if match:
+            grams = int(match.group(1)) * (1000 if match.group(2) == "kg" else 1) or None
+        _krx_unit_cache[isu_nm] = grams
+    return grams
+
+
+def _krx_rank(grams):
+    """KRX_UNIT_PRIORITY 안의 순위 (목록에 없는 단위는 맨 뒤)"""
+    try:
+        return KRX_UNIT_PRIORITY.index(grams)
+    except ValueError:
+        return len(KRX_UNIT_PRIORITY)
+
+
+def _krx_number(raw):
+    """'130,000' → 130000.0, '-'/빈 값은 None"""
+    if raw is None:
         return None
+    text = str(raw).replace(",", "")
+    if text.isdecimal():
+        return float(text)  # 대부분은 쉼표만 빼면 된다
+    digits = _KRX_NON_DIGIT.sub("", text)
+    return float(digits) if digits else None
 
-    except Exception as e:
-        print("KRX EXCEPTION:", e)
+
+def parse_krx_gold_price(result):
+    """
+    gold_bydd_trd 응답에서 1g 환산 가격 추출
+
+    종가가 "-"(거래 없음)인 상품은 건너뛰고, 남은 상품 중 KRX_UNIT_PRIORITY 순으로
+    하나를 골라 거래 단위로 나눈다 (단위를 알 수 없는 상품은 종가 그대로, 맨 뒤 순위).
+    모두 "-"면 None (휴장일).
+    """
+    best = None
+    for item in result.get("OutBlock_1", []):
+        close = _krx_number(item.get("TDD_CLSPRC"))
+        if close is None:
+            continue
+        grams = krx_unit_grams(item.get("ISU_NM") or "")
+        rank = _krx_rank(grams)
+        if best is None or rank < best[0]:
+            best = (rank, close / grams if grams else close)
+    return None if best is None else best[1]
+
+
+def parse_krx_table(payloads):
+    """
+    여러 날짜의 gold_bydd_trd 응답을 상품별 표로 변환 (raw_archive krx-table 출력용)
+
+    모든 상품 행을 남기는 분석용 표다. 날짜별 1g 가격만 필요하면 parse_krx_gold_price가
+    더 빠르다 (응답 JSON을 훑는 비용이 대부분이라 표로 모아도 벡터화 이득이 없다).
+
+    Args:
+        payloads: {YYYYMMDD: gold_bydd_trd 응답}
+
+    Returns:
+        DataFrame: date(datetime64), product(category), unit_grams(float, 모르면 NaN),
+                   close(float, "-"면 NaN), volume(float). 날짜별로 응답 안의 순서 유지
+    """
+    import numpy as np
+    import pandas as pd
+
+    counts, products, closes, volumes = [], [], [], []
+    for payload in payloads.values():
+        items = (payload or {}).get("OutBlock_1", [])
+        counts.append(len(items))
+        for item in items:
+            products.append(item.get("ISU_NM") or "")
+            closes.append(_krx_number(item.get("TDD_CLSPRC")))
+            volumes.append(_krx_number(item.get("ACC_TRDVOL")))
+
+    days = np.array([f"{d[:4]}-{d[4:6]}-{d[6:]}" for d in payloads], dtype="datetime64[D]")
+    grams = {name: krx_unit_grams(name) or np.nan for name in set(products)}
+    return pd.DataFrame({
+        "date": days[np.repeat(np.arange(len(days)), counts)],
+        "product": pd.Categorical([name.strip() for name in products]),
+        "unit_grams": np.array([grams[name] for name in products], dtype=float),
+        "close": np.array(closes, dtype=float),
+        "volume": np.array(volumes, dtype=float),
+    })
+
+
+def get_krx_gold_price(auth_key, date_str):
+    """
+    KRX 금시장 일별매매정보 API 호출
+    실패 시 None 반환
+    """
+    result = fetch_krx_payload(auth_key, date_str)
+    if result is None:
         return None
+    return parse_krx_gold_price(result)
+
 
 def calculate_kimchi_premium(domestic_price_krw_g, international_price_usd_oz, exchange_rate):
     """김치프리미엄 계산"""
-    OZ_TO_GRAM = 31.1034768
     international_krw_g = (international_price_usd_oz * exchange_rate) / OZ_TO_GRAM
     premium = ((domestic_price_krw_g / international_krw_g) - 1) * 100
     return round(premium, 2)
 
 
-def test_apis():
-    """API 테스트"""
+def round_half_even(values, ndigits=2):
+    """
+    배열 버전 round() - 파이썬 내장 round와 같은 결과
+
+    np.round는 값*10^n을 정수로 반올림하므로 x.xx5 근처 경계값에서 round()와
+    달라질 수 있다. 경계에 가까운 원소만 골라 내장 round로 다시 계산한다.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    flat = values.reshape(-1)
+    rounded = np.round(flat, ndigits)
+
+    scaled = flat * (10 ** ndigits)
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for idx in np.flatnonzero(near_tie):
+        rounded[idx] = round(float(flat[idx]), ndigits)
+
+    return rounded.reshape(values.shape)
+
+
+def calculate_kimchi_premium_batch(domestic_price_krw_g, international_price_usd_oz, exchange_rate):
+    """
+    김치프리미엄 일괄 계산 (배열/Series 입력, calculate_kimchi_premium과 같은 결과)
+
+    Returns:
+        ndarray: 김치프리미엄 (%)
+    """
+    import numpy as np
+
+    domestic = np.asarray(domestic_price_krw_g, dtype=float)
+    international = np.asarray(international_price_usd_oz, dtype=float)
+    rate = np.asarray(exchange_rate, dtype=float)
+
+    international_krw_g = (international * rate) / OZ_TO_GRAM
+    premium = ((domestic / international_krw_g) - 1) * 100
+    return round_half_even(premium, 2)
+
+
+def test_apis(exim_key=None, krx_key=None):
+    """
+    API 테스트 (키를 주지 않으면 EXIM_API_KEY/KRX_API_KEY)
+
+    Returns:
+        bool: 환율과 KRX 1g 가격을 모두 받았으면 True
+    """
+    exim_key = exim_key or EXIM_API_KEY
+    krx_key = krx_key or KRX_API_KEY
     print("\n" + "=" * 60)
     print("API 연결 테스트")
     print("=" * 60)
@@ -146,12 +493,15 @@ def test_apis():
     print("\n[1/2] 환율 API 테스트")
     print("-" * 60)
     test_date = datetime.now().strftime("%Y%m%d")
-    # 주말/휴장일 대비: 어제 날짜로 한 번 더 테스트
-    from datetime import timedelta
-    test_date_prev = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+    # 주말/휴장일 대비: 직전 KRX 거래일로 한 번 더 테스트
+    test_date_prev = previous_krx_trading_day(test_date)
     
-    rate = get_exchange_rate(EXIM_API_KEY, test_date)
-    if rate:
+    rate = get_exchange_rate(exim_key, test_date)
+    if rate is None:
+        print(f"   (고시 환율 없음 → 직전 거래일 {test_date_prev} 조회)")
+        rate = get_exchange_rate(exim_key, test_date_prev)
+    exim_ok = rate is not None
+    if exim_ok:
         print(f"✅ 성공!")
         print(f"   USD/KRW: {rate:,.2f}원")
     else:
@@ -162,18 +512,19 @@ def test_apis():
     print("\n[2/2] KRX 금시장 API 테스트")
     print("-" * 60)
     
-    url = "https://data-dbg.krx.co.kr/svc/apis/gen/gold_bydd_trd"
+    url = KRX_URL
     headers = {
         "Content-Type": "application/json",
-    "AUTH_KEY": KRX_API_KEY, 
+    "AUTH_KEY": krx_key, 
     }
     data_req = {"basDd": test_date}
+    krx_ok = False
     
     try:
         print(f"   엔드포인트: {url}")
         print(f"   날짜: {test_date}")
         
-        response = requests.post(url, headers=headers, json=data_req, timeout=10, verify=False)
+        response = http_client.post(url, headers=headers, json=data_req, timeout=10, verify=False)
         print(f"   응답 코드: {response.status_code}")
         
         if response.status_code == 200:
@@ -190,11 +541,14 @@ def test_apis():
                     print(f"   {i}. {isu_nm}: {tdd_clsprc}원")
                 
                 # 1g 환산 가격
-                price_per_g = get_krx_gold_price(KRX_API_KEY, test_date)
+                price_per_g = get_krx_gold_price(krx_key, test_date)
 
                 if price_per_g is None:
-                    price_per_g = get_krx_gold_price(KRX_API_KEY, test_date_prev)
+                    print(f"   (휴장일 → 직전 거래일 {test_date_prev} 조회)")
+                    price_per_g = get_krx_gold_price(krx_key, test_date_prev)
 
+                krx_ok = price_per_g is not None
+                if krx_ok:
                     print(f"\n   ✅ 1g 환산 가격: {price_per_g:,.0f}원/g")
                 else:
                     print(f"\n   ⚠️  가격 파싱 실패")
@@ -210,23 +564,222 @@ def test_apis():
         import traceback
         traceback.print_exc()
 
+    return exim_ok and krx_ok
+
+
+def load_krx_holidays(path=KRX_HOLIDAY_FILE):
+    """
+    KRX 휴장일 파일 읽기 (한 줄에 YYYYMMDD 하나, # 주석 허용)
+
+    설/추석/선거일/대체공휴일처럼 날짜가 해마다 바뀌는 휴장일을 여기에 적는다.
+    """
+    holidays = set()
+    if not os.path.exists(path):
+        return holidays
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip().replace("-", "")
+            if len(line) == 8 and line.isdigit():
+                holidays.add(line)
+    return holidays
+
+
+KRX_HOLIDAYS = load_krx_holidays()
+
+
+def is_krx_trading_day(date_api):
+    """주말/고정 휴장일/휴장일 파일에 없는 날이면 True"""
+    date = datetime.strptime(date_api, "%Y%m%d")
+    if date.weekday() >= 5:
+        return False
+    if date_api[4:] in KRX_FIXED_HOLIDAYS:
+        return False
+    return date_api not in KRX_HOLIDAYS
+
+
+def krx_trading_days(start_date, end_date, index=None):
+    """
+    KRX 거래일 목록 (YYYYMMDD)
+
+    Args:
+        start_date, end_date: YYYY-MM-DD (end_date 미포함, yfinance와 동일)
+        index: 날짜 인덱스가 주어지면(예: yfinance 시세) 그 날짜들 중에서만 고른다
+    """
+    if index is not None:
+        candidates = sorted({date.strftime("%Y%m%d") for date in index})
+        start_api = start_date.replace("-", "")
+        end_api = end_date.replace("-", "")
+        candidates = [d for d in candidates if start_api <= d < end_api]
+    else:
+        current = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        candidates = []
+        while current < end:
+            candidates.append(current.strftime("%Y%m%d"))
+            current += timedelta(days=1)
+
+    return [d for d in candidates if is_krx_trading_day(d)]
+
+
+def previous_krx_trading_day(date_api):
+    """date_api 이전의 가장 가까운 KRX 거래일"""
+    date = datetime.strptime(date_api, "%Y%m%d")
+    while True:
+        date -= timedelta(days=1)
+        candidate = date.strftime("%Y%m%d")
+        if is_krx_trading_day(candidate):
+            return candidate
+
+
+def get_exchange_rates(auth_key, dates_api, workers=MAX_WORKERS,
+                       concurrency=EXIM_MAX_CONCURRENCY,
+                       max_attempts=FETCH_MAX_ATTEMPTS, progress_every=0, failed_out=None):
+    """
+    여러 날짜의 USD 환율을 한 번에 조회
+
+    EXIM_LIMITER로 속도를 조절하고, 실패한 날짜는 지수 대기 + 지터 뒤에 다시 요청한다.
+    응답은 왔지만 고시 환율이 없는 날(빈 목록)은 재시도하지 않는다.
+
+    failed_out(dict)을 주면 끝내 실패한 날짜 → 마지막 상태를 채운다.
+
+    Returns:
+        dict: {YYYYMMDD: 환율}
+    """
+    failures = {}
+    payloads = rate_limit.schedule_fetches(
+        lambda d: fetch_exim_response(auth_key, d),
+        list(dict.fromkeys(dates_api)), EXIM_LIMITER,
+        workers=max(1, min(workers, concurrency)), max_attempts=max_attempts,
+        base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+        progress_every=progress_every, label="환율", failed_out=failures,
+    )
+
+    return exchange_rates_from(payloads, failures, failed_out)
+
+
+def exchange_rates_from(payloads, failures, failed_out=None):
+    """schedule_fetches 결과 → {YYYYMMDD: 환율} (동기/비동기 엔진 공용)"""
+    rates = {}
+    for date_api, payload in payloads.items():
+        rate = parse_exchange_rate(payload)
+        if rate is not None:
+            rates[date_api] = rate
+
+    if failures:
+        print(f"  ⚠️  환율 최종 실패: {len(failures)}일 ({_count_statuses(failures)})")
+    if failed_out is not None:
+        failed_out.update(failures)
+    return rates
+
+
+def _count_statuses(failures):
+    """{날짜: 상태} → '상태 N일, ...'"""
+    counts = {}
+    for status in failures.values():
+        counts[status] = counts.get(status, 0) + 1
+    return ", ".join(f"{status} {count}일" for status, count in sorted(counts.items()))
+
+
+def get_krx_gold_prices(auth_key, dates_api, workers=MAX_WORKERS,
+                        concurrency=KRX_MAX_CONCURRENCY,
+                        max_attempts=FETCH_MAX_ATTEMPTS, progress_every=0, failed_out=None):
+    """
+    여러 날짜의 KRX 금 시세를 한 번에 조회
+
+    KRX 휴장일(주말/휴장일 목록)은 요청하지 않는다. KRX_LIMITER로 속도를 조절하고,
+    실패한 날짜는 지수 대기 + 지터 뒤에 다시 요청한다.
+    응답은 왔지만 가격이 전부 "-"인 날은 휴장일로 보고 재시도하지 않는다.
+
+    failed_out(dict)을 주면 끝내 실패한 날짜 → 마지막 상태를 채운다.
+
+    Returns:
+        dict: {YYYYMMDD: 1g 환산 가격}
+    """
+    failures = {}
+    payloads = rate_limit.schedule_fetches(
+        lambda d: fetch_krx_response(auth_key, d),
+        krx_pending_dates(dates_api), KRX_LIMITER,
+        workers=max(1, min(workers, concurrency)), max_attempts=max_attempts,
+        base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+        progress_every=progress_every, label="KRX", failed_out=failures,
+    )
+
+    return krx_prices_from(payloads, failures, failed_out)
+
+
+def krx_pending_dates(dates_api):
+    """요청할 KRX 날짜 (중복 제거, 휴장일 제외, 날짜 순)"""
+    return sorted({d for d in dates_api if is_krx_trading_day(d)})
+
+
+def krx_prices_from(payloads, failures, failed_out=None):
+    """schedule_fetches 결과 → {YYYYMMDD: 1g 환산 가격} (동기/비동기 엔진 공용)"""
+    prices = {}
+    for date_api, payload in payloads.items():
+        price = parse_krx_gold_price(payload)
+        if price is not None:
+            prices[date_api] = price
+
+    if failures:
+        print(f"  ⚠️  KRX 최종 실패: {len(failures)}일 ({_count_statuses(failures)})")
+    if failed_out is not None:
+        failed_out.update(failures)
+    return prices
+
+
+def fetch_daily_quotes(dates_api, exim_key, krx_key, workers=MAX_WORKERS,
+                       exim_concurrency=EXIM_MAX_CONCURRENCY,
+                       krx_concurrency=KRX_MAX_CONCURRENCY,
+                       progress_every=20):
+    """
+    여러 거래일의 환율 + KRX 금 시세를 워커 풀로 동시에 조회
+
+    환율을 먼저 모두 조회하고, 환율이 있는 날 중 KRX 거래일만 KRX에 요청한다.
+    두 단계는 차례로 돌기 때문에 각 단계의 실제 동시 요청 수는
+    min(workers, 해당 소스의 concurrency)다 (기본값이면 MAX_WORKERS=8이어도 4개씩).
+
+    Args:
+        dates_api: YYYYMMDD 형식 날짜 리스트
+        workers: 워커 스레드 수 상한 (1이면 순차 조회)
+        exim_concurrency: 수출입은행 동시 요청 상한 (환율 단계의 워커 수도 이 값을 넘지 않음)
+        krx_concurrency: KRX 동시 요청 상한 (KRX 단계의 워커 수도 이 값을 넘지 않음)
+        progress_every: 진행률 출력 간격 (0이면 출력 안 함)
+
+    Returns:
+        list: dates_api와 같은 순서의 (환율, 국내 금 가격) 튜플 리스트
+    """
+    with METRICS.timer("exim_batch"):
+        rates = get_exchange_rates(
+            exim_key, dates_api, workers=workers,
+            concurrency=exim_concurrency, progress_every=progress_every,
+        )
+
+    prices = {}
+    if USE_KRX_API and krx_key:
+        krx_dates = [d for d in dates_api if d in rates]
+        with METRICS.timer("krx_batch"):
+            prices = get_krx_gold_prices(
+                krx_key, krx_dates, workers=workers,
+                concurrency=krx_concurrency, progress_every=progress_every,
+            )
+
+    return [(rates.get(d), prices.get(d) if d in rates else None) for d in dates_api]
+
+
+def fetch_international_prices(start_date, end_date):
+    """
+    Yahoo Finance 국제 금 시세(GC=F) 수집
+
+    Returns:
+        DataFrame: 일별 시세 (end_date 미포함), 실패 또는 데이터 없음이면 None
+    """
+    import yfinance as yf
 
-def collect_data(start_date, end_date, exim_key, krx_key):
-    """데이터 수집 메인 함수"""
-    print("=" * 60)
-    print("금 김치프리미엄 데이터 수집")
-    print("=" * 60)
-    
-    print(f"\n📅 수집 기간: {start_date} ~ {end_date}")
-    print(f"🔑 환율 API: {exim_key[:15]}...")
-    print(f"🔑 KRX API: {krx_key[:15]}...")
-    
-    # 1. 국제 금 시세 수집
-    print("\n[1/3] 국제 금 시세 수집 (Yahoo Finance)")
-    print("-" * 60)
     try:
         gold_ticker = yf.Ticker("GC=F")
-        gold_data = gold_ticker.history(start=start_date, end=end_date)
+        with METRICS.timer("yfinance"):
+            gold_data = gold_ticker.history(start=start_date, end=end_date)
+        METRICS.count("yfinance", "rows", len(gold_data))
         print(f"✓ {len(gold_data)}일치 데이터 수집 완료")
         
         if len(gold_data) == 0:
@@ -236,85 +789,156 @@ def collect_data(start_date, end_date, exim_key, krx_key):
     except Exception as e:
         print(f"❌ 국제 금 시세 수집 실패: {e}")
         return None
-    
-    # 2. 환율 및 국내 금 시세 수집
-    print("\n[2/3] 환율 및 국내 금 시세 조회")
-    print("-" * 60)
-    print("(API 호출 중... 시간이 걸립니다)\n")
-    
-    results = []
-    success_count = 0
-    fail_count = 0
-    krx_success_count = 0
-    
-    for idx, (date, row) in enumerate(gold_data.iterrows(), 1):
-        date_api = date.strftime("%Y%m%d")
-        date_csv = date.strftime("%Y-%m-%d")
-        
-        # 환율 조회
-        exchange_rate = get_exchange_rate(exim_key, date_api)
-        if exchange_rate is None:
-            fail_count += 1
+
+    return gold_data
+
+
+def collect_rows(gold_data, exim_key, krx_key, workers=MAX_WORKERS, engine="thread"):
+    """
+    국제 금 시세의 각 거래일에 대해 환율/국내 금 시세를 조회하고 프리미엄 계산
+
+    저장소(STORE_PATH)에 원본 관측값이 있는 날짜는 stored_quotes로 채우고 나머지만 조회한다.
+
+    Args:
+        engine: "thread"(워커 스레드 풀) 또는 "async"(asyncio + aiohttp)
+
+    Returns:
+        DataFrame: CSV 데이터 (날짜 순), 조회 실패일은 제외
+    """
+    RESPONSE_CACHE.reset_stats()
+    take_raw_payloads()
+    dates_api = [date.strftime("%Y%m%d") for date in gold_data.index]
+
+    stored = stored_quotes(dates_api, need_krx=bool(USE_KRX_API and krx_key))
+    pending = [d for d in dates_api if d not in stored]
+    if stored:
+        METRICS.count("store", "reused_days", len(stored))
+        print(f"✓ 저장소에 있는 {len(stored)}일은 다시 조회하지 않습니다 ({STORE_PATH})")
+
+    fetched = []
+    if pending and engine == "async":
+        import asyncio
+        import async_collector
+
+        print(f"(API 호출 중... asyncio 엔진, {len(pending)}일, 시간이 걸립니다)\n")
+        fetched = asyncio.run(async_collector.fetch_daily_quotes_async(pending, exim_key, krx_key))
+    elif pending:
+        print(f"(API 호출 중... 워커 환율 {max(1, min(workers, EXIM_MAX_CONCURRENCY))}개"
+              f" / KRX {max(1, min(workers, KRX_MAX_CONCURRENCY))}개, {len(pending)}일,"
+              f" 시간이 걸립니다)\n")
+        fetched = fetch_daily_quotes(pending, exim_key, krx_key, workers=workers)
+
+    by_date = dict(zip(pending, fetched))
+    by_date.update(stored)
+    quotes = [by_date[d] for d in dates_api]
+
+    with METRICS.timer("build"):
+        return build_rows(gold_data, quotes)
+
+
+def stored_quotes(dates_api, need_krx=True, path=None):
+    """
+    저장소에 원본 관측값이 남아 있는 날짜의 (환율, 국내 금 가격) (read-through)
+
+    환율은 exim_rates의 USD 매매기준율, 국내 가격은 krx_closes의 상품별 종가를
+    parse_krx_gold_price로 다시 환산한다 (API 응답을 받은 것과 같은 값).
+    USD 환율이 없는 날, need_krx인데 KRX 거래일의 종가 기록이 없는 날은 빠진다.
+
+    Returns:
+        dict: {YYYYMMDD: (환율, 1g 가격 또는 None)}
+    """
+    path = path or STORE_PATH
+    if not (USE_STORE and STORE_READ_THROUGH and dates_api and os.path.exists(path)):
+        return {}
+
+    from gold_store import GoldStore
+
+    with GoldStore(path) as store:
+        rates, closes = store.observations(min(dates_api), max(dates_api))
+
+    quotes = {}
+    for date_api in dates_api:
+        day = f"{date_api[:4]}-{date_api[4:6]}-{date_api[6:]}"
+        rate = rates.get(day)
+        if rate is None:
             continue
-        
-        # 국내 금 시세 조회
-        domestic_price = None
-        if USE_KRX_API and krx_key:
-            domestic_price = get_krx_gold_price(krx_key, date_api)
-            if domestic_price:
-                krx_success_count += 1
-        
-        # KRX 실패시 샘플 가격
-        if domestic_price is None:
-            import random
-            domestic_price = SAMPLE_DOMESTIC_PRICE + random.uniform(-2000, 2000)
-        
-        # 국제 금 시세
-        international_price = row['Close']
-        
-        # 김치프리미엄 계산
-        premium = calculate_kimchi_premium(
-            domestic_price,
-            international_price,
-            exchange_rate
-        )
-        
-        results.append({
-            'date': date_csv,
-            'domestic_price': round(domestic_price, 2),
-            'international_price': round(international_price, 2),
-            'exchange_rate': exchange_rate,
-            'premium': premium
-        })
-        
-        success_count += 1
-        
-        # 진행률 표시
-        if idx % 20 == 0:
-            progress = (idx / len(gold_data)) * 100
-            print(f"  진행: {idx}/{len(gold_data)} ({progress:.0f}%) - KRX 성공: {krx_success_count}")
-    
+        rows = closes.get(day)
+        price = None
+        if rows:
+            payload = {"OutBlock_1": [
+                {"ISU_NM": product, "TDD_CLSPRC": "-" if close is None else f"{close:.0f}"}
+                for product, close in rows
+            ]}
+            price = parse_krx_gold_price(payload)
+        elif need_krx and is_krx_trading_day(date_api):
+            continue  # KRX 응답을 아직 못 받은 날은 다시 조회
+        quotes[date_api] = (rate, price)
+    return quotes
+
+
+def build_frame(gold_data, quotes):
+    """
+    국제 금 시세와 (환율, 국내 금 가격) 조회 결과로 CSV 데이터 생성 (출력 없음)
+
+    행 단위로 딕셔너리를 쌓지 않고 컬럼 배열을 만든 뒤 프리미엄을 한 번에 계산한다.
+
+    Returns:
+        tuple: (DataFrame, 환율 실패 수, KRX 성공 수)
+               DataFrame은 date, domestic_price, international_price, exchange_rate, premium
+               (날짜 순, 환율 조회 실패일은 제외)
+    """
+    import numpy as np
+    import pandas as pd
+
+    import random
+
+    rates = np.array([np.nan if rate is None else rate for rate, _ in quotes], dtype=float)
+    ok = ~np.isnan(rates)
+    fail_count = int((~ok).sum())
+
+    domestic = [price for (rate, price) in quotes if rate is not None]
+    krx_success_count = sum(1 for price in domestic if price)
+
+    # KRX 실패시 샘플 가격
+    domestic = np.array([
+        price if price is not None else SAMPLE_DOMESTIC_PRICE + random.uniform(-2000, 2000)
+        for price in domestic
+    ], dtype=float)
+
+    international = gold_data['Close'].to_numpy(dtype=float)[ok]
+    exchange_rate = rates[ok]
+
+    df = pd.DataFrame({
+        'date': gold_data.index[ok].strftime("%Y-%m-%d"),
+        'domestic_price': round_half_even(domestic, 2),
+        'international_price': round_half_even(international, 2),
+        'exchange_rate': exchange_rate,
+        'premium': calculate_kimchi_premium_batch(domestic, international, exchange_rate),
+    })
+    return df, fail_count, krx_success_count
+
+
+def build_rows(gold_data, quotes):
+    """
+    build_frame 결과에 수집 통계 출력
+
+    Returns:
+        DataFrame: date, domestic_price, international_price, exchange_rate, premium
+    """
+    df, fail_count, krx_success_count = build_frame(gold_data, quotes)
+
     print(f"\n✓ 데이터 수집 완료")
-    print(f"  총 성공: {success_count}건")
+    print(f"  총 성공: {len(df)}건")
     print(f"  총 실패: {fail_count}건")
     print(f"  KRX API 성공: {krx_success_count}건")
-    
-    if success_count == 0:
-        print("❌ 수집된 데이터가 없습니다.")
-        return None
-    
-    # 3. CSV 저장
-    print("\n[3/3] CSV 파일 저장")
-    print("-" * 60)
-    
-    df = pd.DataFrame(results)
-    filename = f"gold_data_{start_date}_{end_date}.csv"
-    df.to_csv(filename, index=False, encoding='utf-8-sig')
-    
-    print(f"✓ 파일명: {filename}")
-    print(f"  데이터: {len(df)}행")
-    
-    # 통계
+    if USE_RESPONSE_CACHE:
+        print(f"  응답 캐시: {RESPONSE_CACHE.summary()}")
+
+    return df
+
+
+def print_statistics(df):
+    """수집 데이터 통계 출력"""
     print("\n" + "=" * 60)
     print("📊 데이터 통계")
     print("=" * 60)
@@ -341,11 +965,331 @@ def collect_data(start_date, end_date, exim_key, krx_key):
     print(f"  평균: {df['exchange_rate'].mean():,.2f}원")
     print(f"  최대: {df['exchange_rate'].max():,.2f}원")
     print(f"  최소: {df['exchange_rate'].min():,.2f}원")
+
+
+def save_to_dataset(df, root=DATASET_DIR):
+    """수집 결과를 연도별 데이터셋에도 반영 (같은 날짜는 덮어씀)"""
+    if not SAVE_TO_DATASET:
+        return
+    try:
+        from gold_dataset import upsert_rows
+    except ImportError:
+        print("⚠️  pyarrow가 없어 데이터셋 저장을 건너뜁니다 (pip install pyarrow)")
+        return
+    upsert_rows(df, root)
+    print(f"✓ 데이터셋 갱신: {root}/")
+
+
+def save_to_store(gold_data, df, payloads, path=STORE_PATH):
+    """
+    수집 결과를 SQLite 저장소에 기록
+
+    daily 행, Yahoo Finance 종가, 이번 수집에서 받은 EXIM/KRX 원본 응답을 upsert한다.
+    """
+    if not USE_STORE:
+        return
+
+    from gold_store import GoldStore
+
+    with GoldStore(path) as store:
+        store.upsert_daily(df)
+        store.put_yf_closes(gold_data['Close'])
+        for provider, date_str, payload, _ in payloads:
+            if provider == "exim":
+                store.put_exim_payload(date_str, payload)
+            else:
+                store.put_krx_payload(date_str, payload)
+    print(f"✓ 저장소 갱신: {path} (일별 {len(df)}행, 원본 응답 {len(payloads)}건)")
+
+
+def save_to_archive(gold_data, payloads, root=RAW_ARCHIVE_DIR):
+    """새로 받은 EXIM/KRX 응답과 Yahoo Finance 종가를 원본 보관소에 덧붙이기"""
+    if not USE_RAW_ARCHIVE:
+        return
+
+    from raw_archive import RawArchive, yfinance_records
+
+    records = [(provider, date_str, payload) for provider, date_str, payload, fresh in payloads
+               if fresh]
+    count = RawArchive(root).append(records + yfinance_records(gold_data['Close']))
+    print(f"✓ 원본 보관: {root}/ ({count}건)")
+
+
+def save_outputs(gold_data, df):
+    """CSV 외 저장소들(데이터셋, SQLite, 원본 보관소) 갱신"""
+    with METRICS.timer("save_dataset"):
+        save_to_dataset(df)
+    payloads = take_raw_payloads()
+    with METRICS.timer("save_store"):
+        save_to_store(gold_data, df, payloads)
+    with METRICS.timer("save_archive"):
+        save_to_archive(gold_data, payloads)
+
+
+_metrics_server = None
+
+
+def start_metrics():
+    """이번 실행의 계측 초기화 (METRICS_PORT가 있으면 /metrics 노출 시작)"""
+    global _metrics_server
+    METRICS.reset()
+    if METRICS_PORT and _metrics_server is None:
+        from instrumentation import serve
+
+        _metrics_server = serve(METRICS_PORT)
+        print(f"📈 계측: http://127.0.0.1:{METRICS_PORT}/metrics")
+
+
+def finish_metrics(csv_path):
+    """단계별 소요 시간 출력 + 실행 보고서 저장 ({csv}.metrics.json)"""
+    from instrumentation import print_report
+
+    print("\n⏱️  단계별 소요 시간")
+    print("-" * 60)
+    report = METRICS.report()
+    print_report(report)
+    if METRICS_REPORT:
+        path = os.path.splitext(csv_path)[0] + ".metrics.json"
+        METRICS.write_report(path, csv=os.path.basename(csv_path))
+        print(f"✓ 실행 보고서: {path}")
+    return report
+
+
+def collect_data(start_date, end_date, exim_key, krx_key, workers=MAX_WORKERS, engine="thread"):
+    """데이터 수집 메인 함수 (engine: "thread" 또는 "async")"""
+    print("=" * 60)
+    print("금 김치프리미엄 데이터 수집")
+    print("=" * 60)
+    
+    print(f"\n📅 수집 기간: {start_date} ~ {end_date}")
+    print(f"🔑 환율 API: {exim_key[:15]}...")
+    print(f"🔑 KRX API: {krx_key[:15]}...")
+    start_metrics()
+    
+    # 1. 국제 금 시세 수집
+    print("\n[1/3] 국제 금 시세 수집 (Yahoo Finance)")
+    print("-" * 60)
+    gold_data = fetch_international_prices(start_date, end_date)
+    if gold_data is None:
+        return None
+    
+    # 2. 환율 및 국내 금 시세 수집
+    print("\n[2/3] 환율 및 국내 금 시세 조회")
+    print("-" * 60)
+    df = collect_rows(gold_data, exim_key, krx_key, workers=workers, engine=engine)
+    
+    if len(df) == 0:
+        print("❌ 수집된 데이터가 없습니다.")
+        return None
+    
+    # 3. CSV 저장
+    print("\n[3/3] CSV 파일 저장")
+    print("-" * 60)
+    
+    filename = f"gold_data_{start_date}_{end_date}.csv"
+    with METRICS.timer("save_csv"):
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+    
+    print(f"✓ 파일명: {filename}")
+    print(f"  데이터: {len(df)}행")
+    save_outputs(gold_data, df)
+    
+    print_statistics(df)
+    finish_metrics(filename)
     
     return df
 
 
+def read_last_date(csv_path):
+    """
+    CSV 파일 마지막 행의 날짜 조회 (파일 끝만 읽음)
+
+    Returns:
+        str: YYYY-MM-DD 형식 날짜, 데이터 행이 없으면 None
+    """
+    with open(csv_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        block = 4096
+        tail = b""
+        while size > 0:
+            step = min(block, size)
+            size -= step
+            f.seek(size)
+            tail = f.read(step) + tail
+            lines = tail.strip().splitlines()
+            if len(lines) >= 2 or size == 0:
+                break
+
+    lines = tail.decode("utf-8-sig").strip().splitlines()
+    if not lines:
+        return None
+    last = lines[-1].split(",")[0]
+    if last == "date":
+        return None
+    return last
+
+
+def _append_journal(csv_path):
+    return csv_path + APPEND_JOURNAL_SUFFIX
+
+
+def recover_append(csv_path):
+    """
+    이전 append_rows_atomic이 끝나지 못하고 남긴 행 되돌리기 (프로세스가 죽은 경우)
+
+    저널이 있으면 CSV를 저널에 적힌 원래 크기로 잘라내고 저널을 지운다.
+
+    Returns:
+        bool: 되돌렸으면 True
+    """
+    journal = _append_journal(csv_path)
+    if not os.path.exists(journal):
+        return False
+    try:
+        with open(journal, "r", encoding="utf-8") as f:
+            original_size = int(json.load(f)["size"])
+    except (OSError, ValueError, KeyError, TypeError):
+        print(f"⚠️  추가 저널을 읽을 수 없어 무시합니다: {journal}")
+        os.remove(journal)
+        return False
+
+    rolled_back = os.path.getsize(csv_path) > original_size
+    if rolled_back:
+        with open(csv_path, "r+b") as f:
+            f.truncate(original_size)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"⚠️  지난 실행이 끝내지 못한 추가 행을 되돌렸습니다: {csv_path}")
+    os.remove(journal)
+    return rolled_back
+
+
+def append_rows_atomic(csv_path, rows):
+    """
+    CSV 파일 끝에 행(DataFrame 또는 딕셔너리 리스트) 추가 (기존 내용은 다시 쓰지 않음)
+
+    쓰기 전에 원래 크기를 저널({csv}.append.json, 임시 파일 + fsync + os.replace)에 남기고,
+    행 전체를 한 번의 write로 붙인 뒤 fsync하고 저널을 지운다. 쓰기 도중 예외가 나면
+    바로, 프로세스가 죽었으면 다음 실행의 recover_append가 원래 크기로 잘라낸다.
+    """
+    import pandas as pd
+
+    recover_append(csv_path)
+    with open(csv_path, "r", encoding="utf-8-sig") as f:
+        columns = f.readline().strip().split(",")
+
+    block = pd.DataFrame(rows, columns=columns).to_csv(index=False, header=False)
+    data = block.encode("utf-8")
+    journal = _append_journal(csv_path)
+
+    with open(csv_path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        original_size = f.tell()
+        if original_size > 0:
+            f.seek(original_size - 1)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+
+        temp_path = journal + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as jf:
+            json.dump({"size": original_size, "length": len(data)}, jf)
+            jf.flush()
+            os.fsync(jf.fileno())
+        os.replace(temp_path, journal)
+
+        try:
+            f.seek(original_size)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.truncate(original_size)
+            raise
+    os.remove(journal)
+
+
+def update_dataset(csv_path, exim_key, krx_key, end_date=END_DATE, workers=MAX_WORKERS):
+    """
+    기존 gold_data CSV의 마지막 날짜 이후 거래일만 수집해서 이어 붙이기
+
+    파일명이 gold_data_{시작}_{종료}.csv 형식이면 종료일을 새 날짜로 바꾼다.
+
+    Returns:
+        str: 갱신된 파일 경로, 실패 시 None
+    """
+    print("=" * 60)
+    print("금 김치프리미엄 데이터 증분 수집")
+    print("=" * 60)
+
+    recover_append(csv_path)
+    last_date = read_last_date(csv_path)
+    if last_date is None:
+        print(f"❌ 기존 데이터가 없습니다: {csv_path}")
+        return None
+
+    start_date = (datetime.strptime(last_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    print(f"\n📄 기존 파일: {csv_path} (마지막 날짜 {last_date})")
+    print(f"📅 추가 수집 기간: {start_date} ~ {end_date}")
+    start_metrics()
+
+    if start_date >= end_date:
+        print("✓ 이미 최신 상태입니다.")
+        return csv_path
+
+    print("\n[1/3] 국제 금 시세 수집 (Yahoo Finance)")
+    print("-" * 60)
+    gold_data = fetch_international_prices(start_date, end_date)
+    if gold_data is None:
+        return None
+
+    # yfinance가 경계일을 포함해 돌려주는 경우 대비
+    gold_data = gold_data[[date.strftime("%Y-%m-%d") > last_date for date in gold_data.index]]
+    if len(gold_data) == 0:
+        print("✓ 새 거래일이 없습니다.")
+        return csv_path
+
+    print("\n[2/3] 환율 및 국내 금 시세 조회")
+    print("-" * 60)
+    df = collect_rows(gold_data, exim_key, krx_key, workers=workers)
+    if len(df) == 0:
+        print("❌ 추가할 데이터가 없습니다.")
+        return None
+
+    print("\n[3/3] CSV 파일에 추가")
+    print("-" * 60)
+    with METRICS.timer("save_csv"):
+        append_rows_atomic(csv_path, df)
+
+    new_path = csv_path
+    match = re.match(r"^(gold_data_\d{4}-\d{2}-\d{2})_\d{4}-\d{2}-\d{2}\.csv$", os.path.basename(csv_path))
+    if match:
+        new_path = os.path.join(os.path.dirname(csv_path), f"{match.group(1)}_{end_date}.csv")
+        os.replace(csv_path, new_path)
+
+    print(f"✓ {len(df)}행 추가: {new_path}")
+    print(f"  데이터 기간: ~ {df['date'].iloc[-1]}")
+    save_outputs(gold_data, df)
+    finish_metrics(new_path)
+    return new_path
+
+
+def find_latest_dataset(directory="."):
+    """가장 최근에 수정된 gold_data_*.csv 경로 (없으면 None)"""
+    paths = glob.glob(os.path.join(directory, "gold_data_*.csv"))
+    if not paths:
+        return None
+    return max(paths, key=os.path.getmtime)
+
+
 if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # 인자가 있으면 메뉴 없이 gold_cli 하위 명령으로 실행 (cron 등)
+        import gold_cli
+        sys.exit(gold_cli.main())
+
     print("\n" + "=" * 60)
     print("🏆 금 김치프리미엄 데이터 수집 스크립트")
     print("=" * 60)
@@ -381,8 +1325,9 @@ if __name__ == "__main__":
     print("1. API 연결 테스트만 실행")
     print("2. 전체 데이터 수집 실행")
     print("3. 수집 기간 변경 후 실행")
+    print("4. 기존 CSV 이어서 수집 (증분)")
     
-    choice = input("\n선택 (1, 2 또는 3): ").strip()
+    choice = input("\n선택 (1, 2, 3 또는 4): ").strip()
     
     if choice == "1":
         test_apis()
@@ -476,5 +1421,23 @@ if __name__ == "__main__":
                 print("=" * 60)
         else:
             print("취소되었습니다.")
+
+    elif choice == "4":
+        default_path = find_latest_dataset()
+        prompt = f"\n기존 CSV 경로 (Enter: {default_path}): " if default_path else "\n기존 CSV 경로: "
+        csv_path = input(prompt).strip() or default_path
+
+        if not csv_path or not os.path.exists(csv_path):
+            print("✗ CSV 파일을 찾을 수 없습니다.")
+        else:
+            new_path = update_dataset(csv_path, EXIM_API_KEY, KRX_API_KEY)
+            if new_path is not None:
+                print("\n" + "=" * 60)
+                print("✅ 증분 수집 완료!")
+                print("=" * 60)
+            else:
+                print("\n" + "=" * 60)
+                print("❌ 증분 수집 실패")
+                print("=" * 60)
     else:
         print("잘못된 선택입니다.")
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 수집 파이프라인 (장기간 백필용)
+
+    거래일 소스 → 환율 조회 → KRX 조회 → 프리미엄 계산 → 싱크
+
+각 단계는 제너레이터이고 CHUNK_DAYS일 묶음을 다음 단계로 넘긴다. 싱크는 묶음마다
+gold_data_{시작}_{끝}.csv.part에 덧붙이고(fsync) 체크포인트를 갱신하므로,
+중간에 끊겨도 다시 실행하면 마지막으로 기록한 날짜 다음부터 이어서 수집한다.
+메모리에는 한 묶음(과 yfinance 한 구간)만 올라가므로 기간 길이와 무관하다.
+
+날짜별 조회 결과(provider별 ok/failed/empty/closed)는 output.status.jsonl에 덧붙여 두고,
+--retry-failed는 실패했거나 기록이 없는 날짜만 다시 조회해 CSV에 반영한다.
+
+    python collect_stream.py --start 2014-03-24 --end 2026-01-01
+    python collect_stream.py --start 2014-03-24 --end 2026-01-01   # 끊긴 뒤 다시 실행 = 이어서
+    python collect_stream.py --start 2014-03-24 --end 2026-01-01 --retry-failed
+    python collect_stream.py --start 2014-03-24 --end 2026-01-01 --report
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import collect_gold_data_final as collector
+from instrumentation import METRICS
+
+CHUNK_DAYS = 60            # 한 번에 조회/기록할 거래일 수
+SOURCE_WINDOW_DAYS = 366   # Yahoo Finance를 한 번에 조회할 기간 (달력 일수)
+MAX_RETRY_ATTEMPTS = 3     # provider/날짜별 최대 조회 횟수 (첫 시도 포함)
+
+# 조회 결과 상태
+STATUS_OK = "ok"           # 값을 받음
+STATUS_FAILED = "failed"   # 요청 실패 (재시도 대상)
+STATUS_EMPTY = "empty"     # 응답은 왔지만 값 없음 (고시 환율 없음/KRX 휴장일)
+STATUS_CLOSED = "closed"   # KRX 휴장일이라 요청하지 않음
+
+
+# ==================== 단계 ====================
+
+def trading_days(start_date, end_date, window_days=SOURCE_WINDOW_DAYS):
+    """
+    거래일 소스: Yahoo Finance 종가가 있는 날을 구간별로 조회해 하루씩 내보낸다
+
+    구간 조회가 실패하면 RuntimeError (기록한 날짜까지는 체크포인트에 남아 있다).
+    마지막 구간이 비어 있으면(새 거래일 없음) 그대로 끝낸다.
+
+    Yields:
+        tuple: (Timestamp, 국제 금 종가)
+    """
+    window_start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+
+    while window_start < end:
+        window_end = min(window_start + timedelta(days=window_days), end)
+        if len(pd.bdate_range(window_start, window_end - timedelta(days=1))):
+            gold_data = collector.fetch_international_prices(
+                window_start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+            if gold_data is None:
+                if window_end < end:
+                    raise RuntimeError(
+                        f"국제 금 시세 조회 실패: {window_start:%Y-%m-%d} ~ {window_end:%Y-%m-%d}")
+            else:
+                yield from gold_data['Close'].items()
+        window_start = window_end
+
+
+def chunked(items, size):
+    """size개씩 묶어서 내보내기"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fetch_rates(dates_api, exim_key, workers=collector.MAX_WORKERS, events=None):
+    """여러 날짜 환율 조회 (events에 ("exim", 날짜, 상태) 추가)"""
+    failed = {}
+    with METRICS.timer("exim_batch"):
+        rates = collector.get_exchange_rates(exim_key, dates_api, workers=workers, failed_out=failed)
+    if events is not None:
+        for d in dates_api:
+            if d in rates:
+                status = STATUS_OK
+            else:
+                status = STATUS_FAILED if d in failed else STATUS_EMPTY
+            events.append(("exim", d, status))
+    return [rates.get(d) for d in dates_api]
+
+
+def fetch_krx_prices(dates_api, krx_key, workers=collector.MAX_WORKERS, events=None):
+    """여러 날짜 KRX 가격 조회 (events에 ("krx", 날짜, 상태) 추가)"""
+    if not (collector.USE_KRX_API and krx_key):
+        return {}
+    failed = {}
+    with METRICS.timer("krx_batch"):
+        prices = collector.get_krx_gold_prices(krx_key, dates_api, workers=workers,
+                                               failed_out=failed)
+    if events is not None:
+        for d in dates_api:
+            if not collector.is_krx_trading_day(d):
+                status = STATUS_CLOSED
+            elif d in prices:
+                status = STATUS_OK
+            else:
+                status = STATUS_FAILED if d in failed else STATUS_EMPTY
+            events.append(("krx", d, status))
+    return prices
+
+
+def fx_stage(chunks, exim_key, workers=collector.MAX_WORKERS, events=None):
+    """환율 조회: (날짜, 종가) 묶음 → (날짜, 종가, 환율) 묶음"""
+    for chunk in chunks:
+        dates_api = [date.strftime("%Y%m%d") for date, _ in chunk]
+        rates = fetch_rates(dates_api, exim_key, workers, events)
+        yield [(date, close, rate) for (date, close), rate in zip(chunk, rates)]
+
+
+def krx_stage(chunks, krx_key, workers=collector.MAX_WORKERS, events=None):
+    """KRX 조회: 환율이 있는 날만 요청 → (날짜, 종가, 환율, 국내 가격) 묶음"""
+    for chunk in chunks:
+        dates_api = [date.strftime("%Y%m%d") for date, _, rate in chunk if rate is not None]
+        prices = fetch_krx_prices(dates_api, krx_key, workers, events)
+        yield [
+            (date, close, rate, prices.get(date.strftime("%Y%m%d")) if rate is not None else None)
+            for date, close, rate in chunk
+        ]
+
+
+def premium_stage(chunks, stats):
+    """프리미엄 계산: 묶음 → gold_data CSV 형식 DataFrame (stats에 실패/KRX 성공 수 누적)"""
+    for chunk in chunks:
+        gold_data = pd.DataFrame(
+            {'Close': [close for _, close, _, _ in chunk]},
+            index=pd.DatetimeIndex([date for date, _, _, _ in chunk]),
+        )
+        quotes = [(rate, price) for _, _, rate, price in chunk]
+        with METRICS.timer("build"):
+            df, fail_count, krx_success_count = collector.build_frame(gold_data, quotes)
+        stats["failed"] += fail_count
+        stats["krx_success"] += krx_success_count
+        yield gold_data, df
+
+
+# ==================== 싱크 ====================
+
+class CheckpointSink:
+    """
+    묶음 단위 CSV 기록 + 체크포인트
+
+    output.part에 덧붙이고 output.checkpoint.json을 갱신한다. finish()에서
+    output으로 이름을 바꾸고 체크포인트를 지운다.
+    """
+
+    def __init__(self, output, start_date, end_date):
+        self.output = output
+        self.part_path = output + ".part"
+        self.checkpoint_path = output + ".checkpoint.json"
+        self.start_date = start_date
+        self.end_date = end_date
+        self.rows = 0
+
+    def resume_date(self):
+        """
+        이어서 수집할 첫 날짜 (처음이면 start_date)
+
+        CSV(.part)가 기준이다. 체크포인트는 CSV 기록 뒤에 갱신하므로 CSV보다 앞설 수 없다.
+        """
+        if not os.path.exists(self.part_path):
+            return self.start_date
+
+        checkpoint = self.read_checkpoint() or {}
+        self.rows = checkpoint.get("rows", 0)
+        last_date = collector.read_last_date(self.part_path)
+        if last_date is None:
+            return self.start_date
+        if last_date != checkpoint.get("last_date"):
+            # 체크포인트 갱신 직전에 끊긴 경우: 행 수는 다시 센다
+            with open(self.part_path, encoding="utf-8-sig") as f:
+                self.rows = sum(1 for _ in f) - 1
+        resume = datetime.strptime(last_date, "%Y-%m-%d") + timedelta(days=1)
+        return resume.strftime("%Y-%m-%d")
+
+    def read_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_checkpoint(self, last_date):
+        checkpoint = {
+            "output": self.output,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "last_date": last_date,
+            "rows": self.rows,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def write(self, df):
+        """묶음 기록 (CSV 덧붙이기 → 체크포인트 갱신 순서)"""
+        if len(df) == 0:
+            return
+        if not os.path.exists(self.part_path):
+            with open(self.part_path, "w", encoding="utf-8-sig", newline="") as f:
+                f.write(",".join(df.columns) + "\n")
+        collector.append_rows_atomic(self.part_path, df)
+        self.rows += len(df)
+        self._write_checkpoint(df['date'].iloc[-1])
+
+    def finish(self):
+        """수집 완료: .part → 최종 파일, 체크포인트 삭제"""
+        if not os.path.exists(self.part_path):
+            return None
+        os.replace(self.part_path, self.output)
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.output
+
+
+class FetchLedger:
+    """
+    provider/날짜별 조회 결과 기록 (덧붙이기 전용 JSONL)
+
+    한 줄이 한 번의 시도: {"provider", "date", "status", "at"}
+    같은 (provider, 날짜)의 마지막 줄이 현재 상태이고 줄 수가 시도 횟수다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, events):
+        """(provider, 'YYYYMMDD', 상태) 목록 덧붙이기 (fsync)"""
+        if not events:
+            return
+        at = datetime.now().isoformat(timespec="seconds")
+        lines = "".join(
+            json.dumps({"provider": p, "date": d, "status": status, "at": at}) + "\n"
+            for p, d, status in events
+        )
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self):
+        """
+        Returns:
+            dict: (provider, 날짜) → {"status": 마지막 상태, "attempts": 시도 횟수}
+        """
+        state = {}
+        if not os.path.exists(self.path):
+            return state
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 도중 끊긴 마지막 줄
+                key = (event["provider"], event["date"])
+                entry = state.setdefault(key, {"status": None, "attempts": 0})
+                entry["status"] = event["status"]
+                entry["attempts"] += 1
+        return state
+
+
+# ==================== 파이프라인 ====================
+
+def iter_frames(start_date, end_date, exim_key, krx_key, stats,
+                chunk_days=CHUNK_DAYS, workers=collector.MAX_WORKERS, events=None):
+    """
+    단계를 이어 붙인 파이프라인: (국제 시세 묶음, CSV 묶음 DataFrame)을 차례로 내보낸다
+
+    events(리스트)를 주면 각 단계가 provider/날짜별 조회 결과를 추가한다.
+    """
+    days = trading_days(start_date, end_date)
+    chunks = chunked(days, chunk_days)
+    chunks = fx_stage(chunks, exim_key, workers, events)
+    chunks = krx_stage(chunks, krx_key, workers, events)
+    return premium_stage(chunks, stats)
+
+
+def iter_records(start_date, end_date, exim_key, krx_key, chunk_days=CHUNK_DAYS):
+    """
+    기록 없이 한 행씩 받아 보기
+
+    Yields:
+        dict: date, domestic_price, international_price, exchange_rate, premium
+    """
+    stats = {"failed": 0, "krx_success": 0}
+    for _, df in iter_frames(start_date, end_date, exim_key, krx_key, stats, chunk_days):
+        yield from df.to_dict("records")
+
+
+def stream_collect(start_date, end_date, exim_key, krx_key, output=None,
+                   chunk_days=CHUNK_DAYS, workers=collector.MAX_WORKERS):
+    """
+    스트리밍 수집 (체크포인트가 있으면 이어서)
+
+    Returns:
+        str: 완성된 CSV 경로, 중간에 실패하면 None (다시 실행하면 이어서 수집)
+    """
+    output = output or f"gold_data_{start_date}_{end_date}.csv"
+    sink = CheckpointSink(output, start_date, end_date)
+    resume = sink.resume_date()
+
+    print("=" * 60)
+    print("금 김치프리미엄 데이터 스트리밍 수집")
+    print("=" * 60)
+    print(f"\n📅 수집 기간: {start_date} ~ {end_date} (묶음 {chunk_days}일)")
+    if resume != start_date:
+        print(f"↻ 이어서 수집: {resume}부터 (기록된 {sink.rows}행)")
+
+    collector.RESPONSE_CACHE.reset_stats()
+    collector.take_raw_payloads()
+    collector.start_metrics()
+    stats = {"failed": 0, "krx_success": 0}
+    ledger = FetchLedger(ledger_path(output))
+    events = []
+
+    try:
+        for gold_data, df in iter_frames(resume, end_date, exim_key, krx_key, stats,
+                                         chunk_days, workers, events):
+            with METRICS.timer("save_csv"):
+                sink.write(df)
+            ledger.record(events)
+            events.clear()
+            collector.save_outputs(gold_data, df)
+            last = df['date'].iloc[-1] if len(df) else gold_data.index[-1].strftime("%Y-%m-%d")
+            print(f"  ✓ ~ {last}: 누적 {sink.rows}행")
+    except (RuntimeError, KeyboardInterrupt) as e:
+        print(f"\n❌ 중단: {str(e) or '사용자 취소'}")
+        print(f"   {sink.rows}행까지 기록됨. 같은 명령을 다시 실행하면 이어서 수집합니다.")
+        return None
+
+    path = sink.finish()
+    if path is None:
+        print("❌ 수집된 데이터가 없습니다.")
+        return None
+
+    print(f"\n✓ 파일명: {path}")
+    print(f"  데이터: {sink.rows}행 (환율 실패 {stats['failed']}건, KRX 성공 {stats['krx_success']}건)")
+    if collector.USE_RESPONSE_CACHE:
+        print(f"  응답 캐시: {collector.RESPONSE_CACHE.summary()}")
+    state = ledger.load()
+    print_report(state)
+    if any(entry["status"] == STATUS_FAILED for entry in state.values()):
+        print("  💡 실패한 날짜는 --retry-failed로 다시 조회할 수 있습니다.")
+    collector.finish_metrics(path)
+    return path
+
+
+# ==================== 실패 재조회 ====================
+
+def ledger_path(output):
+    return output + ".status.jsonl"
+
+
+def retry_targets(state, closes, max_attempts=MAX_RETRY_ATTEMPTS):
+    """
+    다시 조회할 날짜 고르기
+
+    환율이 실패했거나 기록이 없는 날은 환율+KRX 모두, 환율은 있고 KRX만 실패했거나
+    기록이 없는 KRX 거래일은 KRX만 다시 조회한다. 고시 환율이 없던 날은 다시 조회하지 않는다. 실패한 provider의 시도 횟수가
+    max_attempts에 이른 날은 포기 목록으로 돌린다.
+
+    Returns:
+        tuple: (환율 재조회 날짜, KRX만 재조회 날짜, 포기한 (provider, 날짜) 목록)
+    """
+    exim_dates, krx_dates, given_up = [], [], []
+    for date_api in closes:
+        exim = state.get(("exim", date_api))
+        if exim is not None and exim["status"] == STATUS_EMPTY:
+            continue
+        if exim is None or exim["status"] != STATUS_OK:
+            if exim is not None and exim["attempts"] >= max_attempts:
+                given_up.append(("exim", date_api))
+            else:
+                exim_dates.append(date_api)
+            continue
+
+        if not collector.is_krx_trading_day(date_api):
+            continue
+        krx = state.get(("krx", date_api))
+        if krx is None or krx["status"] == STATUS_FAILED:
+            if krx is not None and krx["attempts"] >= max_attempts:
+                given_up.append(("krx", date_api))
+            else:
+                krx_dates.append(date_api)
+    return exim_dates, krx_dates, given_up
+
+
+def merge_rows(csv_path, df):
+    """CSV에 행 반영 (같은 날짜는 교체, 날짜순 정렬, 임시 파일에 쓴 뒤 교체)"""
+    existing = pd.read_csv(csv_path, encoding="utf-8-sig")
+    merged = pd.concat([existing[~existing['date'].isin(df['date'])], df], ignore_index=True)
+    merged = merged.sort_values('date', kind="stable")
+
+    directory = os.path.dirname(os.path.abspath(csv_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        merged.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        os.replace(tmp_path, csv_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(merged)
+
+
+def print_report(state, given_up=()):
+    """provider별 상태 요약"""
+    counts = {}
+    for (provider, _), entry in state.items():
+        provider_counts = counts.setdefault(provider, {})
+        provider_counts[entry["status"]] = provider_counts.get(entry["status"], 0) + 1
+
+    print("\n📋 조회 결과 요약")
+    for provider in ("exim", "krx"):
+        provider_counts = counts.get(provider, {})
+        line = ", ".join(f"{status} {provider_counts[status]}"
+                         for status in (STATUS_OK, STATUS_FAILED, STATUS_EMPTY, STATUS_CLOSED)
+                         if provider_counts.get(status))
+        print(f"  {provider:5s}: {line or '기록 없음'}")
+    if given_up:
+        print(f"  ⚠️  재시도 한도 도달: {len(given_up)}건")
+        for provider, date_api in list(given_up)[:10]:
+            print(f"     {provider} {date_api}")
+
+
+def retry_failed(start_date, end_date, exim_key, krx_key, output=None,
+                 max_attempts=MAX_RETRY_ATTEMPTS, workers=collector.MAX_WORKERS):
+    """
+    실패했거나 기록이 없는 날짜만 다시 조회해서 CSV에 반영
+
+    수집이 끝난 CSV와 아직 .part인 CSV 모두 가능하다 (.part면 기록된 마지막 날짜까지만).
+
+    Returns:
+        dict: 재조회 후 (provider, 날짜) → 상태
+    """
+    output = output or f"gold_data_{start_date}_{end_date}.csv"
+    csv_path = output if os.path.exists(output) else output + ".part"
+    if not os.path.exists(csv_path):
+        print(f"❌ 수집 파일이 없습니다: {output}")
+        return None
+
+    ledger = FetchLedger(ledger_path(output))
+    state = ledger.load()
+
+    print("=" * 60)
+    print("실패한 날짜 재조회")
+    print("=" * 60)
+
+    last_date = collector.read_last_date(csv_path)
+    if last_date is None:
+        print("❌ 기록된 행이 없습니다.")
+        return state
+    range_end = (datetime.strptime(last_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    closes = {date.strftime("%Y%m%d"): close
+              for date, close in trading_days(start_date, min(end_date, range_end))}
+
+    exim_dates, krx_dates, given_up = retry_targets(state, closes, max_attempts)
+    print(f"대상: 환율+KRX {len(exim_dates)}일, KRX만 {len(krx_dates)}일 (한도 {max_attempts}회)")
+    if not exim_dates and not krx_dates:
+        print_report(state, given_up)
+        return state
+
+    collector.take_raw_payloads()
+    events = []
+    rates = dict(zip(exim_dates, fetch_rates(exim_dates, exim_key, workers, events)))
+
+    # KRX만 다시 조회하는 날은 CSV에 기록된 환율을 그대로 쓴다
+    existing = pd.read_csv(csv_path, encoding="utf-8-sig", usecols=['date', 'exchange_rate'])
+    existing_rates = dict(zip(existing['date'].str.replace("-", ""), existing['exchange_rate']))
+    rates.update({d: existing_rates.get(d) for d in krx_dates})
+
+    krx_request = sorted(d for d in set(exim_dates) | set(krx_dates) if rates.get(d) is not None)
+    prices = fetch_krx_prices(krx_request, krx_key, workers, events)
+    ledger.record(events)
+
+    dates = sorted(d for d in set(exim_dates) | set(krx_dates) if rates.get(d) is not None)
+    if dates:
+        gold_data = pd.DataFrame({'Close': [closes[d] for d in dates]},
+                                 index=pd.to_datetime(dates, format="%Y%m%d"))
+        df, _, _ = collector.build_frame(gold_data, [(rates[d], prices.get(d)) for d in dates])
+        total = merge_rows(csv_path, df)
+        collector.save_outputs(gold_data, df)
+        print(f"✓ {len(df)}행 반영: {csv_path} (전체 {total}행)")
+
+    state = ledger.load()
+    _, _, given_up = retry_targets(state, closes, max_attempts)
+    print_report(state, given_up)
+    return state
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="금 김치프리미엄 스트리밍 수집 (이어받기 지원)")
+    parser.add_argument("--start", default=collector.START_DATE, help="YYYY-MM-DD")
+    parser.add_argument("--end", default=collector.END_DATE, help="YYYY-MM-DD (미포함)")
+    parser.add_argument("--output", help="CSV 경로 (기본: gold_data_{시작}_{끝}.csv)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_DAYS, help="묶음 크기 (거래일)")
+    parser.add_argument("--workers", type=int, default=collector.MAX_WORKERS)
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="실패했거나 기록이 없는 날짜만 다시 조회")
+    parser.add_argument("--max-attempts", type=int, default=MAX_RETRY_ATTEMPTS,
+                        help="provider/날짜별 최대 조회 횟수")
+    parser.add_argument("--report", action="store_true", help="조회 결과 요약만 출력")
+    args = parser.parse_args()
+
+    output = args.output or f"gold_data_{args.start}_{args.end}.csv"
+    if args.report:
+        print_report(FetchLedger(ledger_path(output)).load())
+    elif args.retry_failed:
+        state = retry_failed(args.start, args.end, collector.EXIM_API_KEY, collector.KRX_API_KEY,
+                             output, args.max_attempts, args.workers)
+        raise SystemExit(0 if state is not None else 1)
+    else:
+        result = stream_collect(args.start, args.end, collector.EXIM_API_KEY,
+                                collector.KRX_API_KEY, output, args.chunk, args.workers)
+        raise SystemExit(0 if result else 1)
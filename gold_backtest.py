@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+금 김치프리미엄 백테스팅 (Python 버전)
+
+gold_backtest_v2.html의 performBacktest와 같은 규칙으로 동작한다.
+- 김치프리미엄이 매수 기준 이하이고 보유 중이 아니면 가능한 만큼 단위(1g/1kg) 매수
+- 김치프리미엄이 매도 기준 이상이고 보유 중이면 전량 매도
+- 마지막 날까지 보유 중이면 종료일 가격으로 청산
+
+수집된 gold_data_*.csv를 바로 읽어 컬럼 배열 위에서 실행한다.
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+HTML_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gold_backtest_v2.html")
+UNIT_MULTIPLIER = {"1kg": 1000, "1g": 1}
+
+
+def load_gold_data(path):
+    """
+    gold_data CSV, 데이터셋 디렉터리(gold_dataset.py / gold_columns.py) 또는 SQLite 저장소(.db) 읽기
+
+    Returns:
+        dict: 컬럼 이름 → numpy 배열 (date는 datetime64[D], 나머지는 float64), 날짜 순
+    """
+    if os.path.isdir(path):
+        from gold_columns import is_column_dir, load_columns
+        if is_column_dir(path):
+            return load_columns(path)
+        from gold_dataset import load_arrays
+        return load_arrays(path)
+
+    if path.endswith((".db", ".sqlite")):
+        from gold_store import GoldStore
+        with GoldStore(path) as store:
+            return store.load_arrays()
+
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    df = df.sort_values("date", kind="stable").reset_index(drop=True)
+
+    data = {"date": pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")}
+    for column in ("domestic_price", "international_price", "exchange_rate", "premium"):
+        if column in df.columns:
+            data[column] = df[column].to_numpy(dtype=float)
+    return data
+
+
+def perform_backtest(data, buy_premium, sell_premium, initial_capital, unit_type="1kg"):
+    """
+    김치프리미엄 밴드 매매 백테스트 (performBacktest 이식)
+
+    Args:
+        data: load_gold_data 결과 (date, domestic_price, premium 배열)
+        buy_premium: 이 값 이하일 때 매수 (%)
+        sell_premium: 이 값 이상일 때 매도 (%)
+        initial_capital: 초기 투자금 (원)
+        unit_type: "1kg" 또는 "1g" 거래 단위
+
+    Returns:
+        dict: totalReturn, totalTrades, winRate, finalCapital, transactions
+    """
+    dates = [str(d) for d in data["date"]]
+    prices = np.asarray(data["domestic_price"], dtype=float).tolist()
+    premiums = np.asarray(data["premium"], dtype=float).tolist()
+
+    cash = initial_capital
+    holdings = 0  # 보유 금 수량 (g 단위)
+    transactions = []
+
+    unit_multiplier = UNIT_MULTIPLIER.get(unit_type, 1)
+
+    for i in range(len(prices)):
+        premium = premiums[i]
+        price = prices[i]
+
+        # 매수 조건: 김치프리미엄이 매수 기준 이하이고, 포지션이 없을 때
+        if premium <= buy_premium and holdings == 0 and cash > 0:
+            price_per_unit = price * unit_multiplier
+            quantity = math.floor(cash / price_per_unit)
+
+            if quantity > 0:
+                total_cost = quantity * price_per_unit
+                holdings = quantity * unit_multiplier
+                cash -= total_cost
+
+                transactions.append({
+                    "date": dates[i],
+                    "type": "buy",
+                    "premium": premium,
+                    "price": price,
+                    "quantity": quantity,
+                    "unit": unit_type,
+                    "amount": total_cost,
+                    "cash": cash,
+                })
+        # 매도 조건: 김치프리미엄이 매도 기준 이상이고, 포지션이 있을 때
+        elif premium >= sell_premium and holdings > 0:
+            units = holdings / unit_multiplier
+            price_per_unit = price * unit_multiplier
+            total_revenue = units * price_per_unit
+
+            cash += total_revenue
+            holdings = 0
+
+            transactions.append({
+                "date": dates[i],
+                "type": "sell",
+                "premium": premium,
+                "price": price,
+                "quantity": units,
+                "unit": unit_type,
+                "amount": total_revenue,
+                "cash": cash,
+                "profit": total_revenue - transactions[-1]["amount"],
+            })
+
+    # 마지막 포지션이 남아있으면 종료일 가격으로 청산
+    if holdings > 0:
+        units = holdings / unit_multiplier
+        price_per_unit = prices[-1] * unit_multiplier
+        total_revenue = units * price_per_unit
+
+        cash += total_revenue
+
+        transactions.append({
+            "date": dates[-1],
+            "type": "sell (청산)",
+            "premium": premiums[-1],
+            "price": prices[-1],
+            "quantity": units,
+            "unit": unit_type,
+            "amount": total_revenue,
+            "cash": cash,
+            "profit": total_revenue - transactions[-1]["amount"],
+        })
+
+        holdings = 0
+
+    # 통계 계산
+    total_return = ((cash - initial_capital) / initial_capital) * 100
+    sells = [t for t in transactions if "sell" in t["type"]]
+    winning_trades = sum(1 for t in sells if t["profit"] > 0)
+    win_rate = (winning_trades / len(sells)) * 100 if sells else 0
+
+    return {
+        "totalReturn": total_return,
+        "totalTrades": len(transactions),
+        "winRate": win_rate,
+        "finalCapital": cash,
+        "transactions": transactions,
+    }
+
+
+def next_signal_index(premiums, threshold, side):
+    """
+    각 날짜 j에 대해 j 이후(포함) 처음으로 신호가 나는 날짜 인덱스
+
+    side="buy"면 premium <= threshold, "sell"이면 premium >= threshold인 날을 찾는다.
+    신호가 없으면 len(premiums). 길이는 len(premiums) + 1 (끝 인덱스 조회용).
+    """
+    premiums = np.asarray(premiums, dtype=float)
+    n = len(premiums)
+    mask = premiums <= threshold if side == "buy" else premiums >= threshold
+    idx = np.where(mask, np.arange(n), n)
+    result = np.empty(n + 1, dtype=np.int64)
+    result[:n] = np.minimum.accumulate(idx[::-1])[::-1]
+    result[n] = n
+    return result
+
+
+def backtest_summary(premiums, prices, buy_premium, sell_premium, initial_capital,
+                     unit_type="1kg", next_buy=None, next_sell=None, equity_out=None):
+    """
+    perform_backtest와 같은 매매를 거래 단위로만 따라가며 요약 통계만 계산
+
+    매일 분기하지 않고 next_signal_index로 다음 매수/매도일로 바로 건너뛴다.
+    거래 내역은 만들지 않으며 최종 자산은 perform_backtest와 비트 단위로 같다.
+    파라미터 스윕처럼 같은 데이터로 수천 번 돌릴 때 사용한다.
+
+    equity_out(길이 n 배열)을 주면 일별 평가 자산을 채운다
+    (보유 구간은 현금 + 보유량 × 가격, 나머지는 현금).
+
+    Returns:
+        dict: total_return, win_rate, trades, max_drawdown(%), final_capital
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = len(prices)
+    if next_buy is None:
+        next_buy = next_signal_index(premiums, buy_premium, "buy")
+    if next_sell is None:
+        next_sell = next_signal_index(premiums, sell_premium, "sell")
+
+    unit_multiplier = UNIT_MULTIPLIER.get(unit_type, 1)
+    price_list = prices.tolist()
+
+    cash = initial_capital
+    peak = initial_capital
+    max_drawdown = 0.0
+    trades = 0
+    sells = 0
+    wins = 0
+
+    j = 0
+    filled = 0  # equity_out을 채운 날짜 수
+    while j < n:
+        i = int(next_buy[j])
+        if i >= n:
+            break
+
+        price_per_unit = price_list[i] * unit_multiplier
+        quantity = math.floor(cash / price_per_unit) if cash > 0 else 0
+        if quantity <= 0:
+            # 살 수 없는 날은 건너뛰고 다음 매수 신호를 기다린다
+            j = i + 1
+            continue
+
+        total_cost = quantity * price_per_unit
+        holdings = quantity * unit_multiplier
+        if equity_out is not None:
+            equity_out[filled:i] = cash
+        cash -= total_cost
+        trades += 1
+
+        k = int(next_sell[i + 1])
+        end = k if k < n else n - 1  # 매도 신호가 없으면 마지막 날 청산
+
+        units = holdings / unit_multiplier
+        total_revenue = units * (price_list[end] * unit_multiplier)
+
+        # 보유 구간의 평가 자산으로 최대 낙폭 갱신
+        equity = cash + holdings * prices[i:end + 1]
+        if equity_out is not None:
+            equity_out[i:end + 1] = equity
+            filled = end + 1
+        running_peak = np.maximum.accumulate(np.maximum(equity, peak))
+        max_drawdown = max(max_drawdown, float(np.max(1 - equity / running_peak)))
+        peak = float(running_peak[-1])
+
+        cash += total_revenue
+        trades += 1
+        sells += 1
+        if total_revenue - total_cost > 0:
+            wins += 1
+
+        peak = max(peak, cash)
+        j = end + 1
+
+    if equity_out is not None:
+        equity_out[filled:] = cash
+
+    return {
+        "total_return": ((cash - initial_capital) / initial_capital) * 100,
+        "win_rate": (wins / sells) * 100 if sells else 0,
+        "trades": trades,
+        "max_drawdown": max_drawdown * 100,
+        "final_capital": cash,
+    }
+
+
+def print_results(results):
+    """HTML 결과 화면과 같은 항목 출력"""
+    print("\n" + "=" * 60)
+    print("📊 백테스팅 결과")
+    print("=" * 60)
+    print(f"총 수익률: {results['totalReturn']:.2f}%")
+    print(f"총 거래 횟수: {results['totalTrades']}")
+    print(f"승률: {results['winRate']:.1f}%")
+    print(f"최종 자산: {results['finalCapital']:,.0f}원")
+
+    if results["transactions"]:
+        print("\n거래 내역:")
+        for tx in results["transactions"]:
+            kind = "매수" if "buy" in tx["type"] else "매도"
+            profit = f"{tx['profit']:,.0f}원" if tx.get("profit") else "-"
+            print(f"  {tx['date']} {kind} {tx['premium']:6.2f}% "
+                  f"{tx['price']:,.0f}원/g x {tx['quantity']:.3f} {tx['unit']} "
+                  f"= {tx['amount']:,.0f}원 (손익 {profit}, 잔고 {tx['cash']:,.0f}원)")
+
+
+# ==================== JS 로직과의 일치 확인 ====================
+
+def extract_js_function(html_path, name):
+    """HTML 안의 자바스크립트 함수 소스를 중괄호 짝으로 잘라낸다"""
+    with open(html_path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    match = re.search(r"function\s+" + re.escape(name) + r"\s*\(", html)
+    if match is None:
+        raise ValueError(f"{name} 함수를 찾을 수 없습니다: {html_path}")
+
+    depth = 0
+    for pos in range(html.index("{", match.end()), len(html)):
+        if html[pos] == "{":
+            depth += 1
+        elif html[pos] == "}":
+            depth -= 1
+            if depth == 0:
+                return html[match.start():pos + 1]
+    raise ValueError(f"{name} 함수 끝을 찾을 수 없습니다")
+
+
+def run_js_backtest(data, buy_premium, sell_premium, initial_capital, unit_type="1kg",
+                    html_path=HTML_FILE):
+    """
+    gold_backtest_v2.html의 performBacktest를 node로 그대로 실행
+
+    Returns:
+        dict: performBacktest 반환값 (JSON 변환), node가 없으면 None
+    """
+    node = shutil.which("node")
+    if node is None:
+        return None
+
+    rows = [
+        {"date": str(d), "domesticPrice": p, "premium": q}
+        for d, p, q in zip(data["date"], np.asarray(data["domestic_price"]).tolist(),
+                           np.asarray(data["premium"]).tolist())
+    ]
+    script = extract_js_function(html_path, "performBacktest") + """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const r = performBacktest(input.data, input.buy, input.sell, input.capital, input.unit);
+process.stdout.write(JSON.stringify(r));
+"""
+    payload = json.dumps({
+        "data": rows, "buy": buy_premium, "sell": sell_premium,
+        "capital": initial_capital, "unit": unit_type,
+    })
+
+    with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False, encoding="utf-8") as f:
+        f.write(script)
+        script_path = f.name
+    try:
+        output = subprocess.run([node, script_path], input=payload, capture_output=True,
+                                text=True, check=True).stdout
+    finally:
+        os.remove(script_path)
+    return json.loads(output)
+
+
+def compare_with_js(data, buy_premium, sell_premium, initial_capital, unit_type="1kg"):
+    """
+    Python 결과와 JS 결과 비교
+
+    Returns:
+        list: 다른 항목 설명 목록 (비어 있으면 일치), node가 없으면 None
+    """
+    expected = run_js_backtest(data, buy_premium, sell_premium, initial_capital, unit_type)
+    if expected is None:
+        return None
+    actual = perform_backtest(data, buy_premium, sell_premium, initial_capital, unit_type)
+
+    diffs = []
+    for key in ("totalReturn", "totalTrades", "winRate", "finalCapital"):
+        if actual[key] != expected[key]:
+            diffs.append(f"{key}: python={actual[key]!r} js={expected[key]!r}")
+
+    if len(actual["transactions"]) != len(expected["transactions"]):
+        diffs.append(f"거래 수: python={len(actual['transactions'])} js={len(expected['transactions'])}")
+    else:
+        for i, (a, e) in enumerate(zip(actual["transactions"], expected["transactions"])):
+            for key, value in e.items():
+                if a.get(key) != value:
+                    diffs.append(f"거래 {i} {key}: python={a.get(key)!r} js={value!r}")
+    return diffs
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="금 김치프리미엄 백테스팅")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db (기본: 가장 최근 CSV)")
+    parser.add_argument("--buy", type=float, default=5.0, help="매수 김치프리미엄 (%%, 이하)")
+    parser.add_argument("--sell", type=float, default=10.0, help="매도 김치프리미엄 (%%, 이상)")
+    parser.add_argument("--capital", type=float, default=10_000_000, help="초기 투자금 (원)")
+    parser.add_argument("--unit", choices=sorted(UNIT_MULTIPLIER), default="1kg", help="거래 단위")
+    parser.add_argument("--parity", action="store_true", help="HTML의 performBacktest와 결과 비교")
+    parser.add_argument("--store", help="결과를 기록할 SQLite 저장소 (예: gold_data.db)")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        candidates = glob.glob("gold_data_*.csv")
+        if not candidates:
+            parser.error("gold_data CSV 파일을 지정하세요")
+        csv_path = max(candidates, key=os.path.getmtime)
+
+    data = load_gold_data(csv_path)
+    print(f"📄 데이터: {csv_path} ({len(data['date'])}일)")
+    print(f"⚙️  매수 ≤ {args.buy}%, 매도 ≥ {args.sell}%, 초기 {args.capital:,.0f}원, {args.unit} 단위")
+
+    if args.buy >= args.sell:
+        print("⚠️  매도 김치프리미엄은 매수 김치프리미엄보다 커야 합니다.")
+
+    result = perform_backtest(data, args.buy, args.sell, args.capital, args.unit)
+    print_results(result)
+
+    if args.store:
+        from gold_store import GoldStore
+        with GoldStore(args.store) as store:
+            period = [str(data["date"][0]), str(data["date"][-1])] if len(data["date"]) else [None, None]
+            store.record_backtest(*period, args.buy, args.sell, args.capital, args.unit, result)
+        print(f"\n✓ 결과 기록: {args.store}")
+
+    if args.parity:
+        diffs = compare_with_js(data, args.buy, args.sell, args.capital, args.unit)
+        if diffs is None:
+            print("\n⚠️  node가 없어 JS 비교를 건너뜁니다.")
+        elif diffs:
+            print("\n❌ JS 결과와 다릅니다:")
+            for line in diffs:
+                print(f"  {line}")
+            raise SystemExit(1)
+        else:
+            print("\n✅ JS performBacktest와 결과 일치")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+금 김치프리미엄 명령줄 도구 (비대화식, cron용)
+
+    python gold_cli.py test
+    python gold_cli.py collect --start 2024-01-01 --end 2025-01-01
+    python gold_cli.py incremental gold_data_2024-01-01_2025-01-01.csv
+    python gold_cli.py backtest --buy 0.5 --sell 3.0
+    python gold_cli.py sweep --buy=-1,2,0.1 --sell 0,5,0.1
+    python gold_cli.py startup                  # 시작 import 시간 측정 (예산 초과면 종료 코드 1)
+
+API 키는 환경 변수 EXIM_API_KEY / KRX_API_KEY (또는 --exim-key / --krx-key)로 준다.
+이 파일은 표준 라이브러리만 불러오고, yfinance/pandas/numpy와 수집 모듈은 하위 명령이
+필요로 할 때 불러온다. 종료 코드는 성공 0, 실패 1, 인자 오류 2.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# ==================== 설정 영역 ====================
+# 모듈별 누적 import 시간 상한 (ms, python -X importtime 기준)
+STARTUP_BUDGET_MS = {
+    "gold_cli": 50,                   # --help, 인자 오류
+    "collect_gold_data_final": 400,   # test / incremental 판단 (pandas/yfinance 없이)
+}
+# ===================================================
+
+
+def _date(value):
+    """YYYY-MM-DD 인자 검사"""
+    from datetime import datetime
+
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜 형식은 YYYY-MM-DD: {value}")
+    return value
+
+
+def _latest_csv(path):
+    """path가 없으면 가장 최근 gold_data_*.csv"""
+    if path:
+        return path
+    import glob
+
+    candidates = glob.glob("gold_data_*.csv")
+    if not candidates:
+        raise SystemExit("❌ gold_data CSV 파일을 지정하세요")
+    return max(candidates, key=os.path.getmtime)
+
+
+def _api_keys(args, need=("exim", "krx")):
+    keys = {"exim": args.exim_key, "krx": args.krx_key}
+    missing = [name for name in need if not keys[name]]
+    if missing:
+        names = ", ".join(f"{name.upper()}_API_KEY" for name in missing)
+        raise SystemExit(f"❌ API 키가 없습니다: 환경 변수 {names} 또는 --{missing[0]}-key")
+    return keys["exim"], keys["krx"]
+
+
+def cmd_test(args):
+    import collect_gold_data_final as collector
+
+    exim_key, krx_key = _api_keys(args)
+    return 0 if collector.test_apis(exim_key, krx_key) else 1
+
+
+def cmd_collect(args):
+    import collect_gold_data_final as collector
+
+    exim_key, krx_key = _api_keys(args)
+    df = collector.collect_data(args.start, args.end, exim_key, krx_key,
+                                args.workers or collector.MAX_WORKERS, args.engine)
+    return 0 if df is not None else 1
+
+
+def cmd_incremental(args):
+    import collect_gold_data_final as collector
+
+    exim_key, krx_key = _api_keys(args)
+    csv_path = args.csv or collector.find_latest_dataset()
+    if csv_path is None:
+        print("❌ 이어서 수집할 gold_data CSV가 없습니다")
+        return 1
+    result = collector.update_dataset(csv_path, exim_key, krx_key, args.end or collector.END_DATE,
+                                      args.workers or collector.MAX_WORKERS)
+    return 0 if result is not None else 1
+
+
+def cmd_backtest(args):
+    from gold_backtest import load_gold_data, perform_backtest, print_results
+
+    csv_path = _latest_csv(args.csv)
+    data = load_gold_data(csv_path)
+    print(f"📄 데이터: {csv_path} ({len(data['date'])}일)")
+    print(f"⚙️  매수 ≤ {args.buy}%, 매도 ≥ {args.sell}%, 초기 {args.capital:,.0f}원, {args.unit} 단위")
+    if args.buy >= args.sell:
+        print("⚠️  매도 김치프리미엄은 매수 김치프리미엄보다 커야 합니다.")
+    print_results(perform_backtest(data, args.buy, args.sell, args.capital, args.unit))
+    return 0
+
+
+def cmd_sweep(args):
+    import time
+
+    from gold_backtest import load_gold_data
+    from gold_columns import is_column_dir
+    from gold_sweep import frange, run_sweep
+
+    csv_path = _latest_csv(args.csv)
+    buy_values = frange(*[float(v) for v in args.buy.split(",")])
+    sell_values = frange(*[float(v) for v in args.sell.split(",")])
+    data = load_gold_data(csv_path)
+    print(f"📄 데이터: {csv_path} ({len(data['date'])}일), "
+          f"조합 {len(buy_values)} × {len(sell_values)}")
+
+    started = time.perf_counter()
+    columns_dir = csv_path if os.path.isdir(csv_path) and is_column_dir(csv_path) else None
+    results = run_sweep(data, buy_values, sell_values, [args.unit], [args.capital],
+                        args.processes, kernel=args.kernel, columns_dir=columns_dir)
+    print(f"✓ {time.perf_counter() - started:.2f}초")
+    print(results.head(args.top).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    if args.output:
+        results.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"✓ 전체 결과 저장: {args.output}")
+    return 0
+
+
+def import_times(module):
+    """
+    새 인터프리터에서 module을 불러오며 -X importtime 측정
+
+    Returns:
+        dict: 모듈 이름 → 누적 import 시간 (ms)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1)) / 1000
+    return times
+
+
+def cmd_startup(args):
+    budgets = dict(STARTUP_BUDGET_MS)
+    if args.budget is not None:
+        budgets = dict.fromkeys(budgets, args.budget)
+
+    failed = False
+    for module, budget in budgets.items():
+        times = import_times(module)
+        total = times.get(module, 0.0)
+        heavy = [name for name in ("pandas", "numpy", "yfinance") if name in times]
+        ok = total <= budget
+        failed |= not ok
+        print(f"{'✓' if ok else '❌'} {module}: {total:.1f}ms (예산 {budget}ms)"
+              + (f", 불러온 무거운 모듈: {', '.join(heavy)}" if heavy else ""))
+        if args.top:
+            slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]
+            for name, ms in slowest:
+                print(f"    {ms:8.1f}ms  {name}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="금 김치프리미엄 데이터 수집/백테스트")
+    parser.add_argument("--exim-key", default=os.environ.get("EXIM_API_KEY", ""),
+                        help="한국수출입은행 API 키 (기본: 환경 변수 EXIM_API_KEY)")
+    parser.add_argument("--krx-key", default=os.environ.get("KRX_API_KEY", ""),
+                        help="KRX OpenAPI 키 (기본: 환경 변수 KRX_API_KEY)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    test = commands.add_parser("test", help="API 연결 테스트")
+    test.set_defaults(func=cmd_test)
+
+    collect = commands.add_parser("collect", help="기간 전체 수집")
+    collect.add_argument("--start", type=_date, required=True, help="YYYY-MM-DD")
+    collect.add_argument("--end", type=_date, required=True, help="YYYY-MM-DD (미포함)")
+    collect.add_argument("--workers", type=int, default=None,
+                         help="동시 요청 수 상한 (기본: MAX_WORKERS). 환율/KRX를 차례로 조회하며 "
+                              "각각 EXIM_MAX_CONCURRENCY/KRX_MAX_CONCURRENCY를 넘지 않음, "
+                              "async 엔진은 이 값 없이 소스별 상한만 따름")
+    collect.add_argument("--engine", choices=["thread", "async"], default="thread",
+                         help="수집 엔진")
+    collect.set_defaults(func=cmd_collect)
+
+    incremental = commands.add_parser("incremental", help="기존 CSV 이어서 수집")
+    incremental.add_argument("csv", nargs="?", help="gold_data CSV (기본: 가장 최근 파일)")
+    incremental.add_argument("--end", type=_date, default=None, help="YYYY-MM-DD (기본: 오늘)")
+    incremental.add_argument("--workers", type=int, default=None,
+                             help="동시 요청 수 상한 (기본: MAX_WORKERS). 환율/KRX를 차례로 조회하며 "
+                                  "각각 EXIM_MAX_CONCURRENCY/KRX_MAX_CONCURRENCY를 넘지 않음")
+    incremental.set_defaults(func=cmd_incremental)
+
+    backtest = commands.add_parser("backtest", help="매매 기준 하나 백테스트")
+    backtest.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db")
+    backtest.add_argument("--buy", type=float, default=5.0, help="매수 김치프리미엄 (%%, 이하)")
+    backtest.add_argument("--sell", type=float, default=10.0, help="매도 김치프리미엄 (%%, 이상)")
+    backtest.add_argument("--capital", type=float, default=10_000_000, help="초기 투자금 (원)")
+    backtest.add_argument("--unit", choices=["1g", "1kg"], default="1kg", help="거래 단위")
+    backtest.set_defaults(func=cmd_backtest)
+
+    sweep = commands.add_parser("sweep", help="매수/매도 기준 격자 스윕")
+    sweep.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db")
+    sweep.add_argument("--buy", default="-5,10,0.1", help="매수 기준 시작,끝,간격 (%%)")
+    sweep.add_argument("--sell", default="0,15,0.1", help="매도 기준 시작,끝,간격 (%%)")
+    sweep.add_argument("--capital", type=float, default=10_000_000, help="초기 투자금 (원)")
+    sweep.add_argument("--unit", choices=["1g", "1kg"], default="1kg", help="거래 단위")
+    sweep.add_argument("--processes", type=int, default=None, help="워커 프로세스 수")
+    sweep.add_argument("--kernel", choices=["loop", "vector"], default="loop", help="백테스트 커널")
+    sweep.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    sweep.add_argument("--output", help="전체 결과 CSV 저장 경로")
+    sweep.set_defaults(func=cmd_sweep)
+
+    startup = commands.add_parser("startup", help="시작 import 시간 측정 (-X importtime)")
+    startup.add_argument("--budget", type=float, default=None,
+                         help="모든 대상에 같은 예산 (ms, 기본: STARTUP_BUDGET_MS)")
+    startup.add_argument("--top", type=int, default=0, help="느린 모듈 상위 N개 출력")
+    startup.set_defaults(func=cmd_startup)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
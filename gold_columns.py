@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컬럼별 .npy 파일 + header.json 고정 배치 데이터셋 (메모리 맵 로드용)
+
+    gold_columns/
+        header.json           {"rows", "epoch", "columns": {이름: {"file", "dtype"}}}
+        date.npy              int32, epoch로부터 지난 일수
+        domestic_price.npy    float64
+        international_price.npy
+        exchange_rate.npy
+        premium.npy
+
+np.load(mmap_mode="r")로 열면 파일을 읽지 않고 페이지 캐시를 그대로 매핑하므로
+워커 프로세스 N개가 같은 물리 메모리를 공유하고, 여는 시간도 데이터 크기와 무관하다.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+HEADER_FILE = "header.json"
+FORMAT_VERSION = 1
+DATE_EPOCH = "1970-01-01"
+FLOAT_COLUMNS = ("domestic_price", "international_price", "exchange_rate", "premium")
+
+
+def is_column_dir(path):
+    """gold_columns 형식 디렉터리인지"""
+    return os.path.isfile(os.path.join(path, HEADER_FILE))
+
+
+def read_header(directory):
+    with open(os.path.join(directory, HEADER_FILE), encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 컬럼 파일 버전: {header.get('version')}")
+    return header
+
+
+def _save_atomic(directory, name, array):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def export_columns(data, directory, epoch=DATE_EPOCH):
+    """
+    load_gold_data 결과를 컬럼 파일로 저장
+
+    header.json을 마지막에 교체하므로, 쓰는 도중에는 이전 헤더가 가리키는 행 수만 읽힌다.
+    (컬럼 파일 자체는 하나씩 교체되므로 쓰는 동안 다른 프로세스가 열지 않는 것이 안전하다)
+    """
+    os.makedirs(directory, exist_ok=True)
+    dates = np.asarray(data["date"], dtype="datetime64[D]")
+    offsets = (dates - np.datetime64(epoch, "D")).astype(np.int32)
+
+    columns = {"date": offsets}
+    for name in FLOAT_COLUMNS:
+        if name in data:
+            columns[name] = np.ascontiguousarray(data[name], dtype=np.float64)
+
+    for name, array in columns.items():
+        if len(array) != len(offsets):
+            raise ValueError(f"{name}: 행 수가 date와 다릅니다 ({len(array)} != {len(offsets)})")
+        _save_atomic(directory, f"{name}.npy", array)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "rows": int(len(offsets)),
+        "epoch": epoch,
+        "columns": {name: {"file": f"{name}.npy", "dtype": str(array.dtype)}
+                    for name, array in columns.items()},
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(directory, HEADER_FILE))
+    return header
+
+
+def open_columns(directory, columns=None, mmap=True):
+    """
+    컬럼 파일 열기
+
+    Args:
+        columns: 열 컬럼 이름 목록 (None이면 전부). date는 epoch 기준 일수(int32) 그대로
+        mmap: True면 읽기 전용 메모리 맵 (복사 없음)
+
+    Returns:
+        dict: 컬럼 이름 → numpy 배열 (헤더의 행 수만큼)
+    """
+    header = read_header(directory)
+    rows = header["rows"]
+    names = columns or list(header["columns"])
+
+    arrays = {}
+    for name in names:
+        spec = header["columns"].get(name)
+        if spec is None:
+            raise KeyError(f"{directory}: {name} 컬럼이 없습니다")
+        array = np.load(os.path.join(directory, spec["file"]), mmap_mode="r" if mmap else None)
+        arrays[name] = array[:rows]
+    return arrays
+
+
+def load_columns(directory):
+    """gold_backtest.load_gold_data와 같은 형식 (date는 datetime64[D]로 변환)"""
+    header = read_header(directory)
+    data = open_columns(directory)
+    data["date"] = np.datetime64(header["epoch"], "D") + data["date"].astype("timedelta64[D]")
+    return data
+
+
+if __name__ == "__main__":
+    import argparse
+    import subprocess
+    import sys
+
+    parser = argparse.ArgumentParser(description="메모리 맵 컬럼 파일 내보내기/측정")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="CSV/데이터셋/.db → 컬럼 파일")
+    export_parser.add_argument("source")
+    export_parser.add_argument("output", nargs="?", default="gold_columns")
+
+    bench_parser = commands.add_parser("bench", help="데이터 크기별 워커 시작 시간")
+    bench_parser.add_argument("--rows", default="2500,250000,25000000", help="행 수 목록")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from gold_backtest import load_gold_data
+
+        header = export_columns(load_gold_data(args.source), args.output)
+        print(f"✓ {args.output}/ ({header['rows']}행, 컬럼 {len(header['columns'])}개)")
+    else:
+        # 새 프로세스에서 premium/price 컬럼을 여는 시간 (numpy import 제외)
+        probe = (
+            "import sys, time, numpy; from gold_columns import open_columns; "
+            "t = time.perf_counter(); "
+            "c = open_columns(sys.argv[1], ['premium', 'domestic_price']); "
+            "print(time.perf_counter() - t)"
+        )
+        print(f"{'행 수':>12s} {'열기(mmap)':>12s}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for rows in [int(r) for r in args.rows.split(",")]:
+                rng = np.random.default_rng(0)
+                data = {"date": np.datetime64("2000-01-01") + np.arange(rows).astype("timedelta64[D]")}
+                for name in FLOAT_COLUMNS:
+                    data[name] = rng.normal(size=rows)
+                directory = os.path.join(tmp, str(rows))
+                export_columns(data, directory)
+                del data
+
+                timings = []
+                for _ in range(3):
+                    out = subprocess.run([sys.executable, "-c", probe, directory],
+                                         capture_output=True, text=True, check=True,
+                                         cwd=os.path.dirname(os.path.abspath(__file__)))
+                    timings.append(float(out.stdout))
+                print(f"{rows:>12,d} {min(timings) * 1000:>10.2f}ms")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+연도별로 나눈 Arrow 금 시세 데이터셋
+
+gold_dataset/year=2024/data.arrow 처럼 연도 파티션마다 Arrow IPC 파일 하나를 두고,
+같은 날짜는 한 행만 남긴다(나중에 쓴 값 우선). 기간이 겹치는 gold_data CSV를
+여러 번 가져와도 중복이 생기지 않는다.
+
+파티션은 압축 없이 날짜순으로 저장하므로 읽기는 메모리 맵 + 날짜 이진 탐색이다.
+기간 조건은 먼저 연도 디렉터리 이름으로 파일을 거르고, 남은 파일 안에서는
+잘라내기(복사 없음)로 처리한다. HTML 업로드용 CSV(utf-8-sig)는 export_csv로 만든다.
+
+(행이 연 250개 남짓이라 Parquet는 파일당 고정 비용이 CSV 파싱보다 커서 쓰지 않는다.)
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DATASET_DIR = "gold_dataset"
+PARTITION_FILE = "data.arrow"
+
+SCHEMA = pa.schema([
+    ("date", pa.date32()),
+    ("domestic_price", pa.float64()),
+    ("international_price", pa.float64()),
+    ("exchange_rate", pa.float64()),
+    ("premium", pa.float64()),
+])
+COLUMNS = SCHEMA.names
+
+
+def _partition_path(root, year):
+    return os.path.join(root, f"year={year}", PARTITION_FILE)
+
+
+def list_partitions(root=DATASET_DIR):
+    """
+    연도 파티션 목록
+
+    Returns:
+        list: (연도, 파일 경로) 연도순
+    """
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"데이터셋이 없습니다: {root}")
+
+    partitions = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name, PARTITION_FILE)
+        if name.startswith("year=") and name[5:].isdigit() and os.path.exists(path):
+            partitions.append((int(name[5:]), path))
+    return sorted(partitions)
+
+
+def _to_table(df):
+    """DataFrame → SCHEMA 형식 Table (날짜 중복 제거, 날짜순)"""
+    df = df.loc[:, COLUMNS].copy()
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    df = df.drop_duplicates("date", keep="last").sort_values("date", kind="stable")
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+def _read_partition(path, memory_map=True):
+    source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+    with pa.ipc.open_file(source) as reader:
+        return reader.read_all()
+
+
+def _write_atomic(table, path):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 중단돼도 기존 파티션 유지)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_table(table.combine_chunks())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def upsert_rows(df, root=DATASET_DIR):
+    """
+    행 추가/갱신 (같은 날짜는 새 값으로 교체)
+
+    Args:
+        df: date, domestic_price, international_price, exchange_rate, premium 컬럼
+
+    Returns:
+        int: 반영 후 이번에 갱신한 연도 파티션들의 행 수 합
+    """
+    if len(df) == 0:
+        return 0
+
+    new = _to_table(df)
+    years = pc.year(new["date"])
+    total = 0
+    for year in sorted(set(years.to_pylist())):
+        part = new.filter(pc.equal(years, year))
+        path = _partition_path(root, year)
+        if os.path.exists(path):
+            # 기존 행 중 새 날짜와 겹치지 않는 것만 남긴다
+            # (교체할 파일을 메모리 맵으로 잡고 있지 않도록 일반 읽기)
+            old = _read_partition(path, memory_map=False)
+            old = old.filter(pc.invert(pc.is_in(old["date"], value_set=part["date"])))
+            part = pa.concat_tables([old, part]).sort_by("date")
+        _write_atomic(part, path)
+        total += part.num_rows
+    return total
+
+
+def read_table(root=DATASET_DIR, start=None, end=None, columns=None):
+    """
+    기간 조건으로 읽기 (start/end는 'YYYY-MM-DD', 양 끝 포함)
+
+    Returns:
+        pyarrow.Table: 날짜순
+    """
+    first = np.datetime64(start, "D") if start else None
+    last = np.datetime64(end, "D") if end else None
+
+    tables = []
+    for year, path in list_partitions(root):
+        if first is not None and year < first.astype(object).year:
+            continue
+        if last is not None and year > last.astype(object).year:
+            continue
+
+        table = _read_partition(path)
+        dates = table["date"].to_numpy()
+        lo = 0 if first is None else np.searchsorted(dates, first, side="left")
+        hi = len(dates) if last is None else np.searchsorted(dates, last, side="right")
+        table = table.slice(lo, hi - lo)
+        tables.append(table.select(columns) if columns else table)
+
+    if not tables:
+        schema = pa.schema([SCHEMA.field(c) for c in columns]) if columns else SCHEMA
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def load_arrays(root=DATASET_DIR, start=None, end=None):
+    """gold_backtest.load_gold_data와 같은 형식 (컬럼 이름 → numpy 배열)"""
+    table = read_table(root, start, end)
+    data = {"date": table["date"].to_numpy().astype("datetime64[D]")}
+    for column in COLUMNS[1:]:
+        data[column] = table[column].to_numpy()
+    return data
+
+
+def import_csv(paths, root=DATASET_DIR):
+    """gold_data CSV 파일들을 데이터셋으로 가져오기 (뒤에 준 파일이 우선)"""
+    frames = [pd.read_csv(path, encoding="utf-8-sig") for path in paths]
+    if not frames:
+        return 0
+    return upsert_rows(pd.concat(frames, ignore_index=True), root)
+
+
+def export_csv(path, root=DATASET_DIR, start=None, end=None):
+    """HTML 업로드용 CSV 내보내기 (utf-8-sig, 기존 gold_data CSV와 같은 형식)"""
+    df = read_table(root, start, end).to_pandas()
+    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return len(df)
+
+
+def _bench(years):
+    """CSV 파싱 vs Arrow 파티션 읽기 시간 비교 (가짜 데이터)"""
+    import time
+
+    from gold_backtest import load_gold_data
+
+    dates = pd.bdate_range("2000-01-03", periods=252 * years)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "domestic_price": np.round(80000 + rng.normal(0, 500, len(dates)), 2),
+        "international_price": np.round(2000 + rng.normal(0, 20, len(dates)), 2),
+        "exchange_rate": np.round(1300 + rng.normal(0, 10, len(dates)), 2),
+        "premium": np.round(rng.normal(2, 1, len(dates)), 2),
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "gold.csv")
+        root = os.path.join(tmp, "dataset")
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        upsert_rows(df, root)
+
+        timings = {}
+        for label, load in (("CSV", lambda: load_gold_data(csv_path)),
+                            ("Arrow", lambda: load_arrays(root))):
+            load()
+            started = time.perf_counter()
+            for _ in range(20):
+                load()
+            timings[label] = (time.perf_counter() - started) / 20
+
+    print(f"{years}년 ({len(df):,}행) 로드 시간")
+    for label, elapsed in timings.items():
+        print(f"  {label:8s} {elapsed * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="연도별 Arrow 금 시세 데이터셋")
+    parser.add_argument("--root", default=DATASET_DIR, help="데이터셋 디렉터리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="gold_data CSV 가져오기")
+    import_parser.add_argument("csv", nargs="+")
+
+    export_parser = commands.add_parser("export", help="HTML 업로드용 CSV 내보내기")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--start")
+    export_parser.add_argument("--end")
+
+    commands.add_parser("info", help="연도별 행 수/기간")
+
+    bench_parser = commands.add_parser("bench", help="CSV vs Arrow 로드 시간")
+    bench_parser.add_argument("--years", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_csv(args.csv, args.root)
+        print(f"✓ {len(args.csv)}개 파일 가져옴 → {args.root}")
+    elif args.command == "export":
+        rows = export_csv(args.output, args.root, args.start, args.end)
+        print(f"✓ {args.output} ({rows}행)")
+    elif args.command == "info":
+        total = 0
+        for year, path in list_partitions(args.root):
+            dates = read_table(args.root, f"{year}-01-01", f"{year}-12-31", ["date"])["date"]
+            total += len(dates)
+            print(f"  {year}: {len(dates)}행 ({dates[0]} ~ {dates[-1]})")
+        print(f"  합계: {total}행")
+    else:
+        _bench(args.years)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 몬테카를로 시뮬레이션
+
+gold_backtest_v2.html의 generateGoldData는 국내/국제 가격을 날마다 독립적인 균등
+난수(±500/±400)로 움직여서 실제 프리미엄 움직임(평균 회귀, 변동성 군집)과 관계가 없다.
+여기서는 수집한 데이터에서 (경로 × 날짜) 모의 경로 수천 개를 만들고 경로마다 같은
+매매 기준으로 백테스트해 수익률/최대 낙폭 분포를 낸다.
+
+모델
+    bootstrap  정상 블록 부트스트랩(stationary bootstrap). 평균 mean_block일 길이의
+               블록을 원본에서 통째로 뽑아 이어 붙인다. 같은 날의 프리미엄과 국내 가격
+               로그 수익률을 함께 뽑으므로 둘 사이 상관과 블록 안 자기상관이 유지된다.
+    ou         프리미엄에 AR(1)(이산 평균 회귀 과정)을, 국내 가격 로그 수익률에 정규분포를
+               맞추고 두 잔차의 상관까지 반영해 생성한다.
+
+경로는 chunk_size개씩 나눠 프로세스 풀에서 만들고 백테스트한다. 덩어리마다
+SeedSequence(seed).spawn으로 난수를 나누므로 프로세스 수와 무관하게 결과가 같다.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from gold_backtest import backtest_summary, load_gold_data
+
+MODELS = ("bootstrap", "ou")
+MEAN_BLOCK = 20      # 부트스트랩 평균 블록 길이 (거래일)
+CHUNK_SIZE = 500     # 작업 하나가 만드는 경로 수 (500 × 2,500일 ≈ 10MB)
+RESULT_COLUMNS = ["total_return", "win_rate", "trades", "max_drawdown", "final_capital",
+                  "buy_hold_return"]
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def source_series(data):
+    """
+    시뮬레이션 원본: (프리미엄, 국내 가격 로그 수익률, 마지막 프리미엄, 마지막 가격)
+
+    i번째 프리미엄과 i-1 → i 수익률을 짝지으며, 둘 중 하나라도 없는 날은 뺀다.
+    """
+    premiums = np.asarray(data["premium"], dtype=float)
+    prices = np.asarray(data["domestic_price"], dtype=float)
+    valid = np.isfinite(premiums) & np.isfinite(prices) & (prices > 0)
+    premiums, prices = premiums[valid], prices[valid]
+    if len(prices) < 2:
+        raise ValueError("시뮬레이션에 쓸 데이터가 2일 미만입니다")
+    returns = np.diff(np.log(prices))
+    return premiums[1:], returns, float(premiums[-1]), float(prices[-1])
+
+
+def fit_ou(premiums, returns):
+    """
+    AR(1) 프리미엄 + 정규 수익률 모델 적합
+
+    premium[t] = mu + phi * (premium[t-1] - mu) + sigma * e1[t]
+    return[t] = drift + vol * e2[t],  corr(e1, e2) = rho
+
+    Returns:
+        dict: mu, phi, sigma, drift, vol, rho
+    """
+    x, y = premiums[:-1], premiums[1:]
+    phi, intercept = np.polyfit(x, y, 1)
+    phi = float(np.clip(phi, -0.999, 0.999))
+    mu = float(intercept / (1 - phi))
+    residuals = y - (mu + phi * (x - mu))
+    r = returns[1:]
+    rho = float(np.corrcoef(residuals, r)[0, 1]) if residuals.std() > 0 and r.std() > 0 else 0.0
+    return {
+        "mu": mu, "phi": phi, "sigma": float(residuals.std()),
+        "drift": float(returns.mean()), "vol": float(returns.std()),
+        "rho": 0.0 if np.isnan(rho) else rho,
+    }
+
+
+def bootstrap_indices(rng, paths, days, n, mean_block=MEAN_BLOCK):
+    """
+    정상 블록 부트스트랩 인덱스 (paths × days, 원본 길이 n에서 원형으로 이어 읽기)
+
+    날마다 1/mean_block 확률로 새 블록(임의 시작점)을 시작하고, 아니면 앞 날 다음 인덱스.
+    """
+    restart = rng.random((paths, days)) < 1.0 / mean_block
+    restart[:, 0] = True
+    steps = np.arange(days)
+    block_start = np.maximum.accumulate(np.where(restart, steps, 0), axis=1)
+    offsets = rng.integers(0, n, size=(paths, days))
+    return (np.take_along_axis(offsets, block_start, axis=1) + (steps - block_start)) % n
+
+
+def simulate_bootstrap(premiums, returns, paths, days, start_price, rng, mean_block=MEAN_BLOCK):
+    """부트스트랩 경로 → (프리미엄, 국내 가격) 각각 (paths × days)"""
+    idx = bootstrap_indices(rng, paths, days, len(premiums), mean_block)
+    prices = start_price * np.exp(np.cumsum(returns[idx], axis=1))
+    return premiums[idx], prices
+
+
+def simulate_ou(params, paths, days, start_premium, start_price, rng):
+    """AR(1) 경로 → (프리미엄, 국내 가격) 각각 (paths × days)"""
+    e1 = rng.standard_normal((paths, days))
+    e2 = params["rho"] * e1 + np.sqrt(1 - params["rho"] ** 2) * rng.standard_normal((paths, days))
+
+    mu, phi = params["mu"], params["phi"]
+    shocks = params["sigma"] * e1
+    premiums = np.empty((paths, days))
+    level = np.full(paths, start_premium - mu)
+    for t in range(days):
+        level = phi * level + shocks[:, t]
+        premiums[:, t] = level
+    premiums += mu
+
+    prices = start_price * np.exp(np.cumsum(params["drift"] + params["vol"] * e2, axis=1))
+    return premiums, prices
+
+
+def _simulate_chunk(seed, paths, days, model, source, params, mean_block,
+                    buy_premium, sell_premium, initial_capital, unit_type):
+    """경로 paths개 생성 + 경로별 백테스트 (워커에서 실행)"""
+    rng = np.random.default_rng(seed)
+    premiums, returns, start_premium, start_price = source
+    if model == "bootstrap":
+        premium_paths, price_paths = simulate_bootstrap(premiums, returns, paths, days,
+                                                        start_price, rng, mean_block)
+    else:
+        premium_paths, price_paths = simulate_ou(params, paths, days, start_premium,
+                                                 start_price, rng)
+
+    rows = np.empty((paths, len(RESULT_COLUMNS)))
+    for p in range(paths):
+        summary = backtest_summary(premium_paths[p], price_paths[p], buy_premium, sell_premium,
+                                   initial_capital, unit_type)
+        rows[p, :5] = (summary["total_return"], summary["win_rate"], summary["trades"],
+                       summary["max_drawdown"], summary["final_capital"])
+    rows[:, 5] = (price_paths[:, -1] / price_paths[:, 0] - 1) * 100
+    return rows
+
+
+def run_montecarlo(data, buy_premium, sell_premium, paths=10_000, days=None, model="bootstrap",
+                   mean_block=MEAN_BLOCK, initial_capital=10_000_000, unit_type="1kg", seed=0,
+                   processes=None, chunk_size=CHUNK_SIZE):
+    """
+    모의 경로별 백테스트
+
+    Args:
+        data: load_gold_data 결과 (모델 적합/부트스트랩 원본)
+        paths, days: 경로 수, 경로 길이 (days=None이면 원본 길이)
+        model: "bootstrap" 또는 "ou"
+        seed: 난수 시드 (같은 시드/chunk_size면 프로세스 수와 무관하게 같은 결과)
+        processes: 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+
+    Returns:
+        DataFrame: 경로별 RESULT_COLUMNS (buy_hold_return은 첫날 대비 마지막 날 가격 변화 %)
+    """
+    if model not in MODELS:
+        raise ValueError(f"알 수 없는 모델: {model}")
+    source = source_series(data)
+    params = fit_ou(source[0], source[1]) if model == "ou" else None
+    days = days or len(source[0]) + 1
+
+    sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, size, days, model, source, params, mean_block, buy_premium, sell_premium,
+              initial_capital, unit_type) for s, size in zip(seeds, sizes)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(tasks) <= 1:
+        parts = [_simulate_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = [future.result() for future in [executor.submit(_simulate_chunk, *task)
+                                                    for task in tasks]]
+
+    rows = np.vstack(parts) if parts else np.empty((0, len(RESULT_COLUMNS)))
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    df["trades"] = df["trades"].astype(int)
+    return df
+
+
+def summarize(results, percentiles=PERCENTILES):
+    """경로별 결과 → 통계별 평균/분위수 표 (+ 손실 확률)"""
+    table = pd.DataFrame({
+        "mean": results.mean(),
+        **{f"p{q}": results.quantile(q / 100) for q in percentiles},
+    })
+    table.loc["loss_probability"] = np.nan
+    table.loc["loss_probability", "mean"] = (results["total_return"] < 0).mean() * 100
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="김치프리미엄 몬테카를로 시뮬레이션")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db (기본: 가장 최근 CSV)")
+    parser.add_argument("--buy", type=float, default=0.5, help="매수 기준 (%%)")
+    parser.add_argument("--sell", type=float, default=3.0, help="매도 기준 (%%)")
+    parser.add_argument("--unit", default="1kg", choices=["1kg", "1g"], help="거래 단위")
+    parser.add_argument("--capital", type=float, default=10_000_000, help="초기 투자금 (원)")
+    parser.add_argument("--model", choices=MODELS, default="bootstrap", help="모의 경로 모델")
+    parser.add_argument("--paths", type=int, default=10_000, help="경로 수")
+    parser.add_argument("--days", type=int, default=None, help="경로 길이 (기본: 원본 길이)")
+    parser.add_argument("--block", type=float, default=MEAN_BLOCK, help="부트스트랩 평균 블록 길이 (일)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--processes", type=int, default=None, help="워커 프로세스 수")
+    parser.add_argument("--output", help="경로별 결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        candidates = glob.glob("gold_data_*.csv")
+        if not candidates:
+            parser.error("gold_data CSV 파일을 지정하세요")
+        csv_path = max(candidates, key=os.path.getmtime)
+
+    data = load_gold_data(csv_path)
+
+    print("=" * 60)
+    print("🎲 몬테카를로 시뮬레이션")
+    print("=" * 60)
+    print(f"데이터: {csv_path} ({len(data['date'])}일)")
+    print(f"모델: {args.model}, 경로 {args.paths:,}개, 시드 {args.seed}")
+    print(f"기준: 매수 {args.buy}% 이하 / 매도 {args.sell}% 이상 ({args.unit})")
+    if args.model == "ou":
+        params = fit_ou(*source_series(data)[:2])
+        print("적합: " + ", ".join(f"{k}={v:.4f}" for k, v in params.items()))
+
+    started = time.perf_counter()
+    results = run_montecarlo(data, args.buy, args.sell, args.paths, args.days, args.model,
+                             args.block, args.capital, args.unit, args.seed, args.processes)
+    elapsed = time.perf_counter() - started
+    print(f"✓ {elapsed:.2f}초 ({len(results) / elapsed:,.0f} 경로/초)")
+
+    print()
+    print(summarize(results).to_string(float_format=lambda v: f"{v:,.2f}", na_rep=""))
+
+    if args.output:
+        results.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n✓ 경로별 결과 저장: {args.output}")
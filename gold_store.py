@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 금 시세 저장소
+
+테이블:
+    daily        날짜별 CSV 한 행 (date 기본 키)
+    exim_rates   수출입은행 원본 환율 (date, currency)
+    krx_closes   KRX 상품별 원본 종가/거래량 (date, product)
+    yf_closes    Yahoo Finance 종가 (date, symbol)
+    backtest_runs 백테스트 실행 기록
+
+날짜는 모두 'YYYY-MM-DD' 문자열. 쓰기는 같은 키가 있으면 덮어쓰는 upsert이고,
+WAL 모드라 수집기가 쓰는 동안에도 백테스트가 읽을 수 있다.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+DB_PATH = "gold_data.db"
+BUSY_TIMEOUT = 30  # 다른 프로세스가 쓰는 중일 때 기다릴 시간 (초)
+
+DAILY_COLUMNS = ["date", "domestic_price", "international_price", "exchange_rate", "premium"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    date TEXT PRIMARY KEY,
+    domestic_price REAL,
+    international_price REAL,
+    exchange_rate REAL,
+    premium REAL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS exim_rates (
+    date TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    deal_bas_r REAL,
+    PRIMARY KEY (date, currency)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS krx_closes (
+    date TEXT NOT NULL,
+    product TEXT NOT NULL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (date, product)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS yf_closes (
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    close REAL,
+    PRIMARY KEY (date, symbol)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS backtest_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    buy_premium REAL,
+    sell_premium REAL,
+    initial_capital REAL,
+    unit_type TEXT,
+    total_return REAL,
+    win_rate REAL,
+    trades INTEGER,
+    final_capital REAL
+);
+"""
+
+
+def to_iso_date(value):
+    """'YYYYMMDD' / 'YYYY-MM-DD' / datetime → 'YYYY-MM-DD'"""
+    if isinstance(value, str):
+        value = value.strip()
+        if len(value) == 8 and value.isdigit():
+            return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+        return value[:10]
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _number(raw):
+    """API 숫자 문자열 → float ('-', 빈 값은 None)"""
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    text = str(raw).replace(",", "").strip()
+    if not text or text == "-":
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class GoldStore:
+    """
+    SQLite 저장소 (스레드 간 공유 가능, 쓰기는 내부 잠금으로 직렬화)
+
+    with GoldStore("gold_data.db") as store:
+        store.upsert_daily(df)
+        store.get_daily("2025-01-02")
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, sql, rows):
+        with self.lock, self.conn:
+            self.conn.executemany(sql, rows)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # ---------------- 쓰기 ----------------
+
+    def upsert_daily(self, df):
+        """daily 행 추가/갱신 (DataFrame 또는 dict 목록, DAILY_COLUMNS)"""
+        records = df.to_dict("records") if isinstance(df, pd.DataFrame) else list(df)
+        updated_at = _now()
+        rows = [
+            (to_iso_date(r["date"]), _number(r.get("domestic_price")),
+             _number(r.get("international_price")), _number(r.get("exchange_rate")),
+             _number(r.get("premium")), updated_at)
+            for r in records
+        ]
+        self._write(
+            "INSERT INTO daily VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(date) DO UPDATE SET domestic_price=excluded.domestic_price, "
+            "international_price=excluded.international_price, "
+            "exchange_rate=excluded.exchange_rate, premium=excluded.premium, "
+            "updated_at=excluded.updated_at",
+            rows,
+        )
+        return len(rows)
+
+    def put_exim_payload(self, date, payload):
+        """수출입은행 exchangeJSON 응답의 통화별 매매기준율 저장"""
+        date = to_iso_date(date)
+        rows = [
+            (date, item.get("cur_unit"), _number(item.get("deal_bas_r")))
+            for item in payload or []
+            if isinstance(item, dict) and item.get("cur_unit")
+        ]
+        self._write(
+            "INSERT INTO exim_rates VALUES (?, ?, ?) "
+            "ON CONFLICT(date, currency) DO UPDATE SET deal_bas_r=excluded.deal_bas_r",
+            rows,
+        )
+        return len(rows)
+
+    def put_krx_payload(self, date, payload):
+        """KRX gold_bydd_trd 응답의 상품별 종가/거래량 저장 (원본 단위 그대로)"""
+        date = to_iso_date(date)
+        rows = [
+            (to_iso_date(item.get("BAS_DD") or date), (item.get("ISU_NM") or "").strip(),
+             _number(item.get("TDD_CLSPRC")), _number(item.get("ACC_TRDVOL")))
+            for item in (payload or {}).get("OutBlock_1", [])
+            if item.get("ISU_NM")
+        ]
+        self._write(
+            "INSERT INTO krx_closes VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(date, product) DO UPDATE SET close=excluded.close, volume=excluded.volume",
+            rows,
+        )
+        return len(rows)
+
+    def put_yf_closes(self, closes, symbol="GC=F"):
+        """Yahoo Finance 종가 저장 (날짜 인덱스 Series)"""
+        rows = [(to_iso_date(date), symbol, _number(close)) for date, close in closes.items()]
+        self._write(
+            "INSERT INTO yf_closes VALUES (?, ?, ?) "
+            "ON CONFLICT(date, symbol) DO UPDATE SET close=excluded.close",
+            rows,
+        )
+        return len(rows)
+
+    def record_backtest(self, start_date, end_date, buy_premium, sell_premium,
+                        initial_capital, unit_type, summary):
+        """백테스트 결과 기록 (summary: perform_backtest 결과)"""
+        self._write(
+            "INSERT INTO backtest_runs (run_at, start_date, end_date, buy_premium, sell_premium, "
+            "initial_capital, unit_type, total_return, win_rate, trades, final_capital) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(_now(), start_date, end_date, buy_premium, sell_premium, initial_capital, unit_type,
+              summary["totalReturn"], summary["winRate"], summary["totalTrades"],
+              summary["finalCapital"])],
+        )
+
+    # ---------------- 읽기 ----------------
+
+    def get_daily(self, date):
+        """한 날짜의 daily 행 (없으면 None)"""
+        rows = self._query("SELECT * FROM daily WHERE date = ?", (to_iso_date(date),))
+        return dict(rows[0]) if rows else None
+
+    def read_daily(self, start=None, end=None):
+        """
+        기간 조건으로 daily 읽기 (양 끝 포함, 날짜 인덱스 범위 검색)
+
+        Returns:
+            DataFrame: DAILY_COLUMNS, 날짜순
+        """
+        sql = f"SELECT {', '.join(DAILY_COLUMNS)} FROM daily WHERE 1=1"
+        params = []
+        if start:
+            sql += " AND date >= ?"
+            params.append(to_iso_date(start))
+        if end:
+            sql += " AND date <= ?"
+            params.append(to_iso_date(end))
+        rows = self._query(sql + " ORDER BY date", params)
+        return pd.DataFrame([tuple(r) for r in rows], columns=DAILY_COLUMNS)
+
+    def load_arrays(self, start=None, end=None):
+        """gold_backtest.load_gold_data와 같은 형식 (컬럼 이름 → numpy 배열)"""
+        df = self.read_daily(start, end)
+        data = {"date": pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")}
+        for column in DAILY_COLUMNS[1:]:
+            data[column] = df[column].to_numpy(dtype=float)
+        return data
+
+    def raw_observations(self, date):
+        """한 날짜의 원본 관측값 (exim, krx, yfinance)"""
+        date = to_iso_date(date)
+        queries = {
+            "exim": "SELECT currency, deal_bas_r FROM exim_rates WHERE date = ?",
+            "krx": "SELECT product, close, volume FROM krx_closes WHERE date = ?",
+            "yfinance": "SELECT symbol, close FROM yf_closes WHERE date = ?",
+        }
+        return {
+            provider: [dict(r) for r in self._query(sql, (date,))]
+            for provider, sql in queries.items()
+        }
+
+    def observations(self, start=None, end=None, currency="USD"):
+        """
+        기간 안의 원본 관측값 (양 끝 포함, 수집기 read-through용)
+
+        Returns:
+            tuple: ({날짜: currency 매매기준율}, {날짜: [(상품, 종가), ...]})
+        """
+        where, params = " WHERE 1=1", []
+        if start:
+            where += " AND date >= ?"
+            params.append(to_iso_date(start))
+        if end:
+            where += " AND date <= ?"
+            params.append(to_iso_date(end))
+
+        rates = {
+            r["date"]: r["deal_bas_r"]
+            for r in self._query("SELECT date, deal_bas_r FROM exim_rates" + where
+                                 + " AND currency = ?", params + [currency])
+            if r["deal_bas_r"] is not None
+        }
+        closes = {}
+        for r in self._query("SELECT date, product, close FROM krx_closes" + where
+                             + " ORDER BY date", params):
+            closes.setdefault(r["date"], []).append((r["product"], r["close"]))
+        return rates, closes
+
+    def counts(self):
+        """테이블별 행 수"""
+        tables = ("daily", "exim_rates", "krx_closes", "yf_closes", "backtest_runs")
+        return {t: self._query(f"SELECT COUNT(*) FROM {t}")[0][0] for t in tables}
+
+    # ---------------- CSV ----------------
+
+    def import_csv(self, path):
+        """gold_data CSV 가져오기 (같은 날짜는 덮어씀)"""
+        return self.upsert_daily(pd.read_csv(path, encoding="utf-8-sig"))
+
+    def export_csv(self, path, start=None, end=None):
+        """HTML 업로드용 CSV 내보내기 (utf-8-sig)"""
+        df = self.read_daily(start, end)
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return len(df)
+
+
+def fix_day(store, date, **values):
+    """
+    한 날짜 값 수정 후 프리미엄 재계산 (다시 수집하지 않고 잘못된 하루만 고칠 때)
+
+    Args:
+        values: domestic_price / international_price / exchange_rate 중 바꿀 값
+
+    Returns:
+        dict: 수정된 daily 행
+    """
+    from collect_gold_data_final import calculate_kimchi_premium
+
+    row = store.get_daily(date) or {"date": to_iso_date(date)}
+    row.update({key: value for key, value in values.items() if value is not None})
+    missing = [c for c in DAILY_COLUMNS[1:4] if row.get(c) is None]
+    if missing:
+        raise ValueError(f"{row['date']}: 값이 없습니다 ({', '.join(missing)})")
+
+    row["premium"] = calculate_kimchi_premium(
+        row["domestic_price"], row["international_price"], row["exchange_rate"])
+    store.upsert_daily([row])
+    return store.get_daily(date)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite 금 시세 저장소")
+    parser.add_argument("--db", default=DB_PATH, help="데이터베이스 파일")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="gold_data CSV 가져오기")
+    import_parser.add_argument("csv", nargs="+")
+
+    export_parser = commands.add_parser("export", help="HTML 업로드용 CSV 내보내기")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--start")
+    export_parser.add_argument("--end")
+
+    get_parser = commands.add_parser("get", help="한 날짜 조회 (원본 관측값 포함)")
+    get_parser.add_argument("date")
+
+    fix_parser = commands.add_parser("fix", help="한 날짜 값 수정 + 프리미엄 재계산")
+    fix_parser.add_argument("date")
+    fix_parser.add_argument("--domestic-price", type=float)
+    fix_parser.add_argument("--international-price", type=float)
+    fix_parser.add_argument("--exchange-rate", type=float)
+
+    commands.add_parser("info", help="테이블별 행 수")
+
+    args = parser.parse_args()
+
+    with GoldStore(args.db) as store:
+        if args.command == "import":
+            for path in args.csv:
+                print(f"✓ {path}: {store.import_csv(path)}행")
+        elif args.command == "export":
+            print(f"✓ {args.output} ({store.export_csv(args.output, args.start, args.end)}행)")
+        elif args.command == "get":
+            row = store.get_daily(args.date)
+            print(row if row else f"❌ {to_iso_date(args.date)} 데이터 없음")
+            for provider, observations in store.raw_observations(args.date).items():
+                for observation in observations:
+                    print(f"  [{provider}] {observation}")
+        elif args.command == "fix":
+            row = fix_day(store, args.date, domestic_price=args.domestic_price,
+                          international_price=args.international_price,
+                          exchange_rate=args.exchange_rate)
+            print(f"✓ 수정: {row}")
+        else:
+            for table, count in store.counts().items():
+                print(f"  {table}: {count:,}행")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 매매 기준 파라미터 스윕
+
+매수 기준 × 매도 기준 × 거래 단위 × 초기 투자금 격자 전체를 백테스트하고
+수익률/승률/최대 낙폭 순으로 정렬한 표를 만든다.
+
+가격/프리미엄 배열은 공유 메모리에 한 번만 올리고 워커 프로세스는 그것을 붙여 쓴다
+(작업마다 배열을 pickle로 넘기지 않음). 컬럼 파일(gold_columns.py) 디렉터리를 주면
+공유 메모리 대신 워커가 그 파일들을 메모리 맵으로 연다.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from gold_backtest import backtest_summary, load_gold_data, next_signal_index
+from gold_columns import is_column_dir, open_columns
+from gold_vector import vector_backtest
+
+RESULT_COLUMNS = [
+    "buy_premium", "sell_premium", "unit_type", "initial_capital",
+    "total_return", "win_rate", "trades", "max_drawdown", "final_capital",
+]
+VECTOR_BATCH = 512  # 벡터화 커널 한 번에 계산할 기준쌍 수 (기준쌍 × 날짜 배열 크기 제한)
+
+# 워커 프로세스 전역 상태 (initializer에서 채움)
+_shm = None
+_premiums = None
+_prices = None
+_sell_cache = {}
+
+
+def _attach_shared(name, n):
+    """공유 메모리에 올린 (premium, price) 배열을 붙여 쓴다"""
+    global _shm, _premiums, _prices
+    _shm = shared_memory.SharedMemory(name=name)
+    table = np.ndarray((2, n), dtype=np.float64, buffer=_shm.buf)
+    _premiums, _prices = table[0], table[1]
+    _sell_cache.clear()
+
+
+def _attach_columns(directory):
+    """컬럼 파일(gold_columns.py)을 메모리 맵으로 연다 (데이터 크기와 무관하게 즉시)"""
+    global _premiums, _prices
+    columns = open_columns(directory, ["premium", "domestic_price"])
+    _premiums, _prices = columns["premium"], columns["domestic_price"]
+    _sell_cache.clear()
+
+
+def _use_arrays(premiums, prices):
+    """공유 메모리 없이 현재 프로세스 배열을 그대로 사용 (processes=1)"""
+    global _premiums, _prices
+    _premiums, _prices = premiums, prices
+    _sell_cache.clear()
+
+
+def _evaluate_chunk(buy_values, sell_values, unit_types, capitals, skip_invalid=True):
+    """매수 기준 일부 × 나머지 전체 조합 평가"""
+    rows = []
+    for buy in buy_values:
+        next_buy = next_signal_index(_premiums, buy, "buy")
+        for sell in sell_values:
+            if skip_invalid and buy >= sell:
+                continue
+            next_sell = _sell_cache.get(sell)
+            if next_sell is None:
+                next_sell = _sell_cache[sell] = next_signal_index(_premiums, sell, "sell")
+            for unit_type in unit_types:
+                for capital in capitals:
+                    summary = backtest_summary(
+                        _premiums, _prices, buy, sell, capital, unit_type,
+                        next_buy=next_buy, next_sell=next_sell,
+                    )
+                    rows.append((
+                        buy, sell, unit_type, capital,
+                        summary["total_return"], summary["win_rate"], summary["trades"],
+                        summary["max_drawdown"], summary["final_capital"],
+                    ))
+    return rows
+
+
+def _evaluate_chunk_vector(buy_values, sell_values, unit_types, capitals, skip_invalid=True):
+    """_evaluate_chunk와 같은 조합을 벡터화 커널로 평가"""
+    buys, sells = np.meshgrid(buy_values, sell_values, indexing="ij")
+    buys, sells = buys.ravel(), sells.ravel()
+    if skip_invalid:
+        keep = buys < sells
+        buys, sells = buys[keep], sells[keep]
+
+    rows = []
+    for start in range(0, len(buys), VECTOR_BATCH):
+        batch_buys = buys[start:start + VECTOR_BATCH]
+        batch_sells = sells[start:start + VECTOR_BATCH]
+        for unit_type in unit_types:
+            for capital in capitals:
+                result = vector_backtest(_premiums, _prices, batch_buys, batch_sells,
+                                         capital, unit_type, curves=False)
+                rows.extend(zip(
+                    batch_buys.tolist(), batch_sells.tolist(),
+                    [unit_type] * len(batch_buys), [capital] * len(batch_buys),
+                    result["total_return"].tolist(), result["win_rate"].tolist(),
+                    result["trades"].tolist(), result["max_drawdown"].tolist(),
+                    result["final_capital"].tolist(),
+                ))
+    return rows
+
+
+KERNELS = {"loop": _evaluate_chunk, "vector": _evaluate_chunk_vector}
+
+
+def rank_results(df):
+    """수익률 ↓, 승률 ↓, 최대 낙폭 ↑ 순 정렬"""
+    return df.sort_values(
+        ["total_return", "win_rate", "max_drawdown"],
+        ascending=[False, False, True],
+        kind="stable",
+    ).reset_index(drop=True)
+
+
+def run_sweep(data, buy_values, sell_values, unit_types=("1kg",), capitals=(10_000_000,),
+              processes=None, skip_invalid=True, kernel="loop", columns_dir=None):
+    """
+    파라미터 격자 전체 백테스트
+
+    Args:
+        data: load_gold_data 결과
+        buy_values, sell_values: 매수/매도 기준 후보 (%)
+        unit_types: 거래 단위 후보 ("1kg", "1g")
+        capitals: 초기 투자금 후보 (원)
+        processes: 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        skip_invalid: HTML처럼 매수 기준 >= 매도 기준 조합은 제외
+        kernel: "loop"(거래 단위 루프) 또는 "vector"(기준쌍 일괄 벡터화). vector는 기준쌍
+                대부분이 매수할 수 없을 때(예: 1kg 단위 + 적은 투자금)만 빠르다
+        columns_dir: data와 같은 내용의 컬럼 파일 디렉터리. 주면 공유 메모리 대신
+                     워커가 이 파일들을 메모리 맵으로 연다
+
+    Returns:
+        DataFrame: RESULT_COLUMNS, rank_results 순서
+    """
+    premiums = np.ascontiguousarray(data["premium"], dtype=np.float64)
+    prices = np.ascontiguousarray(data["domestic_price"], dtype=np.float64)
+    n = len(premiums)
+
+    buy_values = [float(b) for b in buy_values]
+    sell_values = [float(s) for s in sell_values]
+    processes = processes or os.cpu_count() or 1
+
+    # 매수 기준을 작업 단위로 나눈다 (작업당 매도 기준 전체)
+    chunk_size = max(1, len(buy_values) // (processes * 4))
+    chunks = [buy_values[i:i + chunk_size] for i in range(0, len(buy_values), chunk_size)]
+
+    evaluate = KERNELS[kernel]
+    rows = []
+    if processes <= 1:
+        _use_arrays(premiums, prices)
+        for chunk in chunks:
+            rows.extend(evaluate(chunk, sell_values, unit_types, capitals, skip_invalid))
+    elif columns_dir is not None:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_attach_columns,
+                                 initargs=(columns_dir,)) as executor:
+            futures = [
+                executor.submit(evaluate, chunk, sell_values, unit_types, capitals, skip_invalid)
+                for chunk in chunks
+            ]
+            for future in futures:
+                rows.extend(future.result())
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 2 * n * 8))
+        try:
+            table = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+            table[0], table[1] = premiums, prices
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach_shared,
+                                     initargs=(shm.name, n)) as executor:
+                futures = [
+                    executor.submit(evaluate, chunk, sell_values, unit_types, capitals,
+                                    skip_invalid)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    rows.extend(future.result())
+            del table
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return rank_results(pd.DataFrame(rows, columns=RESULT_COLUMNS))
+
+
+def frange(start, stop, step):
+    """소수 간격 값 목록 (stop 포함, 소수 둘째 자리 반올림)"""
+    count = int(round((stop - start) / step)) + 1
+    return [round(start + i * step, 2) for i in range(count)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="김치프리미엄 매매 기준 파라미터 스윕")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db (기본: 가장 최근 CSV)")
+    parser.add_argument("--buy", default="-5,10,0.1", help="매수 기준 시작,끝,간격 (%%)")
+    parser.add_argument("--sell", default="0,15,0.1", help="매도 기준 시작,끝,간격 (%%)")
+    parser.add_argument("--units", default="1kg", help="거래 단위 목록 (예: 1kg,1g)")
+    parser.add_argument("--capitals", default="10000000", help="초기 투자금 목록 (원)")
+    parser.add_argument("--processes", type=int, default=None, help="워커 프로세스 수")
+    parser.add_argument("--kernel", choices=sorted(KERNELS), default="loop",
+                        help="백테스트 커널 (vector는 기준쌍 대부분이 매수할 수 없을 때만 빠름)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    parser.add_argument("--output", help="전체 결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        candidates = glob.glob("gold_data_*.csv")
+        if not candidates:
+            parser.error("gold_data CSV 파일을 지정하세요")
+        csv_path = max(candidates, key=os.path.getmtime)
+
+    buy_values = frange(*[float(v) for v in args.buy.split(",")])
+    sell_values = frange(*[float(v) for v in args.sell.split(",")])
+    unit_types = args.units.split(",")
+    capitals = [float(c) for c in args.capitals.split(",")]
+
+    data = load_gold_data(csv_path)
+    total = len(buy_values) * len(sell_values) * len(unit_types) * len(capitals)
+
+    print("=" * 60)
+    print("📈 파라미터 스윕")
+    print("=" * 60)
+    print(f"데이터: {csv_path} ({len(data['date'])}일)")
+    print(f"조합 수: {len(buy_values)} × {len(sell_values)} × {len(unit_types)} × {len(capitals)} = {total:,}")
+
+    started = time.perf_counter()
+    results = run_sweep(data, buy_values, sell_values, unit_types, capitals, args.processes,
+                        kernel=args.kernel,
+                        columns_dir=csv_path if os.path.isdir(csv_path) and is_column_dir(csv_path) else None)
+    elapsed = time.perf_counter() - started
+    print(f"✓ {elapsed:.2f}초 ({total / elapsed:,.0f} 조합/초)")
+
+    print(f"\n상위 {args.top}개:")
+    print(results.head(args.top).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    if args.output:
+        results.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n✓ 전체 결과 저장: {args.output}")
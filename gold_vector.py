@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 밴드 전략 벡터화 백테스트 커널
+
+매수 기준 < 매도 기준이면 매수 신호(premium <= buy)와 매도 신호(premium >= sell)가
+같은 날 동시에 나지 않으므로, 보유 상태는 "가장 최근 신호"를 앞으로 채운(ffill) 값이다.
+이 성질로 (기준쌍 × 날짜) 2차원 배열에서 보유 상태/매매일을 한 번에 구하고,
+현금 흐름만 거래 순번 단위로 모든 기준쌍을 함께 진행한다.
+
+매수 기준 >= 매도 기준이거나 현금이 모자라 매수가 실패하는 기준쌍은
+ffill 가정이 깨지므로 gold_backtest.backtest_summary(루프 엔진)로 계산한다.
+
+속도는 데이터에 달렸다. 루프 엔진도 매매일 사이를 건너뛰므로 기준쌍 대부분이 매매하는
+격자에서는 루프가 같거나 더 빠르다 (2,520일, 61 × 81, 1g 단위: 루프 0.86초 / 벡터 1.00초,
+매매가 드문 넓은 격자는 0.33초 / 0.68초). 벡터 커널이 이기는 것은 기준쌍 대부분이 한 번도
+살 수 없는 경우 (예: 1kg 단위에 투자금이 적을 때 1.85초 / 0.68초)처럼 거래 수가 적은
+기준쌍을 한꺼번에 끝낼 수 있을 때다.
+"""
+
+import numpy as np
+
+from gold_backtest import UNIT_MULTIPLIER, backtest_summary
+
+
+def band_positions(premiums, buy_values, sell_values):
+    """
+    기준쌍별 보유 상태 (모든 매수가 성공한다고 가정)
+
+    Returns:
+        tuple: (position, entry, exit) 모두 (기준쌍 × 날짜) bool 배열
+               position은 그날 매매 후 보유 여부
+    """
+    premiums = np.asarray(premiums, dtype=float)
+    buy_values = np.asarray(buy_values, dtype=float)
+    sell_values = np.asarray(sell_values, dtype=float)
+    n = len(premiums)
+
+    buy_signal = premiums[None, :] <= buy_values[:, None]
+    sell_signal = premiums[None, :] >= sell_values[:, None]
+
+    # 가장 최근 신호 위치를 앞으로 채운다 (신호가 없으면 -1)
+    has_signal = buy_signal | sell_signal
+    last = np.maximum.accumulate(np.where(has_signal, np.arange(n), -1), axis=1)
+    position = np.take_along_axis(buy_signal, np.maximum(last, 0), axis=1) & (last >= 0)
+
+    previous = np.zeros_like(position)
+    previous[:, 1:] = position[:, :-1]
+    entry = position & ~previous
+    exit = ~position & previous
+    return position, entry, exit
+
+
+def _padded_indices(mask):
+    """행마다 True 위치를 왼쪽부터 채운 (행 × 최대 개수) 배열, 빈 칸은 -1"""
+    rows, cols = np.nonzero(mask)
+    counts = mask.sum(axis=1)
+    width = int(counts.max()) if len(counts) else 0
+    result = np.full((mask.shape[0], width), -1, dtype=np.int64)
+    if len(rows):
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        result[rows, np.arange(len(rows)) - starts[rows]] = cols
+    return result
+
+
+def vector_backtest(premiums, prices, buy_values, sell_values, initial_capital=10_000_000,
+                    unit_type="1kg", curves=True):
+    """
+    여러 기준쌍을 한 번에 백테스트
+
+    Args:
+        premiums, prices: 날짜순 김치프리미엄(%) / 국내 가격(원/g) 배열
+        buy_values, sell_values: 길이 P의 매수/매도 기준 (i번째끼리 한 쌍)
+        curves: True면 일별 보유/현금/평가 자산 (P × 날짜) 배열도 반환
+
+    Returns:
+        dict: total_return, win_rate, trades, max_drawdown, final_capital (길이 P)
+              curves=True면 position, cash, equity 추가
+    """
+    premiums = np.asarray(premiums, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    buy_values = np.atleast_1d(np.asarray(buy_values, dtype=float))
+    sell_values = np.atleast_1d(np.asarray(sell_values, dtype=float))
+    pairs = len(buy_values)
+    n = len(prices)
+    unit_multiplier = UNIT_MULTIPLIER.get(unit_type, 1)
+
+    position, entry, exit = band_positions(premiums, buy_values, sell_values)
+
+    # 매수 신호일 가격이 모두 초기 투자금보다 비싸면 한 번도 매수하지 못한다
+    affordable = np.floor(initial_capital / (prices * unit_multiplier)) > 0
+    never_buys = ~(premiums[None, :] <= buy_values[:, None])[:, affordable].any(axis=1)
+    position[never_buys] = entry[never_buys] = exit[never_buys] = False
+    entries = _padded_indices(entry)
+    exits = _padded_indices(exit)
+    max_trades = entries.shape[1]
+    if exits.shape[1] < max_trades:
+        exits = np.pad(exits, ((0, 0), (0, max_trades - exits.shape[1])), constant_values=-1)
+
+    # 거래 순번별 현금 흐름 (모든 기준쌍 동시 진행)
+    cash = np.full(pairs, float(initial_capital))
+    fallback = (buy_values >= sell_values) & ~never_buys
+    wins = np.zeros(pairs, dtype=np.int64)
+    cash_after_buy = np.zeros((pairs, max_trades))
+    holdings_at = np.zeros((pairs, max_trades))
+    cash_after_sell = np.zeros((pairs, max_trades))
+
+    for k in range(max_trades):
+        buy_day = entries[:, k]
+        active = (buy_day >= 0) & ~fallback
+        if not active.any():
+            break
+
+        price_per_unit = np.where(active, prices[np.maximum(buy_day, 0)] * unit_multiplier, 1.0)
+        quantity = np.floor(cash / price_per_unit)
+        # 매수 실패(수량 0)는 다음 매수 신호에서 다시 시도해야 하므로 루프 엔진으로 넘긴다
+        fallback |= active & (quantity <= 0)
+        active &= ~fallback
+
+        total_cost = quantity * price_per_unit
+        holdings = quantity * unit_multiplier
+        bought = cash - total_cost
+
+        sell_day = np.where(exits[:, k] >= 0, exits[:, k], n - 1)  # 없으면 마지막 날 청산
+        total_revenue = (holdings / unit_multiplier) * (prices[sell_day] * unit_multiplier)
+
+        cash_after_buy[:, k] = np.where(active, bought, cash)
+        holdings_at[:, k] = np.where(active, holdings, 0.0)
+        cash = np.where(active, bought + total_revenue, cash)
+        cash_after_sell[:, k] = cash
+        wins += active & (total_revenue - total_cost > 0)
+
+    sells = entry.sum(axis=1)
+    trades = 2 * sells
+
+    # 일별 현금/평가 자산: 보유 구간(매도일 포함)은 현금 + 보유량 × 가격
+    trade_no = np.cumsum(entry, axis=1) - 1
+    safe_no = np.maximum(trade_no, 0)
+    holding = position | exit
+    if max_trades:
+        after_buy = np.take_along_axis(cash_after_buy, safe_no, axis=1)
+        held = np.take_along_axis(holdings_at, safe_no, axis=1)
+        after_sell = np.take_along_axis(cash_after_sell, safe_no, axis=1)
+    else:
+        after_buy = held = after_sell = np.zeros((pairs, n))
+    flat_cash = np.where(trade_no >= 0, after_sell, float(initial_capital))
+    daily_cash = np.where(position, after_buy, flat_cash)
+    equity = np.where(holding, after_buy + held * prices[None, :], flat_cash)
+
+    running_peak = np.maximum(np.maximum.accumulate(equity, axis=1), float(initial_capital))
+    max_drawdown = (1 - equity / running_peak).max(axis=1, initial=0.0) * 100
+
+    result = {
+        "total_return": ((cash - initial_capital) / initial_capital) * 100,
+        "win_rate": np.where(sells > 0, wins / np.maximum(sells, 1) * 100, 0.0),
+        "trades": trades,
+        "max_drawdown": max_drawdown,
+        "final_capital": cash,
+    }
+    if curves:
+        result.update({"position": position.copy(), "cash": daily_cash, "equity": equity})
+
+    # ffill 가정이 깨진 기준쌍은 루프 엔진 결과로 교체
+    for p in np.flatnonzero(fallback):
+        curve = np.empty(n) if curves else None
+        summary = backtest_summary(premiums, prices, buy_values[p], sell_values[p],
+                                   initial_capital, unit_type, equity_out=curve)
+        for key in ("total_return", "win_rate", "trades", "max_drawdown", "final_capital"):
+            result[key][p] = summary[key]
+        if curves:
+            result["equity"][p] = curve
+            result["position"][p], result["cash"][p] = _loop_position_cash(
+                premiums, prices, buy_values[p], sell_values[p], initial_capital, unit_type)
+
+    return result
+
+
+def _loop_position_cash(premiums, prices, buy_premium, sell_premium, initial_capital, unit_type):
+    """루프 엔진 규칙 그대로 일별 보유 여부/현금 계산 (fallback 기준쌍용)"""
+    import math
+
+    unit_multiplier = UNIT_MULTIPLIER.get(unit_type, 1)
+    n = len(prices)
+    position = np.zeros(n, dtype=bool)
+    daily_cash = np.empty(n)
+    cash = initial_capital
+    holdings = 0
+    for i, (premium, price) in enumerate(zip(np.asarray(premiums).tolist(),
+                                             np.asarray(prices).tolist())):
+        if premium <= buy_premium and holdings == 0 and cash > 0:
+            quantity = math.floor(cash / (price * unit_multiplier))
+            if quantity > 0:
+                holdings = quantity * unit_multiplier
+                cash -= quantity * (price * unit_multiplier)
+        elif premium >= sell_premium and holdings > 0:
+            cash += (holdings / unit_multiplier) * (price * unit_multiplier)
+            holdings = 0
+        position[i] = holdings > 0
+        daily_cash[i] = cash
+    return position, daily_cash
+
+
+def vector_grid(premiums, prices, buy_grid, sell_grid, initial_capital=10_000_000,
+                unit_type="1kg", batch_size=512, skip_invalid=True):
+    """
+    매수 기준 × 매도 기준 격자 전체를 배치 단위로 계산
+
+    skip_invalid=True면 HTML처럼 매수 기준 >= 매도 기준 칸은 계산하지 않고 NaN으로 둔다.
+
+    Returns:
+        dict: 각 통계의 (len(buy_grid) × len(sell_grid)) 2차원 배열
+    """
+    buy_grid = np.asarray(buy_grid, dtype=float)
+    sell_grid = np.asarray(sell_grid, dtype=float)
+    buys, sells = np.meshgrid(buy_grid, sell_grid, indexing="ij")
+    buys, sells = buys.ravel(), sells.ravel()
+    cells = np.flatnonzero(buys < sells) if skip_invalid else np.arange(len(buys))
+
+    keys = ("total_return", "win_rate", "trades", "max_drawdown", "final_capital")
+    out = {key: np.full(len(buys), np.nan) for key in keys}
+    for start in range(0, len(cells), batch_size):
+        batch = cells[start:start + batch_size]
+        part = vector_backtest(premiums, prices, buys[batch], sells[batch],
+                               initial_capital, unit_type, curves=False)
+        for key in keys:
+            out[key][batch] = part[key]
+
+    shape = (len(buy_grid), len(sell_grid))
+    return {key: value.reshape(shape) for key, value in out.items()}
+
+
+def compare_with_loop(premiums, prices, buy_values, sell_values, initial_capital=10_000_000,
+                      unit_type="1kg"):
+    """
+    벡터 커널과 루프 엔진(perform_backtest) 결과 비교
+
+    Returns:
+        list: 다른 기준쌍 설명 목록 (비어 있으면 일치)
+    """
+    from gold_backtest import perform_backtest
+
+    data = {"date": np.arange(len(prices)).astype("datetime64[D]"),
+            "domestic_price": np.asarray(prices, dtype=float),
+            "premium": np.asarray(premiums, dtype=float)}
+    result = vector_backtest(premiums, prices, buy_values, sell_values, initial_capital,
+                             unit_type, curves=True)
+
+    diffs = []
+    for p, (buy, sell) in enumerate(zip(np.atleast_1d(buy_values), np.atleast_1d(sell_values))):
+        expected = perform_backtest(data, buy, sell, initial_capital, unit_type)
+        checks = (
+            ("final_capital", result["final_capital"][p], expected["finalCapital"]),
+            ("trades", result["trades"][p], expected["totalTrades"]),
+            ("win_rate", result["win_rate"][p], expected["winRate"]),
+            ("total_return", result["total_return"][p], expected["totalReturn"]),
+        )
+        for key, actual, wanted in checks:
+            if actual != wanted:
+                diffs.append(f"({buy}, {sell}) {key}: vector={actual!r} loop={wanted!r}")
+    return diffs
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from gold_backtest import load_gold_data
+
+    parser = argparse.ArgumentParser(description="벡터화 백테스트 커널 검증/측정")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV (없으면 무작위 시계열)")
+    parser.add_argument("--days", type=int, default=2500, help="무작위 시계열 길이")
+    parser.add_argument("--grid", type=int, default=100, help="격자 한 변 크기")
+    parser.add_argument("--unit", choices=sorted(UNIT_MULTIPLIER), default="1kg")
+    args = parser.parse_args()
+
+    if args.csv:
+        data = load_gold_data(args.csv)
+        premiums, prices = data["premium"], data["domestic_price"]
+    else:
+        rng = np.random.default_rng(0)
+        premiums = np.round(4 + np.cumsum(rng.normal(0, 0.4, args.days)) % 8 - 2, 2)
+        prices = np.round(80000 + np.cumsum(rng.normal(0, 400, args.days)), 2)
+
+    low, high = float(np.min(premiums)), float(np.max(premiums))
+    buy_grid = np.round(np.linspace(low, high, args.grid), 2)
+    sell_grid = np.round(np.linspace(low, high, args.grid), 2)
+
+    print("=" * 60)
+    print(f"벡터화 커널: {len(premiums)}일, 격자 {args.grid}×{args.grid}")
+    print("=" * 60)
+
+    sample = np.random.default_rng(1).integers(0, args.grid, (2, 200))
+    diffs = compare_with_loop(premiums, prices, buy_grid[sample[0]], sell_grid[sample[1]],
+                              unit_type=args.unit)
+    print(f"루프 엔진 비교 (무작위 200쌍): {'✅ 일치' if not diffs else '❌ 불일치'}")
+    for line in diffs[:10]:
+        print(f"  {line}")
+
+    started = time.perf_counter()
+    vector_grid(premiums, prices, buy_grid, sell_grid, unit_type=args.unit)
+    vector_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for buy in buy_grid:
+        for sell in sell_grid[sell_grid > buy]:
+            backtest_summary(premiums, prices, buy, sell, 10_000_000, args.unit)
+    loop_elapsed = time.perf_counter() - started
+
+    print(f"벡터 커널: {vector_elapsed:.2f}초")
+    print(f"거래 단위 루프: {loop_elapsed:.2f}초")
+    raise SystemExit(1 if diffs else 0)
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 매매 기준 워크포워드 최적화
+
+전체 기간에서 고른 매수/매도 기준은 그 기간에 맞춰진 값이라 과최적화된다.
+학습 구간(예: 24개월)에서 기준 격자를 최적화하고 바로 뒤 검증 구간(예: 1개월)에서
+평가하는 창을 한 달씩 밀어 가며 반복하고, 검증 구간 자산을 이어 붙여 표본 외 성과를 낸다.
+
+- 창마다 학습 구간 최적화는 서로 독립이므로 프로세스 풀에서 나눠 돌린다
+- 프리미엄/가격 배열과 기준별 다음 신호 인덱스(next_signal_index)는 전체 기간에 대해
+  한 번만 계산해 공유 메모리에 올린다. 구간 [a, b)의 다음 신호 인덱스는 전체 배열을
+  잘라 b로 자른 값과 같으므로 창마다 다시 계산하지 않는다
+- 검증 구간은 앞 창의 최종 자산으로 이어서 시작한다 (창 시작일에는 미보유,
+  창 마지막 날 보유 중이면 청산 — backtest_summary 규칙 그대로)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from gold_backtest import backtest_summary, load_gold_data, next_signal_index
+from gold_sweep import frange
+from gold_vector import vector_grid
+
+WINDOW_COLUMNS = [
+    "train_start", "test_start", "test_end", "buy_premium", "sell_premium",
+    "train_return", "train_trades", "test_return", "test_trades", "capital",
+]
+
+# 워커 프로세스 전역 상태 (initializer에서 채움)
+_shm = None
+_premiums = None
+_prices = None
+_next_buy = None    # (매수 기준 수, n + 1) 전체 기간 다음 매수 신호 인덱스
+_next_sell = None   # (매도 기준 수, n + 1)
+
+
+def _attach_shared(name, n, buy_count, sell_count):
+    """공유 메모리에 올린 배열(프리미엄, 가격, 다음 신호 인덱스 표)을 붙여 쓴다"""
+    global _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    _use_arrays(*_shared_views(_shm.buf, n, buy_count, sell_count))
+
+
+def _use_arrays(premiums, prices, next_buy, next_sell):
+    """공유 메모리 없이 현재 프로세스 배열을 그대로 사용 (processes=1)"""
+    global _premiums, _prices, _next_buy, _next_sell
+    _premiums, _prices, _next_buy, _next_sell = premiums, prices, next_buy, next_sell
+
+
+def _shared_size(n, buy_count, sell_count):
+    return max(1, (2 * n + (buy_count + sell_count) * (n + 1)) * 8)
+
+
+def _shared_views(buf, n, buy_count, sell_count):
+    """공유 메모리 한 덩어리 → (premiums, prices, next_buy, next_sell) 배열"""
+    table = np.ndarray((2, n), dtype=np.float64, buffer=buf)
+    offset = 2 * n * 8
+    next_buy = np.ndarray((buy_count, n + 1), dtype=np.int64, buffer=buf, offset=offset)
+    offset += buy_count * (n + 1) * 8
+    next_sell = np.ndarray((sell_count, n + 1), dtype=np.int64, buffer=buf, offset=offset)
+    return table[0], table[1], next_buy, next_sell
+
+
+def slice_signal_index(full_index, start, end):
+    """
+    전체 기간 next_signal_index 결과 → 구간 [start, end)의 결과
+
+    next_signal_index(premiums[start:end], ...)와 같다 (길이 end - start + 1).
+    """
+    return np.minimum(full_index[start:end + 1], end) - start
+
+
+def make_windows(dates, train_months=24, test_months=1, anchored=False):
+    """
+    달력 월 기준 학습/검증 창
+
+    첫 달부터 train_months개월을 학습, 이어지는 test_months개월을 검증으로 하고
+    test_months씩 밀어 간다. anchored=True면 학습 구간 시작을 첫날로 고정(확장 창).
+    마지막 검증 구간은 데이터 끝에서 잘릴 수 있다.
+
+    Returns:
+        list: (학습 시작, 검증 시작, 검증 끝) 인덱스 튜플. 학습은 [학습 시작, 검증 시작),
+              검증은 [검증 시작, 검증 끝)
+    """
+    months = np.asarray(dates).astype("datetime64[M]")
+    n = len(months)
+    if n == 0:
+        return []
+
+    windows = []
+    test_month = months[0] + np.timedelta64(train_months, "M")
+    while True:
+        test_start = int(np.searchsorted(months, test_month, "left"))
+        if test_start >= n:
+            break
+        test_end = int(np.searchsorted(months, test_month + np.timedelta64(test_months, "M"), "left"))
+        train_month = months[0] if anchored else test_month - np.timedelta64(train_months, "M")
+        train_start = int(np.searchsorted(months, train_month, "left"))
+        if test_end > test_start and test_start > train_start:
+            windows.append((train_start, test_start, test_end))
+        test_month = test_month + np.timedelta64(test_months, "M")
+    return windows
+
+
+def _best_cell(buys, sells, stats, min_trades):
+    """수익률 ↓, 승률 ↓, 최대 낙폭 ↑, 격자 순서 (gold_sweep.rank_results와 같은 순서)"""
+    keep = np.flatnonzero(~np.isnan(stats["total_return"]) & (stats["trades"] >= min_trades))
+    if len(keep) == 0:
+        return None
+    order = np.lexsort((
+        keep,
+        stats["max_drawdown"][keep],
+        -stats["win_rate"][keep],
+        -stats["total_return"][keep],
+    ))
+    best = keep[order[0]]
+    return {
+        "buy_index": int(buys[best]), "sell_index": int(sells[best]),
+        "total_return": float(stats["total_return"][best]),
+        "trades": int(stats["trades"][best]),
+    }
+
+
+def _optimize_loop(start, end, buy_values, sell_values, capital, unit_type, skip_invalid):
+    premiums = _premiums[start:end]
+    prices = _prices[start:end]
+    buys, sells, cells = [], [], []
+    sell_slices = [slice_signal_index(_next_sell[s], start, end) for s in range(len(sell_values))]
+    for b, buy in enumerate(buy_values):
+        next_buy = slice_signal_index(_next_buy[b], start, end)
+        for s, sell in enumerate(sell_values):
+            if skip_invalid and buy >= sell:
+                continue
+            summary = backtest_summary(premiums, prices, buy, sell, capital, unit_type,
+                                       next_buy=next_buy, next_sell=sell_slices[s])
+            buys.append(b)
+            sells.append(s)
+            cells.append((summary["total_return"], summary["win_rate"], summary["trades"],
+                          summary["max_drawdown"]))
+
+    cells = np.array(cells, dtype=float).reshape(-1, 4)
+    stats = dict(zip(("total_return", "win_rate", "trades", "max_drawdown"), cells.T))
+    return np.array(buys), np.array(sells), stats
+
+
+def _optimize_vector(start, end, buy_values, sell_values, capital, unit_type, skip_invalid):
+    grid = vector_grid(_premiums[start:end], _prices[start:end], buy_values, sell_values,
+                       capital, unit_type, skip_invalid=skip_invalid)
+    buys, sells = np.meshgrid(np.arange(len(buy_values)), np.arange(len(sell_values)),
+                              indexing="ij")
+    stats = {key: grid[key].ravel() for key in ("total_return", "win_rate", "trades",
+                                                 "max_drawdown")}
+    return buys.ravel(), sells.ravel(), stats
+
+
+OPTIMIZERS = {"loop": _optimize_loop, "vector": _optimize_vector}
+
+
+def _optimize_window(window, buy_values, sell_values, capital, unit_type, kernel,
+                     skip_invalid, min_trades):
+    """학습 구간 하나의 격자 최적화 (워커에서 실행)"""
+    train_start, test_start, _ = window
+    buys, sells, stats = OPTIMIZERS[kernel](train_start, test_start, buy_values, sell_values,
+                                            capital, unit_type, skip_invalid)
+    return _best_cell(buys, sells, stats, min_trades)
+
+
+def run_walkforward(data, buy_values, sell_values, train_months=24, test_months=1,
+                    anchored=False, initial_capital=10_000_000, unit_type="1kg",
+                    processes=None, kernel="loop", skip_invalid=True, min_trades=1):
+    """
+    워크포워드 최적화
+
+    Args:
+        data: load_gold_data 결과
+        buy_values, sell_values: 매수/매도 기준 후보 (%)
+        train_months, test_months: 학습/검증 구간 길이 (개월)
+        anchored: 학습 구간 시작을 첫날로 고정
+        initial_capital: 초기 투자금. 학습 구간은 항상 이 금액으로 평가한다
+        processes: 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        kernel: 학습 구간 백테스트 커널 "loop" 또는 "vector"
+        min_trades: 학습 구간 거래 횟수가 이보다 적은 기준쌍은 고르지 않는다.
+                    고를 기준쌍이 없으면 그 검증 구간은 거래하지 않는다
+
+    Returns:
+        dict: windows(DataFrame, WINDOW_COLUMNS), equity(검증 구간 일별 자산 Series),
+              total_return, max_drawdown(%), trades, final_capital
+    """
+    dates = np.asarray(data["date"])
+    premiums = np.ascontiguousarray(data["premium"], dtype=np.float64)
+    prices = np.ascontiguousarray(data["domestic_price"], dtype=np.float64)
+    n = len(premiums)
+
+    buy_values = [float(b) for b in buy_values]
+    sell_values = [float(s) for s in sell_values]
+    windows = make_windows(dates, train_months, test_months, anchored)
+    processes = processes or os.cpu_count() or 1
+    optimize_args = (buy_values, sell_values, initial_capital, unit_type, kernel,
+                     skip_invalid, min_trades)
+
+    shm = shared_memory.SharedMemory(create=True,
+                                     size=_shared_size(n, len(buy_values), len(sell_values)))
+    try:
+        arrays = _shared_views(shm.buf, n, len(buy_values), len(sell_values))
+        arrays[0][:], arrays[1][:] = premiums, prices
+        for b, buy in enumerate(buy_values):
+            arrays[2][b] = next_signal_index(premiums, buy, "buy")
+        for s, sell in enumerate(sell_values):
+            arrays[3][s] = next_signal_index(premiums, sell, "sell")
+        next_buy, next_sell = arrays[2], arrays[3]
+
+        if processes <= 1 or len(windows) <= 1:
+            _use_arrays(*arrays)
+            best = [_optimize_window(window, *optimize_args) for window in windows]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach_shared,
+                                     initargs=(shm.name, n, len(buy_values),
+                                               len(sell_values))) as executor:
+                futures = [executor.submit(_optimize_window, window, *optimize_args)
+                           for window in windows]
+                best = [future.result() for future in futures]
+
+        # 검증 구간은 자산을 이어 가야 하므로 순서대로 (창마다 백테스트 한 번)
+        start = windows[0][1] if windows else n
+        equity = np.empty(n - start if windows else 0)
+        capital = initial_capital
+        trades = 0
+        rows = []
+        for (train_start, test_start, test_end), cell in zip(windows, best):
+            out = equity[test_start - start:test_end - start]
+            if cell is None:
+                buy = sell = train_return = np.nan
+                train_trades = test_trades = 0
+                test_return = 0.0
+                out[:] = capital
+            else:
+                buy = buy_values[cell["buy_index"]]
+                sell = sell_values[cell["sell_index"]]
+                train_return, train_trades = cell["total_return"], cell["trades"]
+                summary = backtest_summary(
+                    premiums[test_start:test_end], prices[test_start:test_end], buy, sell,
+                    capital, unit_type,
+                    next_buy=slice_signal_index(next_buy[cell["buy_index"]], test_start, test_end),
+                    next_sell=slice_signal_index(next_sell[cell["sell_index"]], test_start, test_end),
+                    equity_out=out,
+                )
+                test_return, test_trades = summary["total_return"], summary["trades"]
+                capital = summary["final_capital"]
+            trades += test_trades
+            rows.append((dates[train_start], dates[test_start], dates[test_end - 1], buy, sell,
+                         train_return, train_trades, test_return, test_trades, capital))
+        del arrays, next_buy, next_sell
+    finally:
+        _use_arrays(None, None, None, None)
+        shm.close()
+        shm.unlink()
+
+    max_drawdown = 0.0
+    if len(equity):
+        max_drawdown = float(np.max(1 - equity / np.maximum.accumulate(equity))) * 100
+
+    return {
+        "windows": pd.DataFrame(rows, columns=WINDOW_COLUMNS),
+        "equity": pd.Series(equity, index=pd.DatetimeIndex(dates[start:]), name="equity"),
+        "total_return": (capital - initial_capital) / initial_capital * 100,
+        "max_drawdown": max_drawdown,
+        "trades": trades,
+        "final_capital": capital,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="김치프리미엄 매매 기준 워크포워드 최적화")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db (기본: 가장 최근 CSV)")
+    parser.add_argument("--buy", default="-5,10,0.1", help="매수 기준 시작,끝,간격 (%%)")
+    parser.add_argument("--sell", default="0,15,0.1", help="매도 기준 시작,끝,간격 (%%)")
+    parser.add_argument("--train-months", type=int, default=24, help="학습 구간 (개월)")
+    parser.add_argument("--test-months", type=int, default=1, help="검증 구간 = 이동 간격 (개월)")
+    parser.add_argument("--anchored", action="store_true", help="학습 구간 시작을 첫날로 고정")
+    parser.add_argument("--unit", default="1kg", choices=["1kg", "1g"], help="거래 단위")
+    parser.add_argument("--capital", type=float, default=10_000_000, help="초기 투자금 (원)")
+    parser.add_argument("--min-trades", type=int, default=1, help="학습 구간 최소 거래 횟수")
+    parser.add_argument("--processes", type=int, default=None, help="워커 프로세스 수")
+    parser.add_argument("--kernel", choices=sorted(OPTIMIZERS), default="loop",
+                        help="학습 구간 백테스트 커널")
+    parser.add_argument("--output", help="창별 결과 CSV 저장 경로")
+    parser.add_argument("--equity", help="표본 외 일별 자산 CSV 저장 경로")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        candidates = glob.glob("gold_data_*.csv")
+        if not candidates:
+            parser.error("gold_data CSV 파일을 지정하세요")
+        csv_path = max(candidates, key=os.path.getmtime)
+
+    buy_values = frange(*[float(v) for v in args.buy.split(",")])
+    sell_values = frange(*[float(v) for v in args.sell.split(",")])
+    data = load_gold_data(csv_path)
+    windows = make_windows(data["date"], args.train_months, args.test_months, args.anchored)
+
+    print("=" * 60)
+    print("📈 워크포워드 최적화")
+    print("=" * 60)
+    print(f"데이터: {csv_path} ({len(data['date'])}일)")
+    print(f"창: 학습 {args.train_months}개월 / 검증 {args.test_months}개월"
+          f"{' (확장)' if args.anchored else ''} × {len(windows)}개")
+    print(f"격자: {len(buy_values)} × {len(sell_values)}")
+    if not windows:
+        print("❌ 학습 구간보다 데이터가 짧습니다")
+        raise SystemExit(1)
+
+    started = time.perf_counter()
+    result = run_walkforward(
+        data, buy_values, sell_values, args.train_months, args.test_months, args.anchored,
+        args.capital, args.unit, args.processes, args.kernel, min_trades=args.min_trades,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"✓ {elapsed:.2f}초")
+
+    table = result["windows"]
+    print()
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    equity = result["equity"]
+    print(f"\n표본 외 구간: {equity.index[0].date()} ~ {equity.index[-1].date()}")
+    print(f"  수익률: {result['total_return']:.2f}%")
+    print(f"  최대 낙폭: {result['max_drawdown']:.2f}%")
+    print(f"  거래 횟수: {result['trades']}")
+    print(f"  최종 자산: {result['final_capital']:,.0f}원")
+
+    if args.output:
+        table.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n✓ 창별 결과 저장: {args.output}")
+    if args.equity:
+        equity.to_frame().to_csv(args.equity, index_label="date", encoding="utf-8-sig")
+        print(f"✓ 표본 외 자산 저장: {args.equity}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 HTTP 클라이언트
+
+호스트별 requests.Session을 하나씩 만들어 재사용한다 (keep-alive 연결 풀).
+매 요청마다 TCP/TLS 연결을 새로 맺지 않으며, 일시적인 오류(500/502/504, 연결 실패)는
+어댑터 단계에서 지수 대기 후 재시도한다. 요청 제한 응답(429/503)은 재시도하지 않고
+그대로 돌려주어 rate_limit.AdaptiveLimiter가 속도를 낮추게 한다.
+"""
+
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ==================== 설정 영역 ====================
+POOL_SIZE = 16                  # 호스트당 유지할 최대 연결 수 (워커 수 이상 권장)
+RETRY_TOTAL = 3                 # 요청당 최대 재시도 횟수
+RETRY_BACKOFF = 0.5             # 재시도 대기 = RETRY_BACKOFF * 2^(n-1) 초
+RETRY_STATUS = (500, 502, 504)  # 429/503은 넣지 않는다: rate_limit 속도 조절 + schedule_fetches 재시도
+# ===================================================
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _make_session():
+    """연결 풀 + 재시도 어댑터가 달린 세션 생성"""
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "POST"}),  # KRX 조회는 POST지만 멱등
+        respect_retry_after_header=False,  # Retry-After(429/503)는 rate_limit이 처리
+        raise_on_status=False,  # 재시도 후에도 실패하면 응답을 그대로 돌려준다
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(url):
+    """url의 (scheme, host, port)에 해당하는 공용 세션"""
+    parsed = urlparse(url)
+    key = (parsed.scheme, parsed.netloc)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _make_session()
+            _sessions[key] = session
+        return session
+
+
+def get(url, **kwargs):
+    """requests.get 대신 사용 (공용 세션)"""
+    return get_session(url).get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """requests.post 대신 사용 (공용 세션)"""
+    return get_session(url).post(url, **kwargs)
+
+
+def configure(pool_size=None, retry_total=None, retry_backoff=None):
+    """
+    풀 크기/재시도 설정 변경
+
+    이미 만들어진 세션은 닫고, 다음 요청부터 새 설정으로 세션을 만든다.
+    """
+    global POOL_SIZE, RETRY_TOTAL, RETRY_BACKOFF
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    if retry_total is not None:
+        RETRY_TOTAL = retry_total
+    if retry_backoff is not None:
+        RETRY_BACKOFF = retry_backoff
+    close_all()
+
+
+def close_all():
+    """모든 공용 세션 종료"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
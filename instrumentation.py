@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 파이프라인 계측 (단계별 소요 시간 + 카운터)
+
+    with METRICS.timer("exim"):              # 호출 하나의 소요 시간 기록
+        response = ...
+    METRICS.count("exim", "bytes", len(response.content))
+    METRICS.count("exim", "cache_hits")
+
+이름은 호출 단위(exim, krx, yfinance)와 단계 단위(exim_batch, krx_batch, build,
+save_csv, save_dataset, save_store, save_archive)를 같은 방식으로 기록한다.
+카운터는 bytes, cache_hits, retries(스케줄러 재요청), transport_retries(HTTP 어댑터
+재시도), responses_{상태}(rate_limit 상태별 응답 수).
+
+이름별 횟수/합계/최대/히스토그램은 누적값으로, 분위수용 소요 시간은 최대 SAMPLE_LIMIT개
+표본(저수지 표본 추출)으로만 보관하므로 오래 도는 데몬(premium_monitor)에서도 메모리가
+늘지 않는다. 호출 수가 SAMPLE_LIMIT 이하면 분위수도 정확하다.
+
+report()는 이름별 횟수/합계/p50/p95/p99/히스토그램을 담은 실행 보고서(JSON),
+prometheus_text()는 Prometheus 텍스트 형식이다. serve(port)로 127.0.0.1:port/metrics에
+노출할 수 있다.
+
+    python instrumentation.py gold_data_2024-01-01_2025-01-01.metrics.json
+    python instrumentation.py report.json --prometheus
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PREFIX = "gold_collect"
+SAMPLE_LIMIT = 10_000   # 이름별로 보관하는 소요 시간 표본 수
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 q 분위수 (0~100, 선형 보간 = numpy 기본값과 같음)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lo = math.floor(position)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (position - lo)
+
+
+class _Timing:
+    """이름 하나의 소요 시간 집계 (횟수/합계/최대/구간별 개수 + 표본)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)   # 구간별 개수 (누적 아님)
+        self.samples = []
+
+    def add(self, seconds, limit, rng):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            self.buckets[index] += 1
+        if len(self.samples) < limit:
+            self.samples.append(seconds)
+        else:
+            # 저수지 표본 추출: 지금까지의 모든 값이 같은 확률로 표본에 남는다
+            slot = rng.randrange(self.count)
+            if slot < limit:
+                self.samples[slot] = seconds
+
+
+class Metrics:
+    """스레드 안전 소요 시간/카운터 집계기 (프로세스에 하나, METRICS)"""
+
+    def __init__(self, sample_limit=SAMPLE_LIMIT):
+        self.lock = threading.Lock()
+        self.sample_limit = sample_limit
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.timings = {}    # 이름 → _Timing
+            self.counters = {}   # (이름, 카운터) → 값
+            self.rng = random.Random(0)
+            self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    def observe(self, name, seconds):
+        with self.lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                timing = self.timings[name] = _Timing()
+            timing.add(seconds, self.sample_limit, self.rng)
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def count(self, name, counter, value=1):
+        with self.lock:
+            key = (name, counter)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def report(self):
+        """
+        실행 보고서
+
+        Returns:
+            dict: started_at, finished_at, timings {이름: {count, total, mean, p50, p95, p99,
+                  max, buckets}}, counters {이름: {카운터: 값}}
+        """
+        with self.lock:
+            collected = {
+                name: (t.count, t.total, t.max, list(t.buckets), sorted(t.samples))
+                for name, t in self.timings.items()
+            }
+            counters = dict(self.counters)
+
+        timings = {}
+        for name, (count, total, longest, per_bucket, values) in sorted(collected.items()):
+            buckets = {}
+            cumulative = 0
+            for bound, n in zip(BUCKETS, per_bucket):
+                cumulative += n
+                buckets[str(bound)] = cumulative
+            timings[name] = {
+                "count": count,
+                "total": total,
+                "mean": total / count,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": longest,
+                "buckets": buckets,
+            }
+
+        grouped = {}
+        for (name, counter), value in sorted(counters.items()):
+            grouped.setdefault(name, {})[counter] = value
+
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "timings": timings,
+            "counters": grouped,
+        }
+
+    def write_report(self, path, **extra):
+        """실행 보고서를 JSON 파일로 저장 (extra는 최상위 키로 추가)"""
+        report = self.report()
+        report.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def prometheus_text(self):
+        return prometheus_text(self.report())
+
+
+def prometheus_text(report):
+    """실행 보고서 → Prometheus 텍스트 형식"""
+    lines = [
+        f"# HELP {PREFIX}_seconds 호출/단계별 소요 시간",
+        f"# TYPE {PREFIX}_seconds histogram",
+    ]
+    for name, timing in report["timings"].items():
+        for bound, count in timing["buckets"].items():
+            lines.append(f'{PREFIX}_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+        lines.append(f'{PREFIX}_seconds_bucket{{stage="{name}",le="+Inf"}} {timing["count"]}')
+        lines.append(f'{PREFIX}_seconds_sum{{stage="{name}"}} {timing["total"]:.6f}')
+        lines.append(f'{PREFIX}_seconds_count{{stage="{name}"}} {timing["count"]}')
+
+    counter_names = sorted({c for values in report["counters"].values() for c in values})
+    for counter in counter_names:
+        lines.append(f"# TYPE {PREFIX}_{counter}_total counter")
+        for name, values in report["counters"].items():
+            if counter in values:
+                lines.append(f'{PREFIX}_{counter}_total{{stage="{name}"}} {values[counter]}')
+    return "\n".join(lines) + "\n"
+
+
+def print_report(report):
+    """실행 보고서 요약 표 출력"""
+    print(f"{'이름':14s} {'횟수':>6s} {'합계(초)':>9s} {'p50(ms)':>9s} {'p95(ms)':>9s} "
+          f"{'p99(ms)':>9s}")
+    for name, t in report["timings"].items():
+        print(f"{name:14s} {t['count']:6d} {t['total']:9.2f} {t['p50'] * 1000:9.1f} "
+              f"{t['p95'] * 1000:9.1f} {t['p99'] * 1000:9.1f}")
+    for name, values in report["counters"].items():
+        shown = ", ".join(f"{counter} {value:,}" for counter, value in values.items())
+        print(f"  {name}: {shown}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, metrics=None, host="127.0.0.1"):
+    """
+    http://host:port/metrics 에 Prometheus 텍스트 노출 (백그라운드 스레드)
+
+    Returns:
+        ThreadingHTTPServer: 끝낼 때 shutdown()
+    """
+    handler = type("Handler", (_MetricsHandler,), {"metrics": metrics or METRICS})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+METRICS = Metrics()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="수집 실행 보고서 보기")
+    parser.add_argument("report", help="*.metrics.json")
+    parser.add_argument("--prometheus", action="store_true", help="Prometheus 텍스트로 출력")
+    args = parser.parse_args()
+
+    with open(args.report, encoding="utf-8") as f:
+        loaded = json.load(f)
+
+    if args.prometheus:
+        print(prometheus_text(loaded), end="")
+    else:
+        print(f"실행: {loaded['started_at']} ~ {loaded['finished_at']}")
+        print_report(loaded)
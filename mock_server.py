@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수출입은행 환율 / KRX 금시장 API 모의 서버 (로컬 벤치마크용)
+
+실제 API와 같은 경로와 응답 형식을 흉내내며, 요청마다 지정한 지연을 준다.
+max_rate를 주면 경로별로 초당 요청 수가 넘을 때 429(Retry-After)로 응답하고,
+exim_quota를 주면 그 횟수를 넘긴 환율 요청에 일일 한도 마감(result 4)으로 응답한다.
+error_rate를 주면 그 비율의 요청에 500으로 응답한다 (seed로 재현 가능).
+
+fixture_dir를 주면 만든 값 대신 기록된 응답을 돌려준다
+(async_collector와 같은 {exim,krx}/YYYYMMDD.json 배치, 기록이 없는 날은 휴장일처럼 빈 응답).
+"""
+
+import json
+import os
+import random
+import socket
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+EXIM_PATH = "/site/program/financial/exchangeJSON"
+KRX_PATH = "/svc/apis/gen/gold_bydd_trd"
+
+
+def mock_exchange_rate(date_str):
+    """날짜별로 항상 같은 값을 주는 가짜 USD/KRW 환율"""
+    return 1200 + zlib.crc32(date_str.encode()) % 20000 / 100
+
+
+def mock_krx_close(date_str):
+    """날짜별로 항상 같은 값을 주는 가짜 KRX 금 1kg 종가 (원/g 기준)"""
+    return 80000 + zlib.crc32(("krx" + date_str).encode()) % 2000000 / 100
+
+
+def exim_payload(date_str):
+    """수출입은행 exchangeJSON 형식 응답"""
+    return [
+        {"result": 1, "cur_unit": "JPY(100)", "deal_bas_r": "905.12"},
+        {"result": 1, "cur_unit": "USD", "deal_bas_r": f"{mock_exchange_rate(date_str):,.2f}"},
+    ]
+
+
+def krx_payload(date_str):
+    """KRX gold_bydd_trd 형식 응답"""
+    close_g = mock_krx_close(date_str)
+    volume = 10000 + zlib.crc32(("vol" + date_str).encode()) % 90000
+    return {
+        "OutBlock_1": [
+            {"BAS_DD": date_str, "ISU_NM": "금 99.99_1kg", "TDD_CLSPRC": f"{close_g:.0f}",
+             "ACC_TRDVOL": f"{volume:,}"},
+            {"BAS_DD": date_str, "ISU_NM": "미니금 99.99_100g", "TDD_CLSPRC": f"{close_g:.0f}",
+             "ACC_TRDVOL": f"{volume // 50:,}"},
+        ]
+    }
+
+
+def read_fixture(fixture_dir, provider, date_str):
+    """기록된 응답 (없으면 None)"""
+    path = os.path.join(fixture_dir, provider, date_str + ".json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """EXIM(GET) / KRX(POST) 요청 처리"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용 허용
+    latency = 0.0  # 요청당 지연 (초)
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문이 따로 전송되므로 Nagle 지연(~40ms)을 끈다
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _throttled(self, path):
+        """경로별 초당 요청 수 초과면 429 응답 후 True"""
+        if self.server.throttle(path):
+            self._send_json({"error": "too many requests"}, status=429,
+                            headers={"Retry-After": "1"})
+            return True
+        return False
+
+    def _failed(self):
+        """오류 주입 대상이면 500 응답 후 True"""
+        if self.server.inject_error():
+            self._send_json({"error": "injected"}, status=500)
+            return True
+        return False
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != EXIM_PATH:
+            self._send_json({"error": "not found"}, status=404)
+            return
+        if self._throttled(EXIM_PATH):
+            return
+        time.sleep(self.latency)
+        if self._failed():
+            return
+        if self.server.over_quota():
+            self._send_json([{"result": 4}])
+            return
+        date_str = parse_qs(parsed.query).get("searchdate", [""])[0]
+        if self.server.fixture_dir:
+            payload = read_fixture(self.server.fixture_dir, "exim", date_str)
+            self._send_json(payload if payload is not None else [])
+            return
+        self._send_json(exim_payload(date_str))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if urlparse(self.path).path != KRX_PATH:
+            self._send_json({"error": "not found"}, status=404)
+            return
+        if self._throttled(KRX_PATH):
+            return
+        time.sleep(self.latency)
+        if self._failed():
+            return
+        date_str = body.get("basDd", "")
+        if self.server.fixture_dir:
+            payload = read_fixture(self.server.fixture_dir, "krx", date_str)
+            self._send_json(payload if payload is not None else {"OutBlock_1": []})
+            return
+        self._send_json(krx_payload(date_str))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 128  # 동시 접속이 몰려도 SYN 재전송이 나지 않도록
+    max_rate = None    # 경로별 초당 허용 요청 수 (None이면 제한 없음)
+    exim_quota = None  # 환율 요청 허용 횟수 (None이면 제한 없음)
+    error_rate = 0.0   # 500으로 응답할 요청 비율
+    fixture_dir = None
+
+    def inject_error(self):
+        if not self.error_rate:
+            return False
+        with self.stats_lock:
+            if self.rng.random() < self.error_rate:
+                self.errors += 1
+                return True
+            return False
+
+    def throttle(self, path):
+        """경로별 토큰 버킷 (용량 = 초당 허용 수). 토큰이 없으면 True"""
+        if not self.max_rate:
+            return False
+        with self.stats_lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(path, (self.max_rate, now))
+            tokens = min(self.max_rate, tokens + (now - updated) * self.max_rate)
+            if tokens < 1:
+                self.buckets[path] = (tokens, now)
+                self.throttled += 1
+                return True
+            self.buckets[path] = (tokens - 1, now)
+            return False
+
+    def over_quota(self):
+        with self.stats_lock:
+            self.exim_requests += 1
+            return self.exim_quota is not None and self.exim_requests > self.exim_quota
+
+
+class MockApiServer:
+    """
+    백그라운드 스레드에서 도는 모의 API 서버
+
+    with MockApiServer(latency=0.05) as server:
+        server.exim_url, server.krx_url
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, max_rate=None, exim_quota=None,
+                 error_rate=0.0, seed=0, fixture_dir=None):
+        handler = type("Handler", (MockApiHandler,), {"latency": latency})
+        self.httpd = _Server((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.stats_lock = threading.Lock()
+        self.httpd.connections = 0  # 지금까지 받은 TCP 연결 수
+        self.httpd.max_rate = max_rate
+        self.httpd.exim_quota = exim_quota
+        self.httpd.buckets = {}
+        self.httpd.throttled = 0     # 429로 응답한 요청 수
+        self.httpd.exim_requests = 0
+        self.httpd.error_rate = error_rate
+        self.httpd.rng = random.Random(seed)
+        self.httpd.errors = 0        # 오류를 주입한 요청 수
+        self.httpd.fixture_dir = fixture_dir
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    @property
+    def throttled(self):
+        return self.httpd.throttled
+
+    @property
+    def errors(self):
+        return self.httpd.errors
+
+    @property
+    def exim_url(self):
+        return self.base_url + EXIM_PATH
+
+    @property
+    def krx_url(self):
+        return self.base_url + KRX_PATH
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="EXIM/KRX 모의 API 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 지연(초)")
+    parser.add_argument("--max-rate", type=float, help="경로별 초당 허용 요청 수 (넘으면 429)")
+    parser.add_argument("--exim-quota", type=int, help="환율 요청 허용 횟수 (넘으면 result 4)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500으로 응답할 요청 비율")
+    parser.add_argument("--fixtures", help="기록된 응답 디렉터리 ({exim,krx}/YYYYMMDD.json)")
+    args = parser.parse_args()
+
+    server = MockApiServer(port=args.port, latency=args.latency,
+                           max_rate=args.max_rate, exim_quota=args.exim_quota,
+                           error_rate=args.error_rate, fixture_dir=args.fixtures)
+    print(f"모의 서버 실행: {server.base_url} (지연 {args.latency * 1000:.0f}ms)")
+    print(f"  EXIM: {server.exim_url}")
+    print(f"  KRX:  {server.krx_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 실시간 감시 데몬 (asyncio)
+
+입력 세 가지를 각자 주기로 조회하고, 값이 하나 바뀔 때마다 마지막 값들로
+calculate_kimchi_premium을 다시 계산한다. 프리미엄이 매수 기준 이하/매도 기준 이상
+구간으로 넘어가면 알림을 싱크(출력/파일/소켓/웹훅)로 보낸다.
+
+    gold  Yahoo Finance GC=F 최근 1분봉 종가 (USD/oz)
+    fx    한국수출입은행 USD 매매기준율 (오늘 고시 전이면 가장 최근 고시)
+    krx   KRX 금 종가 (원/g, 가장 최근 거래일)
+
+조회 함수는 동기 수집 코드(collect_gold_data_final)를 그대로 쓰고 asyncio.to_thread로
+돌려 이벤트 루프를 막지 않는다 (속도 조절/응답 캐시/계측도 그대로 적용).
+입력/알림 대기열과 프리미엄 기록은 길이가 정해져 있어 오래 돌려도 메모리가 늘지 않는다.
+
+입력 틱은 --record로 JSONL에 기록해 두었다가 --replay로 다시 흘려 볼 수 있다.
+gold_data CSV를 --replay에 주면 하루를 fx → krx → gold 틱 세 개로 바꿔 재생한다.
+--speed 86400이면 하루가 1초, 0이면 기다리지 않고 바로 재생한다.
+
+    python premium_monitor.py --buy 0.5 --sell 3.0 --sink file:alerts.jsonl
+    python premium_monitor.py --replay gold_data_2024-01-01_2026-02-05.csv --speed 0
+"""
+
+import asyncio
+import json
+import signal
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import collect_gold_data_final as collector
+import http_client
+
+# ==================== 설정 영역 ====================
+GOLD_TICKER = "GC=F"
+POLL_INTERVALS = {"gold": 60, "fx": 600, "krx": 600}   # 입력별 조회 주기 (초)
+LOOKBACK_DAYS = 7          # 오늘 값이 없을 때 거슬러 올라가 찾는 날 수
+BUY_THRESHOLD = 0.5        # 프리미엄이 이 값 이하로 내려가면 매수 구간 (%)
+SELL_THRESHOLD = 3.0       # 프리미엄이 이 값 이상으로 올라가면 매도 구간 (%)
+TICK_QUEUE_SIZE = 1000     # 입력 틱 대기열 길이 (가득 차면 조회 쪽이 기다린다)
+ALERT_QUEUE_SIZE = 100     # 알림 대기열 길이 (가득 차면 가장 오래된 알림을 버린다)
+HISTORY_SIZE = 1440        # 메모리에 남기는 최근 프리미엄 수
+# 재생 때 하루 틱의 시각 (fx는 오전 고시, krx는 장 마감, gold는 그 뒤)
+REPLAY_TIMES = (("fx", "11:00:00", "exchange_rate"),
+                ("krx", "15:30:00", "domestic_price"),
+                ("gold", "16:00:00", "international_price"))
+# ===================================================
+
+SOURCES = ("gold", "fx", "krx")
+
+
+def make_tick(source, value, as_of, at=None):
+    """입력 틱: 받은 시각, 입력 이름, 값, 값의 기준일(YYYYMMDD)"""
+    return {
+        "time": at or datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "value": float(value),
+        "as_of": as_of,
+    }
+
+
+class PremiumMonitor:
+    """입력별 마지막 값으로 프리미엄을 갱신하고 기준 구간이 바뀌면 알림을 만든다"""
+
+    def __init__(self, buy_threshold=BUY_THRESHOLD, sell_threshold=SELL_THRESHOLD,
+                 history_size=HISTORY_SIZE):
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+        self.latest = {}                          # 입력 이름 → 마지막 틱
+        self.history = deque(maxlen=history_size)  # (시각, 프리미엄)
+        self.premium = None
+        self.zone = None                          # "buy" / "hold" / "sell"
+        self.ticks = 0
+        self.updates = 0
+        self.alerts = 0
+
+    def zone_of(self, premium):
+        if premium <= self.buy_threshold:
+            return "buy"
+        if premium >= self.sell_threshold:
+            return "sell"
+        return "hold"
+
+    def on_tick(self, tick):
+        """
+        입력 틱 반영
+
+        Returns:
+            dict: 구간이 바뀌었으면 알림, 아니면 None
+        """
+        self.ticks += 1
+        previous = self.latest.get(tick["source"])
+        self.latest[tick["source"]] = tick
+        if previous is not None and previous["value"] == tick["value"]:
+            return None
+        if len(self.latest) < len(SOURCES):
+            return None
+
+        premium = collector.calculate_kimchi_premium(
+            self.latest["krx"]["value"], self.latest["gold"]["value"], self.latest["fx"]["value"],
+        )
+        self.premium = premium
+        self.history.append((tick["time"], premium))
+        self.updates += 1
+
+        zone = self.zone_of(premium)
+        previous_zone, self.zone = self.zone, zone
+        if zone == previous_zone or (previous_zone is None and zone == "hold"):
+            return None
+
+        self.alerts += 1
+        return {
+            "time": tick["time"],
+            "zone": zone,
+            "previous": previous_zone,
+            "premium": premium,
+            "buy_threshold": self.buy_threshold,
+            "sell_threshold": self.sell_threshold,
+            "inputs": {name: {"value": self.latest[name]["value"], "as_of": self.latest[name]["as_of"]}
+                       for name in SOURCES},
+        }
+
+
+# ==================== 알림 싱크 ====================
+
+class PrintSink:
+    LABELS = {"buy": "🟢 매수 구간", "sell": "🔴 매도 구간", "hold": "⚪ 관망 구간"}
+
+    async def send(self, alert):
+        print(f"  {alert['time']} {self.LABELS[alert['zone']]} 진입: 프리미엄 {alert['premium']:.2f}%")
+
+    async def close(self):
+        pass
+
+
+class FileSink:
+    """알림을 JSONL 파일에 한 줄씩 덧붙인다"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _append(self, line):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def send(self, alert):
+        await asyncio.to_thread(self._append, json.dumps(alert, ensure_ascii=False))
+
+    async def close(self):
+        pass
+
+
+class SocketSink:
+    """알림을 TCP 소켓으로 한 줄씩 보낸다 (끊기면 다음 알림 때 다시 연결)"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = int(port)
+        self.writer = None
+
+    async def send(self, alert):
+        line = (json.dumps(alert, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            if self.writer is None:
+                _, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(line)
+            await self.writer.drain()
+        except OSError as e:
+            print(f"  ⚠️  소켓 싱크 {self.host}:{self.port} 전송 실패: {e}")
+            await self.close()
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+
+class WebhookSink:
+    """알림을 JSON으로 POST (응답 본문은 보지 않는다)"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, alert):
+        try:
+            response = await asyncio.to_thread(http_client.post, self.url, json=alert,
+                                               timeout=self.timeout)
+            if response.status_code >= 400:
+                print(f"  ⚠️  웹훅 응답 {response.status_code}: {self.url}")
+        except Exception as e:
+            print(f"  ⚠️  웹훅 전송 실패: {e}")
+
+    async def close(self):
+        pass
+
+
+def make_sink(spec):
+    """'print', 'file:경로', 'tcp:호스트:포트', 'http(s)://...' → 싱크"""
+    if spec == "print":
+        return PrintSink()
+    if spec.startswith("file:"):
+        return FileSink(spec[5:])
+    if spec.startswith("tcp:"):
+        host, port = spec[4:].rsplit(":", 1)
+        return SocketSink(host, port)
+    if spec.startswith(("http://", "https://")):
+        return WebhookSink(spec)
+    raise ValueError(f"알 수 없는 싱크: {spec}")
+
+
+# ==================== 입력 ====================
+
+def fetch_gold_quote():
+    """GC=F 최근 1분봉 종가 → (기준일, USD/oz), 없으면 None"""
+    import yfinance as yf
+
+    history = yf.Ticker(GOLD_TICKER).history(period="1d", interval="1m")
+    if len(history) == 0:
+        return None
+    return history.index[-1].strftime("%Y%m%d"), float(history["Close"].iloc[-1])
+
+
+def fetch_fx_rate(auth_key, lookback=LOOKBACK_DAYS):
+    """가장 최근 고시 USD 매매기준율 → (고시일, 원), 없으면 None"""
+    day = datetime.now()
+    for _ in range(lookback):
+        # 일일 한도 초과면 자정에 풀릴 때까지 요청하지 않는다
+        if collector.EXIM_LIMITER.blocked:
+            return None
+        date_api = day.strftime("%Y%m%d")
+        rate = collector.get_exchange_rate(auth_key, date_api)
+        if rate:
+            return date_api, rate
+        day -= timedelta(days=1)
+    return None
+
+
+def fetch_krx_close(auth_key, lookback=LOOKBACK_DAYS):
+    """가장 최근 거래일 KRX 금 종가 → (거래일, 원/g), 없으면 None"""
+    date_api = datetime.now().strftime("%Y%m%d")
+    if not collector.is_krx_trading_day(date_api):
+        date_api = collector.previous_krx_trading_day(date_api)
+    for _ in range(lookback):
+        if collector.KRX_LIMITER.blocked:
+            return None
+        price = collector.get_krx_gold_price(auth_key, date_api)
+        if price:
+            return date_api, price
+        date_api = collector.previous_krx_trading_day(date_api)
+    return None
+
+
+async def poll_source(source, fetch, interval, ticks, stop):
+    """fetch를 interval초마다 스레드에서 실행해 결과를 틱으로 넣는다"""
+    while not stop.is_set():
+        try:
+            result = await asyncio.to_thread(fetch)
+        except Exception as e:
+            print(f"  ⚠️  {source} 조회 실패: {e}")
+            result = None
+        if result is not None:
+            as_of, value = result
+            await ticks.put(make_tick(source, value, as_of))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def live_sources(exim_key, krx_key, intervals=None):
+    """실시간 입력 목록: (이름, 코루틴 함수(ticks, stop))"""
+    intervals = {**POLL_INTERVALS, **(intervals or {})}
+    fetchers = {
+        "gold": fetch_gold_quote,
+        "fx": lambda: fetch_fx_rate(exim_key),
+        "krx": lambda: fetch_krx_close(krx_key),
+    }
+    return [
+        (name, lambda ticks, stop, name=name: poll_source(name, fetchers[name], intervals[name],
+                                                          ticks, stop))
+        for name in SOURCES
+    ]
+
+
+def load_ticks(path):
+    """
+    재생할 틱 목록 (시각 순)
+
+    .jsonl은 --record로 기록한 틱, 그 밖(gold_data CSV/데이터셋/.db)은 하루를
+    REPLAY_TIMES의 틱 세 개로 바꾼다.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            ticks = [json.loads(line) for line in f if line.strip()]
+        return sorted(ticks, key=lambda tick: tick["time"])
+
+    import numpy as np
+
+    from gold_backtest import load_gold_data
+
+    data = load_gold_data(path)
+    ticks = []
+    for i, day in enumerate(np.datetime_as_string(data["date"])):
+        as_of = day.replace("-", "")
+        for source, clock, column in REPLAY_TIMES:
+            value = data[column][i]
+            if np.isfinite(value):
+                ticks.append(make_tick(source, value, as_of, f"{day}T{clock}"))
+    return ticks
+
+
+async def replay_source(ticks_list, ticks, stop, speed=0):
+    """기록된 틱을 시각 간격 / speed만큼 기다리며 넣는다 (speed=0이면 기다리지 않음)"""
+    previous = None
+    for tick in ticks_list:
+        if stop.is_set():
+            return
+        at = datetime.fromisoformat(tick["time"])
+        if speed and previous is not None:
+            delay = (at - previous).total_seconds() / speed
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+        previous = at
+        await ticks.put(tick)
+
+
+# ==================== 실행 ====================
+
+async def deliver_alerts(alerts, sinks):
+    while True:
+        alert = await alerts.get()
+        if alert is None:
+            return
+        for sink in sinks:
+            await sink.send(alert)
+
+
+async def run_monitor(monitor, sources, sinks, duration=None, record=None,
+                      tick_queue_size=TICK_QUEUE_SIZE, alert_queue_size=ALERT_QUEUE_SIZE):
+    """
+    입력을 모두 돌리며 틱을 monitor에 넣고 알림을 싱크로 보낸다
+
+    입력이 모두 끝나거나(재생), duration초가 지나거나, SIGINT/SIGTERM을 받으면 끝난다.
+
+    Args:
+        sources: (이름, 코루틴 함수(ticks, stop)) 목록
+        record: 경로를 주면 받은 틱을 JSONL로 덧붙인다 (나중에 --replay)
+
+    Returns:
+        dict: ticks, updates, alerts, dropped_alerts, premium, zone, elapsed
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass   # Windows/메인 스레드가 아닌 경우
+
+    ticks = asyncio.Queue(maxsize=tick_queue_size)
+    alerts = asyncio.Queue(maxsize=alert_queue_size)
+    dropped = 0
+
+    async def run_source(name, source):
+        try:
+            await source(ticks, stop)
+        except Exception as e:
+            print(f"  ❌ 입력 {name} 중단: {e}")
+        await ticks.put(None)   # 입력 하나가 끝났다는 표시 (취소되면 넣지 않는다)
+
+    started = time.perf_counter()
+    producers = [asyncio.create_task(run_source(name, source)) for name, source in sources]
+    delivery = asyncio.create_task(deliver_alerts(alerts, sinks))
+    timer = loop.call_later(duration, stop.set) if duration else None
+    recorder = open(record, "a", encoding="utf-8") if record else None
+
+    try:
+        finished = 0
+        while finished < len(producers):
+            tick = await ticks.get()
+            if tick is None:
+                finished += 1
+                continue
+            if recorder is not None:
+                recorder.write(json.dumps(tick, ensure_ascii=False) + "\n")
+            alert = monitor.on_tick(tick)
+            if alert is None:
+                continue
+            if alerts.full():
+                alerts.get_nowait()
+                dropped += 1
+            alerts.put_nowait(alert)
+    finally:
+        stop.set()
+        if timer is not None:
+            timer.cancel()
+        for task in producers:
+            task.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        if recorder is not None:
+            recorder.close()
+        await alerts.put(None)
+        await delivery
+        for sink in sinks:
+            await sink.close()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.remove_signal_handler(signum)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    return {
+        "ticks": monitor.ticks,
+        "updates": monitor.updates,
+        "alerts": monitor.alerts,
+        "dropped_alerts": dropped,
+        "premium": monitor.premium,
+        "zone": monitor.zone,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="김치프리미엄 실시간 감시")
+    parser.add_argument("--buy", type=float, default=BUY_THRESHOLD, help="매수 기준 (%%)")
+    parser.add_argument("--sell", type=float, default=SELL_THRESHOLD, help="매도 기준 (%%)")
+    parser.add_argument("--sink", action="append",
+                        help="알림 싱크: print, file:경로, tcp:호스트:포트, http(s)://... (여러 번 지정 가능)")
+    parser.add_argument("--replay", help="틱 JSONL 또는 gold_data CSV를 재생 (실제 API 호출 없음)")
+    parser.add_argument("--speed", type=float, default=0, help="재생 배속 (86400 = 하루 1초, 0 = 즉시)")
+    parser.add_argument("--record", help="받은 틱을 JSONL로 기록")
+    parser.add_argument("--duration", type=float, help="실행 시간 (초, 기본: 종료 신호까지)")
+    for name in SOURCES:
+        parser.add_argument(f"--{name}-interval", type=float, default=POLL_INTERVALS[name],
+                            help=f"{name} 조회 주기 (초)")
+    args = parser.parse_args()
+
+    monitor = PremiumMonitor(args.buy, args.sell)
+    sinks = [make_sink(spec) for spec in (args.sink or ["print"])]
+
+    print("=" * 60)
+    print("📡 김치프리미엄 감시")
+    print("=" * 60)
+    print(f"기준: 매수 {args.buy}% 이하 / 매도 {args.sell}% 이상")
+    if args.replay:
+        ticks_list = load_ticks(args.replay)
+        print(f"재생: {args.replay} ({len(ticks_list):,}틱, {args.speed or '즉시'}배속)")
+        sources = [("replay", lambda ticks, stop: replay_source(ticks_list, ticks, stop, args.speed))]
+    else:
+        intervals = {name: getattr(args, f"{name}_interval") for name in SOURCES}
+        print("조회 주기: " + ", ".join(f"{name} {seconds:g}초" for name, seconds in intervals.items()))
+        sources = live_sources(collector.EXIM_API_KEY, collector.KRX_API_KEY, intervals)
+
+    summary = asyncio.run(run_monitor(monitor, sources, sinks, args.duration, args.record))
+    print(f"\n✓ 틱 {summary['ticks']:,}개, 프리미엄 갱신 {summary['updates']:,}회, "
+          f"알림 {summary['alerts']:,}개 ({summary['elapsed']:.2f}초)")
+    if summary["dropped_alerts"]:
+        print(f"⚠️  알림 대기열이 가득 차 {summary['dropped_alerts']}개를 버렸습니다")
+    if summary["premium"] is not None:
+        print(f"마지막 프리미엄: {summary['premium']:.2f}% ({summary['zone']})")
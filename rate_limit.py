@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+제공자별 요청 속도 조절 + 실패 날짜 재시도 스케줄러
+
+TokenBucket
+    초당 rate개 토큰을 채우고 최대 burst개까지 모아 둔다. 요청 하나에 토큰 하나.
+AdaptiveLimiter
+    토큰 버킷의 속도를 응답에 맞춰 조절한다. 정상 응답마다 속도를 조금씩 올리고
+    (가산 증가), 요청 제한 응답(429/503, 수출입은행 RESULT 오류)을 받으면 절반으로
+    내린 뒤 잠시 모든 요청을 멈춘다(승산 감소). 일일 한도 초과/인증 오류를 받으면
+    그 제공자는 차단 상태가 되어 더 요청하지 않는다.
+schedule_fetches / schedule_fetches_async
+    날짜 목록을 워커 풀(또는 코루틴)로 조회하면서, 실패한 날짜는 버리지 않고
+    지수 대기 + 지터 뒤에 대기열에 다시 넣는다.
+
+조회 함수는 (상태, 응답)을 돌려주고, 요청을 보낸 직후 limiter.record(상태)로
+결과를 알린다 (캐시 적중은 알리지 않는다).
+"""
+
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from instrumentation import METRICS
+
+# 응답 상태
+OK = "ok"                 # 정상 응답 (데이터가 없는 날 포함)
+THROTTLED = "throttled"   # 요청 제한: 속도를 낮추고 재시도
+QUOTA = "quota"           # 일일 한도 초과: 오늘은 더 요청하지 않음
+AUTH = "auth"             # 인증키 오류: 더 요청하지 않음
+ERROR = "error"           # 연결 실패/5xx/형식 오류: 재시도
+FATAL_STATUSES = (QUOTA, AUTH)
+
+
+def classify_http_status(code):
+    """HTTP 상태 코드 → 응답 상태 (200은 본문을 봐야 하므로 None)"""
+    if code == 200:
+        return None
+    if code in (429, 503):
+        return THROTTLED
+    if code in (401, 403):
+        return AUTH
+    return ERROR
+
+
+def retry_after_seconds(headers):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초, 없으면 None"""
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now().astimezone()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0, rng=random):
+    """
+    재시도 대기 시간 (지수 대기 + 전체 지터)
+
+    attempt번째 재시도(0부터)는 0 ~ min(cap, base * 2^attempt)초 사이에서 고른다.
+    같은 때 실패한 요청들이 한꺼번에 다시 몰리지 않는다.
+    """
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (rate=None이면 제한 없음)"""
+
+    def __init__(self, rate, burst=None):
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst or max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def try_acquire(self, now=None):
+        """토큰 하나를 쓰고 0, 모자라면 다음 토큰까지 남은 초"""
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic() if now is None else now
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait_time = self.try_acquire()
+            if wait_time <= 0:
+                return
+            time.sleep(wait_time)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 속도 조절기 (제공자마다 하나, 프로세스 안에서 공유)
+
+    with limiter:  # 토큰을 받을 때까지 (쉬는 중이면 쉬는 시간이 끝날 때까지) 대기
+        response = ...
+    limiter.record(상태, retry_after)
+
+코루틴에서는 async with limiter: (이벤트 루프를 막지 않고 대기)
+    """
+
+    def __init__(self, name, rate, max_rate=None, min_rate=0.5,
+                 increase=0.1, decrease=0.5, cooldown=1.0):
+        self.name = name
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.increase = increase      # 정상 응답 하나당 올리는 속도 (요청/초)
+        self.decrease = decrease      # 제한 응답 때 곱하는 비율
+        self.cooldown = cooldown      # 제한 응답 뒤 모든 요청을 멈추는 최소 시간 (초)
+        self.bucket = TokenBucket(rate)
+        self.lock = threading.Lock()
+        self.paused_until = 0.0
+        self.blocked_until = 0.0
+        self.block_reason = None
+        self.counts = {OK: 0, THROTTLED: 0, QUOTA: 0, AUTH: 0, ERROR: 0}
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def configure(self, rate=None, max_rate=None, unlimited=False):
+        """시작 속도/최대 속도 변경 (unlimited=True면 속도 제한 해제)"""
+        with self.lock:
+            if unlimited:
+                self.max_rate = None
+                self.bucket.set_rate(None)
+                return
+            if max_rate is not None:
+                self.max_rate = max_rate
+            if rate is not None:
+                self.bucket.set_rate(rate)
+
+    def settings(self):
+        """현재 (속도, 최대 속도) (restore로 되돌릴 때 사용)"""
+        with self.lock:
+            return self.bucket.rate, self.max_rate
+
+    def restore(self, settings):
+        """settings()로 저장한 속도/최대 속도로 되돌리기"""
+        rate, max_rate = settings
+        with self.lock:
+            self.max_rate = max_rate
+            self.bucket.set_rate(rate)
+
+    @contextmanager
+    def unlimited(self):
+        """with 블록 안에서만 속도 제한 해제 (벤치마크/검증용, 끝나면 원래 속도로)"""
+        saved = self.settings()
+        self.configure(unlimited=True)
+        try:
+            yield self
+        finally:
+            self.restore(saved)
+
+    def reset(self):
+        """쉬는 중/차단 상태와 집계 초기화"""
+        with self.lock:
+            self.paused_until = 0.0
+            self.blocked_until = 0.0
+            self.block_reason = None
+            self.counts = dict.fromkeys(self.counts, 0)
+
+    @property
+    def blocked(self):
+        """일일 한도 초과/인증 오류로 요청을 멈춘 상태면 그 이유, 아니면 None"""
+        with self.lock:
+            if self.block_reason and time.monotonic() >= self.blocked_until:
+                self.block_reason = None
+            return self.block_reason
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+                continue
+            wait_time = self.bucket.try_acquire()
+            if wait_time <= 0:
+                return
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+        import asyncio
+
+        while True:
+            with self.lock:
+                pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            wait_time = self.bucket.try_acquire()
+            if wait_time <= 0:
+                return
+            await asyncio.sleep(wait_time)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def record(self, status, retry_after=None):
+        """요청 결과 반영"""
+        now = time.monotonic()
+        with self.lock:
+            self.counts[status] += 1
+            rate = self.bucket.rate
+
+            if status == OK:
+                if rate and self.max_rate and now >= self.paused_until:
+                    self.bucket.set_rate(min(self.max_rate, rate + self.increase))
+            elif status == THROTTLED:
+                if now < self.paused_until:
+                    # 같은 제한 구간에서 동시에 실패한 요청들은 한 번만 반영
+                    return
+                new_rate = None  # 제한 없이 돌리는 중이면 속도는 그대로, 쉬기만 한다
+                if rate:
+                    new_rate = max(self.min_rate, rate * self.decrease)
+                    self.bucket.set_rate(new_rate)
+                pause = max(self.cooldown, retry_after or 0)
+                self.paused_until = now + pause
+                shown = f"{new_rate:.1f}/s" if new_rate else "제한 없음"
+                print(f"  ⚠️  {self.name} 요청 제한 감지: 속도 {shown}, {pause:.0f}초 대기")
+            elif status in FATAL_STATUSES and self.block_reason is None:
+                self.block_reason = status
+                if status == QUOTA:
+                    # 일일 한도는 자정에 풀린다
+                    tomorrow = datetime.now().date() + timedelta(days=1)
+                    seconds = (datetime.combine(tomorrow, datetime.min.time()) - datetime.now()).total_seconds()
+                    self.blocked_until = now + seconds
+                    print(f"  ❌ {self.name} 일일 요청 한도 초과: 오늘은 더 요청하지 않습니다")
+                else:
+                    self.blocked_until = float("inf")
+                    print(f"  ❌ {self.name} 인증 오류: API 키를 확인하세요")
+
+
+class _RetryQueue:
+    """
+    schedule_fetches / schedule_fetches_async 공통 대기열
+
+    요청 가능 시각 순으로 item을 꺼내 주고, 결과를 받아 끝낼지(성공/치명적 실패/횟수 초과)
+    지수 대기 + 지터 뒤에 다시 넣을지 정한다.
+    """
+
+    def __init__(self, items, limiter, max_attempts, base_delay, max_delay,
+                 progress_every, label, failed_out, rng):
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.progress_every = progress_every
+        self.label = label
+        self.rng = rng
+        self.results = {}
+        self.failures = {} if failed_out is None else failed_out
+        self.total = len(items)
+        self.finished = 0
+        # (요청 가능 시각, 순번, item, 지금까지 요청 횟수)
+        self.queue = [(0.0, seq, item, 0) for seq, item in enumerate(items)]
+        heapq.heapify(self.queue)
+        self.seq = len(self.queue)
+
+    def finish(self, item, status, payload=None):
+        if status == OK:
+            self.results[item] = payload
+        else:
+            self.failures[item] = status
+        self.finished += 1
+        if self.progress_every and self.finished % self.progress_every == 0:
+            print(f"  {self.label}: {self.finished}/{self.total} "
+                  f"({self.finished / self.total * 100:.0f}%)")
+
+    def drain_if_blocked(self):
+        """차단되면 대기열에 남은 item은 요청하지 않고 실패로 넘긴다"""
+        reason = self.limiter.blocked
+        if reason:
+            while self.queue:
+                self.finish(heapq.heappop(self.queue)[2], reason)
+
+    def pop_ready(self, now):
+        """지금 요청할 수 있는 (item, 요청 횟수), 없으면 None"""
+        if not self.queue or self.queue[0][0] > now:
+            return None
+        _, _, item, attempts = heapq.heappop(self.queue)
+        return item, attempts + 1
+
+    def wait_time(self):
+        """다음 item을 요청할 수 있을 때까지 남은 초"""
+        return max(0.0, self.queue[0][0] - time.monotonic())
+
+    def done(self, item, attempts, status, payload):
+        if status == OK or status in FATAL_STATUSES or attempts >= self.max_attempts:
+            self.finish(item, status, payload)
+            return
+        METRICS.count(self.limiter.name.lower(), "retries")
+        delay = backoff_delay(attempts - 1, self.base_delay, self.max_delay, self.rng)
+        heapq.heappush(self.queue, (time.monotonic() + delay, self.seq, item, attempts))
+        self.seq += 1
+
+
+def schedule_fetches(fetch, items, limiter, workers=4, max_attempts=4,
+                     base_delay=1.0, max_delay=30.0, progress_every=0, label="조회",
+                     failed_out=None, rng=random):
+    """
+    items 각각을 fetch로 조회 (실패하면 대기 후 다시 대기열에)
+
+    Args:
+        fetch: item → (상태, 응답). 요청 결과는 fetch 안에서 limiter.record로 알린다
+        limiter: AdaptiveLimiter (차단 상태 확인용, 속도 조절은 fetch가 거친다)
+        workers: 동시에 진행할 요청 수
+        max_attempts: item당 최대 요청 횟수 (첫 요청 포함)
+        failed_out: dict를 주면 끝내 실패한 item → 마지막 상태를 채운다
+
+    Returns:
+        dict: 성공한 item → 응답
+    """
+    pending = _RetryQueue(items, limiter, max_attempts, base_delay, max_delay,
+                          progress_every, label, failed_out, rng)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        running = {}
+        while pending.queue or running:
+            pending.drain_if_blocked()
+
+            now = time.monotonic()
+            while len(running) < workers:
+                task = pending.pop_ready(now)
+                if task is None:
+                    break
+                running[executor.submit(fetch, task[0])] = task
+
+            if not running:
+                if pending.queue:
+                    time.sleep(pending.wait_time())
+                continue
+
+            timeout = None
+            if pending.queue and len(running) < workers:
+                timeout = pending.wait_time()
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                item, attempts = running.pop(future)
+                pending.done(item, attempts, *future.result())
+
+    return pending.results
+
+
+async def schedule_fetches_async(fetch, items, limiter, workers=4, max_attempts=4,
+                                 base_delay=1.0, max_delay=30.0, progress_every=0, label="조회",
+                                 failed_out=None, rng=random):
+    """
+    schedule_fetches의 asyncio 버전 (fetch는 item → (상태, 응답) 코루틴 함수)
+
+    재시도/차단/진행률 규칙은 schedule_fetches와 같다.
+    """
+    import asyncio
+
+    pending = _RetryQueue(items, limiter, max_attempts, base_delay, max_delay,
+                          progress_every, label, failed_out, rng)
+
+    running = {}
+    try:
+        while pending.queue or running:
+            pending.drain_if_blocked()
+
+            now = time.monotonic()
+            while len(running) < workers:
+                task = pending.pop_ready(now)
+                if task is None:
+                    break
+                running[asyncio.ensure_future(fetch(task[0]))] = task
+
+            if not running:
+                if pending.queue:
+                    await asyncio.sleep(pending.wait_time())
+                continue
+
+            timeout = None
+            if pending.queue and len(running) < workers:
+                timeout = pending.wait_time()
+            done, _ = await asyncio.wait(running, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+
+            for future in done:
+                item, attempts = running.pop(future)
+                pending.done(item, attempts, *future.result())
+    finally:
+        for future in running:
+            future.cancel()
+
+    return pending.results
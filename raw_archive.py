@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API 원본 응답 보관소 + 오프라인 재계산
+
+    raw_archive/{provider}/{연도}.jsonl.gz
+
+provider는 exim / krx / yfinance. 한 줄이 한 응답이다:
+    {"date": "YYYYMMDD", "fetched_at": "...", "payload": ...}
+
+파일은 덧붙이기만 한다. 덧붙일 때마다 gzip 멤버가 하나씩 늘어나고, gzip.open은
+여러 멤버를 이어서 읽는다. 같은 날짜가 여러 번 기록되면 나중 것을 쓴다.
+쓰기 전에 원래 크기를 저널({파일}.append.json)에 남기므로, 쓰다가 죽어 멤버가 잘려도
+다음 append/읽기가 원래 크기로 잘라내고 이어서 쓴다 (잘린 멤버 뒤에 쓴 기록이 묻히지 않는다).
+
+rebuild는 보관된 응답을 collect_gold_data_final의 현재 파싱 함수로 다시 읽어
+gold_data CSV와 같은 표를 만든다. 단위 환산 같은 파싱 규칙이 바뀌어도
+API를 다시 호출하지 않고 전체 기간을 재계산할 수 있다.
+"""
+
+import glob
+import gzip
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+ARCHIVE_DIR = "raw_archive"
+PROVIDERS = ("exim", "krx", "yfinance")
+JOURNAL_SUFFIX = ".append.json"
+
+
+class RawArchive:
+    """제공자/연도별 gzip JSONL 원본 응답 보관소 (덧붙이기 전용)"""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.lock = threading.Lock()
+
+    def _path(self, provider, year):
+        return os.path.join(self.root, provider, f"{year}.jsonl.gz")
+
+    def _recover(self, path):
+        """
+        지난 append가 끝내지 못한 멤버 잘라내기 (저널에 적힌 원래 크기로)
+
+        Returns:
+            bool: 잘라냈으면 True
+        """
+        journal = path + JOURNAL_SUFFIX
+        if not os.path.exists(journal):
+            return False
+        try:
+            with open(journal, "r", encoding="utf-8") as f:
+                original_size = int(json.load(f)["size"])
+        except (OSError, ValueError, KeyError, TypeError):
+            print(f"⚠️  보관소 저널을 읽을 수 없어 무시합니다: {journal}")
+            os.remove(journal)
+            return False
+
+        truncated = os.path.exists(path) and os.path.getsize(path) > original_size
+        if truncated:
+            with open(path, "r+b") as f:
+                f.truncate(original_size)
+                f.flush()
+                os.fsync(f.fileno())
+            print(f"⚠️  지난 실행이 끝내지 못한 보관소 기록을 잘라냈습니다: {path}")
+        os.remove(journal)
+        return truncated
+
+    def append(self, records):
+        """
+        응답 덧붙이기
+
+        Args:
+            records: (provider, 'YYYYMMDD', payload) 목록
+
+        Returns:
+            int: 기록한 응답 수
+        """
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        groups = {}
+        for provider, date_str, payload in records:
+            if provider not in PROVIDERS:
+                raise ValueError(f"알 수 없는 provider: {provider}")
+            line = json.dumps({"date": date_str, "fetched_at": fetched_at, "payload": payload},
+                              ensure_ascii=False, separators=(",", ":"))
+            groups.setdefault((provider, date_str[:4]), []).append(line)
+
+        with self.lock:
+            for (provider, year), lines in groups.items():
+                path = self._path(provider, year)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._recover(path)
+                # 원래 크기를 저널에 남기고 gzip 멤버 하나를 통째로 쓴 뒤 fsync, 저널 삭제
+                block = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+                journal = path + JOURNAL_SUFFIX
+                with open(path, "ab") as f:
+                    original_size = f.seek(0, os.SEEK_END)
+                    temp_path = journal + ".tmp"
+                    with open(temp_path, "w", encoding="utf-8") as jf:
+                        json.dump({"size": original_size, "length": len(block)}, jf)
+                        jf.flush()
+                        os.fsync(jf.fileno())
+                    os.replace(temp_path, journal)
+                    try:
+                        f.write(block)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    except BaseException:
+                        f.truncate(original_size)
+                        raise
+                os.remove(journal)
+        return sum(len(lines) for lines in groups.values())
+
+    def iter_records(self, provider, start=None, end=None):
+        """
+        보관된 응답 읽기 (start/end는 'YYYYMMDD', 양 끝 포함)
+
+        Yields:
+            dict: date, fetched_at, payload (파일 기록 순서)
+        """
+        paths = sorted(glob.glob(os.path.join(self.root, provider, "*.jsonl.gz")))
+        for path in paths:
+            year = os.path.basename(path)[:4]
+            if (start and year < start[:4]) or (end and year > end[:4]):
+                continue
+            with self.lock:
+                self._recover(path)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        date_str = record["date"]
+                        if (start and date_str < start) or (end and date_str > end):
+                            continue
+                        yield record
+            except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+                # 저널 없이 손상된 멤버 (저널 도입 전 기록 등): 그 앞까지는 이미 넘겨줬다
+                print(f"⚠️  {path}: 끝부분 손상 ({e})")
+
+    def latest(self, provider, start=None, end=None):
+        """날짜별 마지막 응답 {날짜: payload}"""
+        return {r["date"]: r["payload"] for r in self.iter_records(provider, start, end)}
+
+    def stats(self):
+        """제공자별 (기록 수, 날짜 수, 압축 크기)"""
+        result = {}
+        for provider in PROVIDERS:
+            dates = set()
+            records = 0
+            for record in self.iter_records(provider):
+                records += 1
+                dates.add(record["date"])
+            size = sum(os.path.getsize(p) for p in
+                       glob.glob(os.path.join(self.root, provider, "*.jsonl.gz")))
+            result[provider] = (records, len(dates), size)
+        return result
+
+
+def import_response_cache(archive, start, end):
+    """
+    응답 캐시(.cache/responses)에 남아 있는 EXIM/KRX 응답을 보관소로 옮기기
+
+    보관소를 만들기 전에 수집한 기간을 다시 호출하지 않고 채울 때 사용한다.
+    (yfinance 종가는 캐시에 없으므로 rebuild 때 저장소/재조회로 보충한다)
+    """
+    import pandas as pd
+
+    import collect_gold_data_final as collector
+
+    cache = collector.RESPONSE_CACHE
+    records = []
+    for date in pd.date_range(start, end):
+        date_str = date.strftime("%Y%m%d")
+        for provider, endpoint in (("exim", collector.EXIM_ENDPOINT),
+                                   ("krx", collector.KRX_ENDPOINT)):
+            payload = cache.get(provider, endpoint, date_str)
+            if payload is not None:
+                records.append((provider, date_str, payload))
+    return archive.append(records)
+
+
+def yfinance_records(closes):
+    """국제 금 시세 Series(날짜 인덱스) → 보관소 기록 목록"""
+    return [("yfinance", date.strftime("%Y%m%d"), {"Close": float(close)})
+            for date, close in closes.items()]
+
+
+def rebuild(archive, start=None, end=None):
+    """
+    보관된 원본 응답으로 gold_data 표 재계산 (API 호출 없음)
+
+    yfinance 종가가 있는 날짜가 기준이며, 계산은 collect_gold_data_final.build_rows를
+    그대로 사용한다 (수집 때와 같은 반올림/실패 처리).
+
+    Returns:
+        DataFrame: date, domestic_price, international_price, exchange_rate, premium
+    """
+    import pandas as pd
+
+    import collect_gold_data_final as collector
+
+    closes = archive.latest("yfinance", start, end)
+    exim = archive.latest("exim", start, end)
+    krx = archive.latest("krx", start, end)
+
+    dates = sorted(closes)
+    gold_data = pd.DataFrame(
+        {"Close": [closes[d]["Close"] for d in dates]},
+        index=pd.to_datetime(dates, format="%Y%m%d"),
+    )
+
+    quotes = []
+    for date_str in dates:
+        payload = exim.get(date_str)
+        rate = collector.parse_exchange_rate(payload) if payload is not None else None
+        payload = krx.get(date_str)
+        price = collector.parse_krx_gold_price(payload) if payload is not None else None
+        quotes.append((rate, price))
+
+    return collector.build_rows(gold_data, quotes)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="API 원본 응답 보관소")
+    parser.add_argument("--root", default=ARCHIVE_DIR, help="보관소 디렉터리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="제공자별 기록 수/크기")
+
+    import_parser = commands.add_parser("import-cache", help="응답 캐시를 보관소로 옮기기")
+    import_parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    import_parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+
+    rebuild_parser = commands.add_parser("rebuild", help="보관된 응답으로 데이터 재계산")
+    rebuild_parser.add_argument("--start", help="YYYYMMDD")
+    rebuild_parser.add_argument("--end", help="YYYYMMDD")
+    rebuild_parser.add_argument("--output", help="CSV 경로 (기본: gold_data_{시작}_{끝}.csv)")
+
+    krx_parser = commands.add_parser("krx-table", help="KRX 응답을 상품별 표(CSV)로 내보내기")
+    krx_parser.add_argument("output")
+    krx_parser.add_argument("--start", help="YYYYMMDD")
+    krx_parser.add_argument("--end", help="YYYYMMDD")
+
+    args = parser.parse_args()
+    archive = RawArchive(args.root)
+
+    if args.command == "stats":
+        for provider, (records, days, size) in archive.stats().items():
+            print(f"  {provider:9s} {records:6,d}건 ({days:,}일) {size / 1024:8.1f}KB")
+    elif args.command == "import-cache":
+        count = import_response_cache(archive, args.start, args.end)
+        print(f"✓ 캐시 응답 {count}건 보관")
+    elif args.command == "krx-table":
+        import collect_gold_data_final as collector
+
+        table = collector.parse_krx_table(archive.latest("krx", args.start, args.end))
+        table.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"✓ {args.output} ({len(table)}행, 상품 {table['product'].nunique()}종)")
+    else:
+        started = time.perf_counter()
+        df = rebuild(archive, args.start, args.end)
+        elapsed = time.perf_counter() - started
+        if len(df) == 0:
+            print("❌ 재계산할 데이터가 없습니다 (yfinance 기록 없음)")
+            raise SystemExit(1)
+        output = args.output or f"gold_data_{df['date'].iloc[0]}_{df['date'].iloc[-1]}.csv"
+        df.to_csv(output, index=False, encoding="utf-8-sig")
+        print(f"✓ {output} ({len(df)}행, {elapsed:.2f}초)")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API 응답 디스크 캐시
+
+(제공자, 엔드포인트, 날짜)의 해시를 키로 원본 JSON 응답을 저장한다.
+그 날짜가 지난 뒤에 받은 응답은 환율/종가가 더 바뀌지 않으므로 만료되지 않고,
+그 날짜 당일(또는 그 전)에 받은 응답은 고시 전 빈 응답이나 장중 값일 수 있어
+짧은 TTL 후 만료된다 (자정이 지나도 영구 보관으로 바뀌지 않는다).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+CACHE_DIR = os.path.join(".cache", "responses")
+TODAY_TTL = 600  # 오늘 날짜 응답 유효 시간 (초)
+
+
+class ResponseCache:
+    """
+    날짜 기반 TTL을 갖는 content-addressed 응답 캐시
+
+    파일 위치: {root}/{키 앞 2자리}/{키}.json
+    """
+
+    def __init__(self, root=CACHE_DIR, today_ttl=TODAY_TTL):
+        self.root = root
+        self.today_ttl = today_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider, endpoint, date_str):
+        """(제공자, 엔드포인트, 날짜) → sha256 키"""
+        raw = f"{provider}\x00{endpoint}\x00{date_str}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def _is_fresh(self, date_str, stored_at, now=None):
+        """date_str 다음 날 이후에 저장한 응답은 영구 유효, 나머지는 TTL 이내만 유효"""
+        now = time.time() if now is None else now
+        stored_day = datetime.fromtimestamp(stored_at).strftime("%Y%m%d")
+        if stored_day > date_str:
+            return True
+        return now - stored_at < self.today_ttl
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, provider, endpoint, date_str, accept=None):
+        """
+        캐시된 응답 조회
+
+        Args:
+            accept: 응답 → bool. 주면 False인 응답은 미스로 센다 (예전에 저장된 오류 응답 등)
+
+        Returns:
+            캐시된 JSON 응답, 없거나 만료되었거나 accept가 거절하면 None
+        """
+        path = self._path(self.make_key(provider, endpoint, date_str))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+
+        if not self._is_fresh(date_str, entry.get("stored_at", 0)):
+            self._count(False)
+            return None
+        if accept is not None and not accept(entry["payload"]):
+            self._count(False)
+            return None
+
+        self._count(True)
+        return entry["payload"]
+
+    def put(self, provider, endpoint, date_str, payload):
+        """응답 저장 (임시 파일에 쓴 뒤 교체하므로 동시 쓰기에도 안전)"""
+        path = self._path(self.make_key(provider, endpoint, date_str))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        entry = {
+            "provider": provider,
+            "endpoint": endpoint,
+            "date": date_str,
+            "stored_at": time.time(),
+            "payload": payload,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def summary(self):
+        """적중/미스 요약 문자열"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        return f"적중 {self.hits}건 / 미스 {self.misses}건 (적중률 {rate:.0f}%)"
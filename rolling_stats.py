@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+김치프리미엄 이동 통계 (새 관측값마다 증분 갱신)
+
+"최근 60거래일 프리미엄 z-점수" 같은 신호를 날마다 창 전체를 다시 계산하지 않고 갱신한다.
+
+    합/제곱합    기준값 K를 뺀 값(y = x - K)의 합과 제곱합을 들어온 값 더하기/나간 값 빼기로
+                 갱신 → 평균/분산 O(1). K를 빼 두면 평균이 표준편차보다 훨씬 커도
+                 (Q - S²/n)의 자릿수 손실이 적다
+    최소/최대    단조 덱 (분할 상환 O(1))
+    분위수/순위  정렬된 창 (bisect로 O(log n) 탐색, 삽입/삭제는 창 크기만큼 memmove)
+
+RollingStats.update는 한 값씩, rolling_batch는 전체 배열을 한 번에 계산한다.
+배치 경로는 같은 연산을 같은 순서로 벡터화한 것이라 (합은 np.cumsum = 순차 누적)
+두 경로 결과가 비트 단위로 같다. RollingStats.seed는 배치 결과로 상태를 채우므로
+수집된 데이터로 시작한 뒤 새 값을 이어 넣어도 전체를 배치로 계산한 것과 같다.
+
+유효하지 않은 값(NaN/inf)은 창에 넣지 않는다.
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+WINDOW = 60
+QUANTILES = (5, 50, 95)
+
+
+def _quantile(sorted_values, count, q):
+    """정렬된 값의 q 분위수 (선형 보간, rolling_batch와 같은 연산 순서)"""
+    position = (count - 1) * q / 100
+    lo = math.floor(position)
+    hi = min(lo + 1, count - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (position - lo)
+
+
+class RollingStats:
+    """
+    고정 길이 창 이동 통계 (증분 갱신)
+
+        stats = RollingStats(window=60).seed(history)
+        snapshot = stats.update(premium)   # {"mean", "std", "zscore", ...}
+    """
+
+    def __init__(self, window=WINDOW, min_periods=None, quantiles=QUANTILES, reference=None):
+        if window < 2:
+            raise ValueError("window는 2 이상이어야 합니다")
+        self.window = window
+        self.min_periods = max(2, min_periods or window)
+        self.quantiles = tuple(quantiles)
+        self.reference = reference   # 기준값 K (None이면 첫 유효값)
+        self.values = deque()        # 창 안의 x (들어온 순서)
+        self.sorted = []             # 창 안의 x (정렬)
+        self.min_deque = deque()     # (순번, x): x 오름차순
+        self.max_deque = deque()     # (순번, x): x 내림차순
+        self.total = 0.0             # S = Σy
+        self.total_sq = 0.0          # Q = Σy²
+        self.seen = 0                # 지금까지 넣은 유효값 수
+        self.last = None
+
+    def _push_extremes(self, index, x):
+        while self.min_deque and self.min_deque[-1][1] >= x:
+            self.min_deque.pop()
+        self.min_deque.append((index, x))
+        while self.max_deque and self.max_deque[-1][1] <= x:
+            self.max_deque.pop()
+        self.max_deque.append((index, x))
+
+    def update(self, x):
+        """
+        새 관측값 반영
+
+        Returns:
+            dict: snapshot() (유효하지 않은 값이면 None, 상태는 그대로)
+        """
+        x = float(x)
+        if not math.isfinite(x):
+            return None
+        if self.reference is None:
+            self.reference = x
+
+        y = x - self.reference
+        y_old = 0.0
+        if len(self.values) == self.window:
+            x_old = self.values.popleft()
+            y_old = x_old - self.reference
+            self.sorted.pop(bisect_left(self.sorted, x_old))
+        self.values.append(x)
+        self.total += y - y_old
+        self.total_sq += y * y - y_old * y_old
+        insort(self.sorted, x)
+
+        index = self.seen
+        self.seen += 1
+        self._push_extremes(index, x)
+        expired = index - self.window
+        if self.min_deque[0][0] <= expired:
+            self.min_deque.popleft()
+        if self.max_deque[0][0] <= expired:
+            self.max_deque.popleft()
+
+        self.last = x
+        return self.snapshot()
+
+    def seed(self, values):
+        """
+        과거 값 전체로 상태 채우기 (rolling_batch로 계산, update를 반복한 것과 같은 상태)
+
+        Returns:
+            RollingStats: self
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        if self.reference is None:
+            self.reference = float(values[0])
+
+        totals, totals_sq = _running_sums(values - self.reference, self.window)
+        tail = values[-self.window:]
+        self.values = deque(tail.tolist())
+        self.sorted = sorted(tail.tolist())
+        self.total, self.total_sq = float(totals[-1]), float(totals_sq[-1])
+        self.min_deque.clear()
+        self.max_deque.clear()
+        start = len(values) - len(tail)
+        for offset, x in enumerate(tail.tolist()):
+            self._push_extremes(start + offset, x)
+        self.seen = len(values)
+        self.last = float(values[-1])
+        return self
+
+    def snapshot(self):
+        """
+        현재 창 통계
+
+        Returns:
+            dict: value, count, mean, std, min, max, zscore, rank(창 안에서 현재 값 이하
+                  비율 %), q{분위수}. 창이 min_periods보다 짧으면 value/count 외에는 NaN
+        """
+        count = len(self.values)
+        result = {"value": self.last, "count": count}
+        if count < self.min_periods:
+            result.update(dict.fromkeys(_stat_columns(self.quantiles), math.nan))
+            return result
+
+        mean = self.reference + self.total / count
+        variance = max((self.total_sq - self.total * self.total / count) / (count - 1), 0.0)
+        std = math.sqrt(variance)
+        result.update({
+            "mean": mean,
+            "std": std,
+            "min": self.min_deque[0][1],
+            "max": self.max_deque[0][1],
+            "zscore": (self.last - mean) / std if std > 0 else math.nan,
+            "rank": bisect_right(self.sorted, self.last) * 100 / count,
+        })
+        for q in self.quantiles:
+            result[f"q{q}"] = _quantile(self.sorted, count, q)
+        return result
+
+
+def _stat_columns(quantiles):
+    return ["mean", "std", "min", "max", "zscore", "rank"] + [f"q{q}" for q in quantiles]
+
+
+def _running_sums(y, window):
+    """창 합 S와 제곱합 Q (update와 같은 순서의 순차 누적)"""
+    y_old = np.zeros_like(y)
+    y_old[window:] = y[:-window]
+    return np.cumsum(y - y_old), np.cumsum(y * y - y_old * y_old)
+
+
+def rolling_batch(values, window=WINDOW, min_periods=None, quantiles=QUANTILES, reference=None):
+    """
+    전체 배열 이동 통계 (RollingStats.update를 차례로 부른 결과와 같음)
+
+    유효하지 않은 값은 먼저 뺀다 (결과 행 = 유효값).
+
+    Returns:
+        DataFrame: value, count, mean, std, min, max, zscore, rank, q{분위수}
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    n = len(values)
+    min_periods = max(2, min_periods or window)
+    columns = ["value", "count"] + _stat_columns(quantiles)
+    if n == 0:
+        return pd.DataFrame(columns=columns)
+    if reference is None:
+        reference = float(values[0])
+
+    counts = np.minimum(np.arange(1, n + 1), window)
+    totals, totals_sq = _running_sums(values - reference, window)
+    mean = reference + totals / counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.maximum((totals_sq - totals * totals / counts) / (counts - 1), 0.0)
+        std = np.sqrt(variance)
+        zscore = np.where(std > 0, (values - mean) / std, np.nan)
+
+    # 앞쪽 짧은 창은 NaN으로 채워 (n × window) 창 배열을 만든다 (NaN은 정렬 때 맨 뒤)
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    ordered = np.sort(windows, axis=1)
+
+    result = {
+        "value": values,
+        "count": counts,
+        "mean": mean,
+        "std": std,
+        "min": ordered[:, 0],
+        "max": ordered[np.arange(n), counts - 1],
+        "zscore": zscore,
+        "rank": (windows <= values[:, None]).sum(axis=1) * 100 / counts,
+    }
+    rows = np.arange(n)
+    for q in quantiles:
+        position = (counts - 1) * q / 100
+        lo = np.floor(position).astype(np.int64)
+        hi = np.minimum(lo + 1, counts - 1)
+        low, high = ordered[rows, lo], ordered[rows, hi]
+        result[f"q{q}"] = low + (high - low) * (position - lo)
+
+    df = pd.DataFrame(result, columns=columns)
+    df.loc[counts < min_periods, _stat_columns(quantiles)] = np.nan
+    return df
+
+
+def stream(values, window=WINDOW, min_periods=None, quantiles=QUANTILES, reference=None):
+    """RollingStats.update를 차례로 불러 rolling_batch와 같은 표를 만든다 (비교/검증용)"""
+    stats = RollingStats(window, min_periods, quantiles, reference)
+    rows = [stats.update(x) for x in np.asarray(values, dtype=float).tolist()]
+    columns = ["value", "count"] + _stat_columns(quantiles)
+    return pd.DataFrame([row for row in rows if row is not None], columns=columns)
+
+
+def from_dataset(path, window=WINDOW, column="premium", **kwargs):
+    """수집된 데이터(load_gold_data가 읽는 형식)로 시작한 RollingStats"""
+    from gold_backtest import load_gold_data
+
+    return RollingStats(window, **kwargs).seed(load_gold_data(path)[column])
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="김치프리미엄 이동 통계")
+    parser.add_argument("csv", nargs="?", help="gold_data CSV / 데이터셋 디렉터리 / .db (기본: 가장 최근 CSV)")
+    parser.add_argument("--window", type=int, default=WINDOW, help="창 길이 (거래일)")
+    parser.add_argument("--column", default="premium", help="대상 컬럼")
+    parser.add_argument("--tail", type=int, default=10, help="출력할 마지막 행 수")
+    parser.add_argument("--check", action="store_true", help="증분 경로와 배치 경로 결과 비교")
+    parser.add_argument("--output", help="전체 결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        candidates = glob.glob("gold_data_*.csv")
+        if not candidates:
+            parser.error("gold_data CSV 파일을 지정하세요")
+        csv_path = max(candidates, key=os.path.getmtime)
+
+    from gold_backtest import load_gold_data
+
+    data = load_gold_data(csv_path)
+    values = data[args.column]
+    dates = data["date"][np.isfinite(values)]
+
+    started = time.perf_counter()
+    table = rolling_batch(values, args.window)
+    elapsed = time.perf_counter() - started
+    table.insert(0, "date", dates)
+    print(f"✓ {csv_path}: {len(table)}행, 창 {args.window}일 ({elapsed * 1000:.1f}ms)")
+    print(table.tail(args.tail).to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+
+    if args.check:
+        started = time.perf_counter()
+        streamed = stream(values, args.window)
+        elapsed = time.perf_counter() - started
+        same = streamed.equals(table.drop(columns="date"))
+        print(f"\n증분 경로: {elapsed * 1000:.1f}ms "
+              f"({elapsed / max(1, len(streamed)) * 1e6:.1f}µs/값), "
+              f"배치와 {'✓ 일치' if same else '❌ 불일치'}")
+        if not same:
+            raise SystemExit(1)
+
+    if args.output:
+        table.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n✓ 저장: {args.output}")
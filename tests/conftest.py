@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+공용 fixture
+
+루트의 스크립트들을 모듈로 불러올 수 있게 저장소 루트를 sys.path에 넣는다.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BUNDLED_CSV = os.path.join(ROOT, "gold_data_2024-01-01_2026-02-05.csv")
+
+
+@pytest.fixture(scope="session")
+def bundled_data():
+    """저장소에 포함된 수집 결과 CSV"""
+    from gold_backtest import load_gold_data
+
+    return load_gold_data(BUNDLED_CSV)
+
+
+@pytest.fixture(scope="session")
+def synthetic_data():
+    """매매가 충분히 일어나는 가짜 데이터 (3년, 프리미엄 평균 2% 근처)"""
+    from bench_suite import synthetic_data as make
+
+    return make(3, seed=7)
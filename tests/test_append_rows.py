@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""append_rows_atomic / recover_append: 중간에 죽어도 CSV가 원래 상태로 돌아오는지"""
+
+import json
+import os
+
+import pandas as pd
+
+import collect_gold_data_final as collector
+
+HEADER = "date,domestic_price,international_price,exchange_rate,premium\n"
+ROW = {"date": "2024-01-03", "domestic_price": 90.77, "international_price": 2050.0,
+       "exchange_rate": 1389.04, "premium": 1.5}
+
+
+def _write_csv(path):
+    path.write_text(HEADER + "2024-01-02,93.28,2050.0,1370.7,1.2\n", encoding="utf-8")
+    return str(path)
+
+
+def test_append_leaves_no_journal(tmp_path):
+    csv_path = _write_csv(tmp_path / "gold.csv")
+    collector.append_rows_atomic(csv_path, [ROW])
+    assert not os.path.exists(csv_path + collector.APPEND_JOURNAL_SUFFIX)
+    df = pd.read_csv(csv_path)
+    assert df["date"].tolist() == ["2024-01-02", "2024-01-03"]
+    assert collector.read_last_date(csv_path) == "2024-01-03"
+
+
+def test_interrupted_append_is_rolled_back(tmp_path):
+    csv_path = _write_csv(tmp_path / "gold.csv")
+    original = open(csv_path, "rb").read()
+
+    # 저널을 남긴 뒤 행 일부만 쓰고 죽은 상태
+    with open(csv_path + collector.APPEND_JOURNAL_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"size": len(original), "length": 64}, f)
+    with open(csv_path, "ab") as f:
+        f.write(b"2024-01-03,90.7")
+
+    assert collector.recover_append(csv_path)
+    assert open(csv_path, "rb").read() == original
+    assert not os.path.exists(csv_path + collector.APPEND_JOURNAL_SUFFIX)
+
+
+def test_next_append_recovers_first(tmp_path):
+    csv_path = _write_csv(tmp_path / "gold.csv")
+    size = os.path.getsize(csv_path)
+    with open(csv_path + collector.APPEND_JOURNAL_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"size": size, "length": 64}, f)
+    with open(csv_path, "ab") as f:
+        f.write(b"garbage")
+
+    collector.append_rows_atomic(csv_path, [ROW])
+    assert pd.read_csv(csv_path)["date"].tolist() == ["2024-01-02", "2024-01-03"]
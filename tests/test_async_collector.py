@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""asyncio 엔진 ↔ 스레드 엔진: 같은 응답이면 같은 결과, 실패 응답은 캐시하지 않음"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import async_collector
+import collect_gold_data_final as collector
+import rate_limit
+from mock_server import EXIM_PATH, KRX_PATH
+from response_cache import ResponseCache
+
+QUOTA = [{"result": 4}]
+
+
+@pytest.fixture
+def dates():
+    return collector.krx_trading_days("2024-01-01", "2024-02-01")
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """임시 응답 캐시, 저장소/보관소 끄기, 속도 제한 없이 (끝나면 원래대로)"""
+    monkeypatch.setattr(collector, "RESPONSE_CACHE", ResponseCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(collector, "USE_STORE", False)
+    monkeypatch.setattr(collector, "USE_RAW_ARCHIVE", False)
+    monkeypatch.setattr(collector, "RETRY_BASE_DELAY", 0.01)
+    with collector.EXIM_LIMITER.unlimited(), collector.KRX_LIMITER.unlimited():
+        collector.EXIM_LIMITER.reset()
+        collector.KRX_LIMITER.reset()
+        yield tmp_path
+    collector.EXIM_LIMITER.reset()
+    collector.KRX_LIMITER.reset()
+
+
+def _run_both(monkeypatch, fixture_dir, dates_api):
+    """스텁 서버 상대로 (동기 결과, 비동기 결과), 엔진마다 limiter 상태는 새로"""
+    results = []
+    with async_collector.ReplayStubServer(str(fixture_dir)) as stub:
+        monkeypatch.setattr(collector, "EXIM_URL", stub.base_url + EXIM_PATH)
+        monkeypatch.setattr(collector, "KRX_URL", stub.base_url + KRX_PATH)
+        for run in (
+            lambda: collector.fetch_daily_quotes(dates_api, "STUB", "STUB", progress_every=0),
+            lambda: asyncio.run(async_collector.fetch_daily_quotes_async(dates_api, "STUB", "STUB")),
+        ):
+            collector.EXIM_LIMITER.reset()
+            collector.KRX_LIMITER.reset()
+            results.append(run())
+    return results
+
+
+def test_verify_against_sync(offline, dates):
+    async_collector.write_sample_fixtures(dates, str(offline))
+    assert async_collector.verify_against_sync(dates, str(offline))
+
+
+def test_engines_match_without_cache(monkeypatch, offline, dates):
+    async_collector.write_sample_fixtures(dates, str(offline))
+    monkeypatch.setattr(collector, "USE_RESPONSE_CACHE", False)
+    sync_quotes, async_quotes = _run_both(monkeypatch, offline, dates)
+    assert sync_quotes == async_quotes
+    assert all(rate is not None for rate, _ in sync_quotes)
+
+
+def test_quota_reply_is_a_failure_and_not_cached(monkeypatch, offline, dates):
+    async_collector.write_sample_fixtures(dates, str(offline))
+    for d in dates[5:]:
+        async_collector.write_fixture(str(offline), "exim", d, QUOTA)
+    monkeypatch.setattr(collector, "USE_RESPONSE_CACHE", False)
+
+    sync_quotes, async_quotes = _run_both(monkeypatch, offline, dates)
+    assert sync_quotes == async_quotes
+    assert [rate is not None for rate, _ in async_quotes] == [True] * 5 + [False] * (len(dates) - 5)
+    assert collector.EXIM_LIMITER.blocked == rate_limit.QUOTA
+
+
+def test_cached_failure_is_refetched(monkeypatch, offline, dates):
+    async_collector.write_sample_fixtures(dates, str(offline))
+    cache = collector.RESPONSE_CACHE
+    cache.put("exim", collector.EXIM_ENDPOINT, dates[0], QUOTA)
+    cache.put("krx", collector.KRX_ENDPOINT, dates[1], {"error": "bad"})
+
+    sync_quotes, async_quotes = _run_both(monkeypatch, offline, dates)
+    assert sync_quotes == async_quotes
+    assert sync_quotes[0][0] is not None and sync_quotes[1][1] is not None
+    assert cache.get("exim", collector.EXIM_ENDPOINT, dates[0]) != QUOTA
+    assert "OutBlock_1" in cache.get("krx", collector.KRX_ENDPOINT, dates[1])
+
+
+def test_async_quota_is_never_cached(monkeypatch, offline, dates):
+    for d in dates:
+        async_collector.write_fixture(str(offline), "exim", d, QUOTA)
+    with async_collector.ReplayStubServer(str(offline)) as stub:
+        monkeypatch.setattr(collector, "EXIM_URL", stub.base_url + EXIM_PATH)
+        quotes = asyncio.run(async_collector.fetch_daily_quotes_async(dates, "STUB", ""))
+    assert quotes == [(None, None)] * len(dates)
+    assert all(collector.RESPONSE_CACHE.get("exim", collector.EXIM_ENDPOINT, d) is None
+               for d in dates)
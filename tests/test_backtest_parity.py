@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""gold_backtest.perform_backtest ↔ gold_backtest_v2.html performBacktest (node 필요)"""
+
+import shutil
+
+import pytest
+
+from gold_backtest import compare_with_js
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node가 없습니다")
+
+
+@pytest.mark.parametrize("buy, sell, capital, unit", [
+    (0.5, 3.0, 10_000_000, "1g"),
+    (1.0, 2.5, 10_000_000, "1g"),
+    (-0.5, 4.0, 10_000_000, "1g"),
+    (0.5, 3.0, 200_000_000, "1kg"),
+    (3.0, 0.5, 10_000_000, "1g"),      # 매도 기준이 매수 기준보다 낮은 경우
+])
+def test_synthetic_matches_js(synthetic_data, buy, sell, capital, unit):
+    assert compare_with_js(synthetic_data, buy, sell, capital, unit) == []
+
+
+@pytest.mark.parametrize("buy, sell, unit", [(5.0, 10.0, "1kg"), (-99.9, -99.89, "1g")])
+def test_bundled_csv_matches_js(bundled_data, buy, sell, unit):
+    assert compare_with_js(bundled_data, buy, sell, 10_000_000, unit) == []
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""벡터 커널(gold_vector) ↔ 루프 엔진(perform_backtest) 결과가 정확히 같은지"""
+
+import numpy as np
+import pytest
+
+from gold_vector import compare_with_loop
+
+BUY_VALUES = np.round(np.arange(-1.0, 3.01, 0.5), 2)
+SELL_VALUES = np.round(np.arange(0.0, 5.01, 0.5), 2)
+
+
+def _grid():
+    buys, sells = np.meshgrid(BUY_VALUES, SELL_VALUES, indexing="ij")
+    return buys.ravel(), sells.ravel()
+
+
+@pytest.mark.parametrize("capital, unit", [(10_000_000, "1g"), (200_000_000, "1kg")])
+def test_grid_matches_loop(synthetic_data, capital, unit):
+    buys, sells = _grid()
+    diffs = compare_with_loop(synthetic_data["premium"], synthetic_data["domestic_price"],
+                              buys, sells, capital, unit)
+    assert diffs == []
+
+
+def test_missing_premiums_match_loop(synthetic_data):
+    premiums = synthetic_data["premium"].copy()
+    premiums[::17] = np.nan
+    buys, sells = _grid()
+    assert compare_with_loop(premiums, synthetic_data["domestic_price"], buys, sells,
+                             10_000_000, "1g") == []
+
+
+def test_bundled_csv_matches_loop(bundled_data):
+    buys, sells = _grid()
+    assert compare_with_loop(bundled_data["premium"], bundled_data["domestic_price"],
+                             buys - 100.9, sells - 100.9, 10_000_000, "1g") == []
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""몬테카를로: 프로세스 수와 무관하게 같은 결과, 시드가 다르면 다른 경로"""
+
+import pandas as pd
+import pytest
+
+from gold_montecarlo import run_montecarlo
+
+
+@pytest.mark.parametrize("model", ["bootstrap", "ou"])
+def test_montecarlo_serial_equals_parallel(synthetic_data, model):
+    kwargs = dict(paths=300, days=120, model=model, unit_type="1g", seed=11, chunk_size=100)
+    serial = run_montecarlo(synthetic_data, 0.5, 3.0, processes=1, **kwargs)
+    parallel = run_montecarlo(synthetic_data, 0.5, 3.0, processes=3, **kwargs)
+    assert len(serial) == 300
+    pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
+
+
+def test_montecarlo_seed_changes_paths(synthetic_data):
+    kwargs = dict(paths=100, days=60, unit_type="1g", processes=1)
+    first = run_montecarlo(synthetic_data, 0.5, 3.0, seed=1, **kwargs)
+    second = run_montecarlo(synthetic_data, 0.5, 3.0, seed=2, **kwargs)
+    assert not first.equals(second)
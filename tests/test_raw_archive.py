@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""RawArchive: 기록 도중 끊긴 gzip 멤버가 읽기/다음 기록을 망가뜨리지 않는지"""
+
+import gzip
+import json
+import os
+
+from raw_archive import JOURNAL_SUFFIX, RawArchive
+
+
+def _torn_append(path, records):
+    """저널을 남긴 뒤 멤버 앞부분만 쓰고 죽은 상태 만들기"""
+    block = gzip.compress("".join(json.dumps(r) + "\n" for r in records).encode("utf-8"))
+    with open(path + JOURNAL_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"size": os.path.getsize(path), "length": len(block)}, f)
+    with open(path, "ab") as f:
+        f.write(block[:len(block) // 2])
+
+
+def test_append_after_torn_tail_is_readable(tmp_path):
+    archive = RawArchive(str(tmp_path))
+    archive.append([("exim", "20240102", {"rate": 1}), ("exim", "20240103", {"rate": 2})])
+    path = archive._path("exim", "2024")
+    size = os.path.getsize(path)
+
+    _torn_append(path, [{"date": "20240104", "fetched_at": "x", "payload": {"rate": 3}}])
+    archive.append([("exim", "20240105", {"rate": 5})])
+
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
+    assert os.path.getsize(path) > size
+    assert archive.latest("exim") == {"20240102": {"rate": 1}, "20240103": {"rate": 2},
+                                      "20240105": {"rate": 5}}
+
+
+def test_read_truncates_journaled_torn_tail(tmp_path):
+    archive = RawArchive(str(tmp_path))
+    archive.append([("krx", "20240102", {"price": 1})])
+    path = archive._path("krx", "2024")
+    size = os.path.getsize(path)
+
+    _torn_append(path, [{"date": "20240103", "fetched_at": "x", "payload": {"price": 2}}])
+
+    assert archive.latest("krx") == {"20240102": {"price": 1}}
+    assert os.path.getsize(path) == size
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
+
+
+def test_corrupt_member_without_journal_does_not_crash(tmp_path):
+    archive = RawArchive(str(tmp_path))
+    archive.append([("krx", "20240102", {"price": 1})])
+    path = archive._path("krx", "2024")
+
+    # gzip 헤더 뒤에 deflate가 아닌 바이트 (zlib.error)
+    block = gzip.compress(b'{"date":"20240103"}\n')
+    with open(path, "ab") as f:
+        f.write(block[:10] + b"\xff" * 16)
+
+    assert archive.latest("krx") == {"20240102": {"price": 1}}
+    assert archive.stats()["krx"][:2] == (1, 1)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""ResponseCache 만료 규칙과 적중 집계"""
+
+from datetime import datetime
+
+import response_cache
+from response_cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self, when):
+        self.now = when.timestamp()
+
+    def time(self):
+        return self.now
+
+
+def _put_at(monkeypatch, cache, when, date_str, payload):
+    clock = _Clock(when)
+    monkeypatch.setattr(response_cache, "time", clock)
+    cache.put("exim", "exchangeJSON/AP01", date_str, payload)
+    return clock
+
+
+def test_same_day_entry_is_not_permanent_after_midnight(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    clock = _put_at(monkeypatch, cache, datetime(2025, 3, 10, 9, 0), "20250310", [])
+    clock.now = datetime(2025, 3, 11, 1, 0).timestamp()
+    assert cache.get("exim", "exchangeJSON/AP01", "20250310") is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_same_day_entry_within_ttl_hits(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path), today_ttl=600)
+    clock = _put_at(monkeypatch, cache, datetime(2025, 3, 10, 9, 0), "20250310", [])
+    clock.now += 300
+    assert cache.get("exim", "exchangeJSON/AP01", "20250310") == []
+
+
+def test_entry_stored_after_the_day_is_permanent(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    clock = _put_at(monkeypatch, cache, datetime(2025, 3, 11, 9, 0), "20250310", [{"result": 1}])
+    clock.now = datetime(2026, 1, 1).timestamp()
+    assert cache.get("exim", "exchangeJSON/AP01", "20250310") == [{"result": 1}]
+
+
+def test_rejected_payload_counts_as_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("exim", "exchangeJSON/AP01", "20200102", [{"result": 4}])
+
+    assert cache.get("exim", "exchangeJSON/AP01", "20200102",
+                     accept=lambda payload: payload[0]["result"] == 1) is None
+    assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""rolling_stats 증분 경로(RollingStats.update) ↔ 배치 경로(rolling_batch)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_stats import RollingStats, rolling_batch, stream
+
+
+@pytest.mark.parametrize("window", [2, 5, 60])
+def test_stream_equals_batch(synthetic_data, window):
+    values = synthetic_data["premium"]
+    pd.testing.assert_frame_equal(stream(values, window), rolling_batch(values, window),
+                                  check_exact=True, check_dtype=False)
+
+
+def test_invalid_values_are_skipped(synthetic_data):
+    values = synthetic_data["premium"].copy()
+    values[::11] = np.nan
+    values[3] = np.inf
+    pd.testing.assert_frame_equal(stream(values, 20), rolling_batch(values, 20),
+                                  check_exact=True, check_dtype=False)
+
+
+def test_bundled_csv_stream_equals_batch(bundled_data):
+    values = bundled_data["premium"]
+    pd.testing.assert_frame_equal(stream(values), rolling_batch(values),
+                                  check_exact=True, check_dtype=False)
+
+
+def test_seed_then_update_equals_batch(synthetic_data):
+    values = synthetic_data["premium"]
+    history, new = values[:500], values[500:]
+    stats = RollingStats(60).seed(history)
+    snapshots = [stats.update(x) for x in new]
+
+    expected = rolling_batch(values, 60).iloc[500:].reset_index(drop=True)
+    pd.testing.assert_frame_equal(pd.DataFrame(snapshots, columns=expected.columns), expected,
+                                  check_exact=True, check_dtype=False)
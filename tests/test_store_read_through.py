@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""저장소 read-through: 한 번 수집한 날짜는 API를 다시 부르지 않고 같은 행을 만든다"""
+
+import pandas as pd
+import pytest
+
+import collect_gold_data_final as collector
+from mock_server import MockApiServer, mock_exchange_rate
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def gold_data():
+    dates = pd.to_datetime(collector.krx_trading_days("2024-01-01", "2024-02-01"), format="%Y%m%d")
+    return pd.DataFrame({"Close": [2050.0 + i for i in range(len(dates))]}, index=dates)
+
+
+@pytest.fixture
+def store_path(monkeypatch, tmp_path):
+    path = str(tmp_path / "gold.db")
+    monkeypatch.setattr(collector, "STORE_PATH", path)
+    monkeypatch.setattr(collector, "USE_STORE", True)
+    monkeypatch.setattr(collector, "USE_RAW_ARCHIVE", False)
+    monkeypatch.setattr(collector, "USE_RESPONSE_CACHE", False)
+    monkeypatch.setattr(collector, "RESPONSE_CACHE", ResponseCache(str(tmp_path / "cache")))
+    with collector.EXIM_LIMITER.unlimited(), collector.KRX_LIMITER.unlimited():
+        yield path
+
+
+def _collect(monkeypatch, server, gold_data):
+    monkeypatch.setattr(collector, "EXIM_URL", server.exim_url)
+    monkeypatch.setattr(collector, "KRX_URL", server.krx_url)
+    df = collector.collect_rows(gold_data, "MOCK", "MOCK", workers=4)
+    collector.save_to_store(gold_data, df, collector.take_raw_payloads(), collector.STORE_PATH)
+    return df
+
+
+def test_second_collect_reads_store(monkeypatch, store_path, gold_data):
+    with MockApiServer() as server:
+        first = _collect(monkeypatch, server, gold_data)
+        assert server.connections > 0
+
+    with MockApiServer() as server:
+        second = _collect(monkeypatch, server, gold_data)
+        assert server.connections == 0
+
+    pd.testing.assert_frame_equal(second, first, check_exact=True)
+
+
+def test_days_missing_from_store_are_fetched(monkeypatch, store_path, gold_data):
+    with MockApiServer() as server:
+        _collect(monkeypatch, server, gold_data.iloc[:10])
+
+    stored = collector.stored_quotes([d.strftime("%Y%m%d") for d in gold_data.index])
+    assert len(stored) == 10
+    date_api = gold_data.index[0].strftime("%Y%m%d")
+    assert stored[date_api][0] == mock_exchange_rate(date_api)
+
+    with MockApiServer() as server:
+        df = _collect(monkeypatch, server, gold_data)
+        assert server.connections > 0
+    assert len(df) == len(gold_data)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""워크포워드: 프로세스 수 / 커널과 무관하게 같은 결과"""
+
+import numpy as np
+import pandas as pd
+
+from gold_walkforward import run_walkforward
+
+BUY_VALUES = np.round(np.arange(-0.5, 2.01, 0.5), 2)
+SELL_VALUES = np.round(np.arange(1.0, 4.51, 0.5), 2)
+
+
+def _walkforward(data, processes, kernel="loop"):
+    return run_walkforward(data, BUY_VALUES, SELL_VALUES, train_months=12, test_months=3,
+                           unit_type="1g", processes=processes, kernel=kernel)
+
+
+def _assert_same_walkforward(actual, expected):
+    pd.testing.assert_frame_equal(actual["windows"], expected["windows"], check_exact=True)
+    pd.testing.assert_series_equal(actual["equity"], expected["equity"], check_exact=True)
+    for key in ("total_return", "max_drawdown", "trades", "final_capital"):
+        assert actual[key] == expected[key], key
+
+
+def test_walkforward_serial_equals_parallel(synthetic_data):
+    serial = _walkforward(synthetic_data, processes=1)
+    assert serial["trades"] > 0
+    _assert_same_walkforward(_walkforward(synthetic_data, processes=3), serial)
+
+
+def test_walkforward_vector_kernel_equals_loop(synthetic_data):
+    _assert_same_walkforward(_walkforward(synthetic_data, processes=1, kernel="vector"),
+                             _walkforward(synthetic_data, processes=1))